@@ -0,0 +1,123 @@
+"""
+Per-page cost of structured-data parsing.
+
+Compares the old front end (w3lib base-URL scan, then extruct on the raw
+string) with `parse_structured_data` (one lxml tree shared by the base URL and
+every syntax), and eager with lazy (`LazyStructuredData`) parsing when followed
+by `extract_standard`. Pass saved product pages as arguments, otherwise a synthetic
+~400 KB product page is used:
+
+    python -m benchmarks.structured_data [page.html ...]
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from extruct import extract as extruct_extract
+from w3lib.html import get_base_url
+
+from src.core.utils.standards_extractor import extract_standard
+from src.core.utils.structured_data import (
+    SYNTAXES,
+    HtmlDocument,
+    LazyStructuredData,
+    parse_structured_data,
+)
+
+URL = "https://shop.example.com/products/vase"
+ALL_SYNTAXES = [
+    "microdata",
+    "opengraph",
+    "json-ld",
+    "microformat",
+    "rdfa",
+    "dublincore",
+]
+
+
+def synthetic_page(blocks: int = 4000, complete: bool = False) -> str:
+    """Product page; `complete` JSON-LD has every field the extractors fill."""
+    extra = (
+        '"sku": "V-1", "description": "Blue glass vase", '
+        '"image": "https://shop.example.com/img/vase.jpg", '
+        if complete
+        else ""
+    )
+    availability = ', "availability": "https://schema.org/InStock"' if complete else ""
+    head = (
+        '<html><head><title>Vase</title><meta property="og:title" content="Vase">'
+        '<meta property="og:type" content="product">'
+        '<script type="application/ld+json">{"@context": "https://schema.org", '
+        f'"@type": "Product", "name": "Vase", {extra}"offers": {{"@type": "Offer", '
+        f'"price": "120.00", "priceCurrency": "EUR"{availability}}}}}</script>'
+        "</head><body>"
+        '<div itemscope itemtype="https://schema.org/Product">'
+        '<h1 itemprop="name">Vase</h1><span itemprop="price">120.00</span></div>'
+    )
+    filler = (
+        '<div class="teaser"><a href="/products/{i}"><img src="/img/{i}.jpg" '
+        'alt="Item {i}"></a><p>Related item {i} with a longer description.</p></div>'
+    )
+    return head + "".join(filler.format(i=i) for i in range(blocks)) + "</body></html>"
+
+
+def old_front_end(html: str, syntaxes: list[str]) -> dict:
+    return extruct_extract(html, base_url=get_base_url(html, URL), syntaxes=syntaxes)
+
+
+def extract_eager(html: str, syntaxes: list[str]):
+    data = parse_structured_data(html, URL, syntaxes)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(extract_standard(data, URL))
+
+
+def extract_lazy(html: str, syntaxes: list[str]):
+    data = LazyStructuredData(HtmlDocument(html, URL), syntaxes)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(extract_standard(data, URL))
+
+
+def measure(fn, html: str, syntaxes: list[str], repeat: int) -> tuple[float, float]:
+    """Mean milliseconds per page and peak Python allocations (not lxml's) in MB."""
+    fn(html, syntaxes)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(html, syntaxes)
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    tracemalloc.start()
+    fn(html, syntaxes)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(paths: list[str]) -> None:
+    pages = {path: Path(path).read_text(encoding="utf-8") for path in paths} or {
+        "synthetic": synthetic_page(),
+        "complete": synthetic_page(complete=True),
+    }
+    candidates = {
+        "old": old_front_end,
+        "shared tree": lambda html, syntaxes: parse_structured_data(
+            html, URL, syntaxes
+        ),
+        "eager+extract": extract_eager,
+        "lazy+extract": extract_lazy,
+    }
+    for name, html in pages.items():
+        for label, syntaxes in (("pipeline", SYNTAXES), ("all", ALL_SYNTAXES)):
+            for candidate, fn in candidates.items():
+                elapsed, peak = measure(fn, html, syntaxes, repeat=3)
+                print(
+                    f"{name} ({len(html) // 1024} KB) {label:8} {candidate:12} "
+                    f"{elapsed:8.1f} ms/page {peak:8.1f} MB Python peak"
+                )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
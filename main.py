@@ -3,11 +3,10 @@ import asyncio
 import nest_asyncio
 import streamlit as st
 import json
-import requests
-from extruct import extract as extruct_extract
-from w3lib.html import get_base_url
 from src.app.extractor import parse_schema
+from src.core.utils.http_client import shared_session
 from src.core.utils.standards_extractor import extract_standard
+from src.core.utils.structured_data import HtmlDocument, LazyStructuredData
 
 # --- Windows asyncio fix ---
 if sys.platform.startswith("win"):
@@ -67,16 +66,12 @@ def display_json_sections(data: dict):
 
 
 async def extract_and_display_standards(url: str):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
-    }
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    html = response.text
-    base_url = get_base_url(html, url)
-    data = extruct_extract(
-        html,
-        base_url=base_url,
+    async with shared_session().get(url) as response:
+        response.raise_for_status()
+        html = await response.text()
+    # Extraction only parses the syntaxes it needs; the raw view parses the rest.
+    data = LazyStructuredData(
+        HtmlDocument(html, url),
         syntaxes=[
             "microdata",
             "opengraph",
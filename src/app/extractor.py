@@ -5,14 +5,57 @@ from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode, LLMConfig
 from crawl4ai import JsonCssExtractionStrategy
 import os
 
+from src.core.utils.browser_cache import BrowserCache
+from src.core.utils.browser_pool import install_hooks
+from src.core.utils.http_fetcher import HttpFetcher
+from src.core.utils.resource_blocking import BlockingProfile, ResourceBlocker
+from src.core.utils.standards_extractor import extract_standard, is_valid_product
+from src.core.utils.structured_data import HtmlDocument, LazyStructuredData
+
+
+async def get_page_source_with_crawler(
+    url: str,
+    http_first: bool = True,
+    resource_blocking: BlockingProfile | None = BlockingProfile(),
+    browser_cache: BrowserCache | None = None,
+) -> str:
+    """
+    Fetch the page HTML, rendering with crawl4ai only when needed.
+
+    With `http_first`, a plain HTTP response is returned as-is if it already
+    contains a valid product; otherwise the page is rendered in the browser,
+    loading only the resources `resource_blocking` allows. `browser_cache`
+    renders with a persistent profile, so static assets are cached across runs.
+    """
+    if http_first:
+        async with HttpFetcher() as fetcher:
+            page = await fetcher.fetch(url)
+        if page is not None and page.html is not None:
+            structured = LazyStructuredData(HtmlDocument(page.html, page.url))
+            if is_valid_product(await extract_standard(structured, page.url)):
+                return page.html
+        print(f"No product data in plain HTTP response for {url}, rendering...")
 
-async def get_page_source_with_crawler(url: str) -> str:
-    """Fetch fully rendered HTML using crawl4ai with fallback handling."""
     print(f"Fetching page source for {url} using crawler...")
     config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
 
-    async with AsyncWebCrawler() as crawler:
+    browser_config = None
+    if browser_cache is not None:
+        browser_config = browser_cache.browser_config(
+            key=browser_cache.key(urlparse(url).netloc)
+        )
+    crawler = AsyncWebCrawler(config=browser_config)
+    blocker = (
+        ResourceBlocker(resource_blocking, routing=browser_cache is None)
+        if resource_blocking
+        else None
+    )
+    if blocker is not None:
+        install_hooks(crawler, [blocker])
+    async with crawler:
         result = await crawler.arun(url=url, config=config)
+        if blocker is not None:
+            print(f"Resource blocking: {blocker.report()}")
 
         if not result.success:
             print(f"Failed to fetch page source: {result.error_message}")
@@ -1,68 +1,359 @@
 import asyncio
 import json
+import time
+from collections.abc import Callable
+from itertools import zip_longest
 from crawl4ai import (
     BrowserConfig,
     CrawlerRunConfig,
     CacheMode,
-    MemoryAdaptiveDispatcher,
-    AsyncWebCrawler,
 )
-from extruct import extract as extruct_extract
-from w3lib.html import get_base_url
 
+from src.core.pipeline import CrawlPipeline
+from src.core.utils.browser_cache import BrowserCache
+from src.core.utils.browser_pool import BrowserPool
+from src.core.utils.circuit_breaker import CircuitBreaker
+from src.core.utils.concurrency_controller import ConcurrencyController
+from src.core.utils.crawl_budget import CrawlBudget, DomainBudget
+from src.core.utils.crawl_history import CrawlHistory
+from src.core.utils.extraction_pool import ExtractionPool
+from src.core.utils.fingerprint_cache import FingerprintCache
+from src.core.utils.frontier import Frontier
+from src.core.utils.host_scheduler import HostScheduler
+from src.core.utils.http_fetcher import HttpFetcher
+from src.core.utils.render_policy import RenderPolicy
+from src.core.utils.resource_blocking import BlockingProfile, ResourceBlocker
+from src.core.utils.robots_cache import RobotsCache
 from src.core.utils.sitemap_extractor import sitemap_extractor
-from src.core.utils.standards_extractor import extract_standard
-
-
-async def crawl_batch(domains: list[str]) -> None:
-    results = await sitemap_extractor(domains)
-    all_results = {}
-    for domain, urls_list in results.items():
-        print(f"Domain: {domain}")
-        browser_config = BrowserConfig(headless=True, verbose=False)
-        run_config = CrawlerRunConfig(
-            cache_mode=CacheMode.BYPASS,
-            stream=False,
-            check_robots_txt=True,
-            verbose=True,
-        )
+from src.core.utils.url_classifier import UrlClassifier
+from src.core.utils.url_priority import url_priority
+from src.core.utils.validator_store import ValidatorStore
+from src.core.utils.wait_policy import WaitPolicy
+
+
+def interleave_domains(urls_by_domain: dict[str, list[str]]):
+    """Yield (domain, url) pairs round-robin so no shop waits for another."""
+    columns = [
+        [(domain, url) for url in urls] for domain, urls in urls_by_domain.items()
+    ]
+    for row in zip_longest(*columns):
+        for pair in row:
+            if pair is not None:
+                yield pair
+
+
+def stored_product(
+    url: str, fingerprint_cache: FingerprintCache, validator_store: ValidatorStore
+) -> dict | list[dict] | None:
+    """The product an earlier run extracted from `url`, None if there is none."""
+    product = fingerprint_cache.product(url)
+    if product is None and (validated := validator_store.get(url)) is not None:
+        product = validated["product"]
+    return product
+
+
+async def seed_frontier(
+    domains: list[str],
+    resume: bool = True,
+    incremental: bool = True,
+    full_refresh_days: float | None = 30,
+) -> None:
+    """
+    Fill the frontier with the URLs of `domains` that have to be crawled.
 
-        dispatcher = MemoryAdaptiveDispatcher(
-            memory_threshold_percent=100.0,
-            check_interval=1.0,
-            max_session_permit=100,
+    With `resume`, a frontier that still has URLs of `domains` (left by an
+    interrupted crawl) is kept as it is; otherwise the domains' URLs are
+    cleared and seeded again, together with the URLs the previous run left
+    for retry. Checkpoints of other domains are never touched. Seeded URLs first
+    pass the UrlClassifier, which drops non-HTML resources and URL patterns
+    that never produced products in earlier runs, and the cached robots.txt
+    rules. With `incremental`, only URLs whose sitemap lastmod (or changefreq)
+    says they changed since their last successful crawl are kept; every URL is
+    still re-crawled at least once every `full_refresh_days`. The other URLs
+    are recorded as unchanged with the product stored by an earlier run (in
+    the FingerprintCache or ValidatorStore), so the output stays complete. URLs are queued
+    by `url_priority`, so high-priority, known-product and recently changed
+    pages are crawled first.
+    """
+    frontier = Frontier()
+    if resume and frontier.remaining(domains):
+        print(f"Resuming crawl from checkpoint: {frontier.counts()}")
+        frontier.close()
+        return
+    retries = frontier.retries(domains)
+    frontier.clear(domains)
+
+    history = CrawlHistory()
+    url_classifier = UrlClassifier()
+    async with RobotsCache() as robots_cache:
+        entries = await sitemap_extractor(domains, robots_cache)
+        entries = await robots_cache.filter(url_classifier.prefilter(entries))
+    fingerprint_cache = FingerprintCache()
+    unchanged = {}
+    if incremental:
+        due = history.select_due(entries, full_refresh_days)
+        validator_store = ValidatorStore()
+        for domain, items in entries.items():
+            due_urls = {e["url"] for e in due.get(domain, [])}
+            due_urls.update(retries.get(domain, {}))
+            for entry in items:
+                if entry["url"] not in due_urls:
+                    product = stored_product(
+                        entry["url"], fingerprint_cache, validator_store
+                    )
+                    if product is not None:
+                        unchanged.setdefault(domain, {})[entry["url"]] = product
+        validator_store.close()
+        entries = due
+    now = time.time()
+    priorities = {
+        entry["url"]: url_priority(
+            entry, fingerprint_cache.has_product(entry["url"]), now
         )
+        for items in entries.values()
+        for entry in items
+    }
+    fingerprint_cache.close()
+    frontier.add_urls(
+        {domain: [e["url"] for e in items] for domain, items in entries.items()},
+        priorities,
+    )
+    frontier.add_unchanged(unchanged)
+    frontier.add_retries(retries)
+    history.close()
+    frontier.close()
+
+
+async def crawl_frontier(
+    domains: list[str] | None = None,
+    max_sessions: int = 100,
+    http_first: bool = True,
+    http_stop_early: bool = False,
+    render_policy: RenderPolicy | None = None,
+    host_scheduler: HostScheduler | None = None,
+    wait_policy: WaitPolicy | None = None,
+    budget: DomainBudget | None = None,
+    domain_budgets: dict[str, DomainBudget] | None = None,
+    resource_blocking: BlockingProfile | None = BlockingProfile(),
+    max_pages_per_browser: int | None = 2000,
+    max_browser_rss_mb: float | None = 4096,
+    browser_cache: BrowserCache | None = None,
+    browser_profile: str | None = None,
+    extraction_processes: int | None = None,
+    pipeline_kwargs: dict | None = None,
+    on_progress: Callable[[dict], None] | None = None,
+    progress_interval: float = 10.0,
+) -> dict[str, int]:
+    """
+    Crawl the frontier's remaining URLs of `domains` (all domains if None).
+
+    With `http_stop_early`, plain HTTP downloads stop once the page's product
+    JSON-LD has been read; body-only syntaxes (microdata, RDFa) of such pages
+    are not read, and pages without a valid product are rendered.
+
+    `budget` caps pages, wall time and bytes of every domain, `domain_budgets`
+    overrides it per domain. Rendered pages load only the resources allowed by
+    `resource_blocking` (None disables blocking). The browser is recycled after
+    `max_pages_per_browser` pages or once it uses `max_browser_rss_mb` of
+    memory. With `browser_cache` the browser keeps its profile and HTTP cache
+    across runs, in the profile `browser_profile` (by default the shared one,
+    or the domain's if a single domain is crawled with a per-domain cache).
+    Large pages are extracted in `extraction_processes` worker processes (one
+    per CPU core if None, 0 extracts in threads only).
+    `on_progress` is called with the pipeline stats, concurrency and
+    browser metrics every `progress_interval` seconds. Returns the final
+    pipeline, extraction, fingerprint cache, concurrency, browser and
+    resource blocking counters; extraction skip rates are printed per domain.
+    """
+    browser_config = BrowserConfig(headless=True, verbose=False)
+    if browser_cache is not None:
+        if browser_profile is None:
+            browser_profile = browser_cache.key(
+                domains[0] if domains and len(domains) == 1 else None
+            )
+        browser_config = browser_cache.browser_config(browser_config, browser_profile)
+    # robots.txt is checked by the pipeline before URLs are enqueued.
+    run_config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        verbose=True,
+    )
+    extraction_pool = ExtractionPool(extraction_processes)
+    # Render concurrency is bounded by the ConcurrencyController, not by workers.
+    pipeline_kwargs = {
+        "fetch_workers": max_sessions,
+        "render_workers": max_sessions,
+        "parse_workers": max(4, extraction_pool.processes),
+        **(pipeline_kwargs or {}),
+    }
+    frontier = Frontier()
+    validator_store = ValidatorStore()
+    fingerprint_cache = FingerprintCache()
+    blocker = (
+        ResourceBlocker(resource_blocking, routing=browser_cache is None)
+        if resource_blocking
+        else None
+    )
+
+    async def report_progress():
+        while True:
+            await asyncio.sleep(progress_interval)
+            on_progress({**pipeline.stats, **controller.metrics(), **pool.metrics()})
 
-        async with AsyncWebCrawler(config=browser_config) as crawler:
-            results = await crawler.arun_many(
-                urls=urls_list, config=run_config, dispatcher=dispatcher
+    try:
+        async with (
+            BrowserPool(
+                browser_config,
+                max_sessions=max_sessions,
+                extensions=[blocker] if blocker else None,
+                max_pages=max_pages_per_browser,
+                max_rss_mb=max_browser_rss_mb,
+            ) as pool,
+            HttpFetcher(stop_early=http_stop_early) as http_fetcher,
+            extraction_pool,
+            RobotsCache() as robots_cache,
+            ConcurrencyController(
+                initial_limit=min(10, max_sessions), max_limit=max_sessions
+            ) as controller,
+        ):
+            pipeline = CrawlPipeline(
+                pool,
+                run_config,
+                http_fetcher=http_fetcher if http_first else None,
+                render_policy=render_policy,
+                validator_store=validator_store,
+                fingerprint_cache=fingerprint_cache,
+                frontier=frontier,
+                robots_cache=robots_cache,
+                host_scheduler=host_scheduler,
+                concurrency_controller=controller,
+                circuit_breaker=CircuitBreaker(),
+                crawl_budget=CrawlBudget(budget, domain_budgets),
+                wait_policy=wait_policy,
+                extraction_pool=extraction_pool,
+                **pipeline_kwargs,
             )
-            list_data = []
-            for result in results:
-                if result.success:
-                    base_url = get_base_url(result.html, result.url)
-                    structured = extruct_extract(
-                        result.html,
-                        base_url=base_url,
-                        syntaxes=["json-ld", "microdata", "rdfa", "opengraph"],
+            reporter = asyncio.create_task(report_progress()) if on_progress else None
+            remaining = frontier.remaining(domains)
+            await robots_cache.prefetch(
+                url for urls in remaining.values() for url in urls
+            )
+            if host_scheduler is not None:
+                for domain, urls in remaining.items():
+                    parser = await robots_cache.parser(urls[0])
+                    host_scheduler.set_crawl_delay(
+                        domain, parser.crawl_delay(robots_cache.user_agent)
                     )
+            pending = interleave_domains(remaining)
+            async for domain, extracted_data in pipeline.run(pending):
+                pass  # await send_items([extracted_data])
+            if reporter is not None:
+                reporter.cancel()
+    finally:
+        validator_store.close()
+        fingerprint_cache.close()
+        frontier.close()
+        if browser_cache is not None:
+            browser_cache.evict(keep=(browser_profile,))
+
+    print(f"Extraction skip rates per domain: {pipeline.extraction_stats.report()}")
+    return {
+        **pipeline.stats,
+        **{
+            f"extraction_{k}": v
+            for k, v in pipeline.extraction_stats.counters().items()
+        },
+        **controller.metrics(),
+        **pool.metrics(),
+        **extraction_pool.metrics(),
+        **{f"fingerprint_{k}": v for k, v in fingerprint_cache.counters().items()},
+        **{
+            f"blocking_{k}": v for k, v in (blocker.report() if blocker else {}).items()
+        },
+    }
+
+
+def finalize_crawl(domains: list[str]) -> dict[str, list]:
+    """
+    Learn from the finished frontier URLs of `domains` and write
+    data/crawled_data.json.
+
+    The file holds every product of the domains, including the unchanged
+    ones an incremental run did not crawl (see `seed_frontier`).
 
-                    extracted_data = await extract_standard(structured, result.url)
-                    if extracted_data:
-                        list_data.append(extracted_data)
-                    else:
-                        print(f"No structured data found for {result.url}")
-                else:
-                    print(f"Failed to crawl {result.url}: {result.error_message}")
+    Records the crawl time of every finished URL for incremental runs and feeds
+    product yields to the UrlClassifier.
+    """
+    frontier = Frontier()
+    history = CrawlHistory()
+    for url, crawled_at in frontier.finished(domains):
+        history.record(url, crawled_at)
+    history.close()
 
-                # await send_items(list_data)
+    url_classifier = UrlClassifier()
+    for domain, url, found_product in frontier.outcomes(domains):
+        url_classifier.record(domain, url, bool(found_product))
+    url_classifier.save()
+    print(f"Product yield per URL pattern: {url_classifier.report()}")
 
-            all_results[domain] = list_data
+    all_results = {domain: [] for domain in domains}
+    all_results.update(frontier.results(domains))
+    retries = sum(len(urls) for urls in frontier.retries(domains).values())
+    frontier.close()
+    if retries:
+        print(f"{retries} URLs are kept for retry in the next run")
 
     with open("../../data/crawled_data.json", "w") as f:
         json.dump(all_results, f, indent=4)
 
     print("Total number of items extracted:", sum(len(v) for v in all_results.values()))
+    return all_results
+
+
+async def crawl_batch(
+    domains: list[str],
+    max_sessions: int = 100,
+    http_first: bool = True,
+    resume: bool = True,
+    incremental: bool = True,
+    full_refresh_days: float | None = 30,
+    budget: DomainBudget | None = None,
+    domain_budgets: dict[str, DomainBudget] | None = None,
+    browser_cache: BrowserCache | None = None,
+    pipeline_kwargs: dict | None = None,
+) -> None:
+    """
+    Crawl all product pages of `domains` in this process.
+
+    See `seed_frontier` for resuming, incremental seeding and URL priorities and
+    `crawl_frontier` for per-domain budgets and the persistent browser cache; use
+    `src.core.sharded_runner.crawl_sharded` to spread domains over processes.
+    """
+    await seed_frontier(domains, resume, incremental, full_refresh_days)
+
+    render_policy = RenderPolicy()
+    host_scheduler = HostScheduler()
+    wait_policy = WaitPolicy()
+    try:
+        stats = await crawl_frontier(
+            domains,
+            max_sessions=max_sessions,
+            http_first=http_first,
+            render_policy=render_policy,
+            host_scheduler=host_scheduler,
+            wait_policy=wait_policy,
+            budget=budget,
+            domain_budgets=domain_budgets,
+            browser_cache=browser_cache,
+            pipeline_kwargs=pipeline_kwargs,
+        )
+    finally:
+        render_policy.save()
+        host_scheduler.save()
+        wait_policy.save()
+    print(f"Pipeline stats: {stats}")
+    print(f"Render wait strategies: {wait_policy.report()}")
+
+    finalize_crawl(domains)
 
 
 if __name__ == "__main__":
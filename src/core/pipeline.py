@@ -0,0 +1,448 @@
+import asyncio
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable
+from contextlib import nullcontext
+from dataclasses import dataclass
+
+from crawl4ai import CrawlerRunConfig
+
+from src.core.utils.browser_pool import BrowserPool
+from src.core.utils.circuit_breaker import CircuitBreaker, backoff_delay
+from src.core.utils.concurrency_controller import ConcurrencyController
+from src.core.utils.crawl_budget import CrawlBudget
+from src.core.utils.extraction_pool import ExtractionPool, PageExtraction
+from src.core.utils.fingerprint_cache import FingerprintCache
+from src.core.utils.frontier import (
+    DONE,
+    FAILED,
+    IN_FLIGHT,
+    RETRY,
+    SKIPPED,
+    Frontier,
+)
+from src.core.utils.host_scheduler import HostScheduler, HostSlot
+from src.core.utils.http_fetcher import HttpFetcher
+from src.core.utils.product_scanner import FULL_PAGE_SYNTAXES
+from src.core.utils.render_policy import RenderPolicy
+from src.core.utils.robots_cache import RobotsCache
+from src.core.utils.standards_extractor import ExtractionStats, is_valid_product
+from src.core.utils.structured_data import SYNTAXES
+from src.core.utils.validator_store import ValidatorStore
+from src.core.utils.wait_policy import WaitPolicy
+
+_DONE = object()
+
+# The syntaxes read from pages cut off after their product JSON-LD.
+_HEAD_SYNTAXES = [s for s in SYNTAXES if s not in FULL_PAGE_SYNTAXES]
+
+# HTTP answers saying the page is gone, which rendering would not change.
+_GONE_STATUSES = frozenset({404, 410})
+
+OUTCOME_STATES = {
+    "failed": FAILED,
+    "disallowed": SKIPPED,
+    "over_budget": SKIPPED,
+    "deferred": RETRY,
+}
+
+
+@dataclass
+class CrawlTask:
+    """A single URL travelling through the pipeline stages."""
+
+    domain: str
+    url: str
+    page_url: str | None = None
+    html: str | None = None
+    extraction: PageExtraction | None = None
+    rendered: bool = False
+    etag: str | None = None
+    last_modified: str | None = None
+    attempts: int = 0
+    # Cut off after its product JSON-LD (see `HttpFetcher`).
+    truncated: bool = False
+    # Counted by the crawl budget already; retries are not counted again.
+    admitted: bool = False
+
+
+class CrawlPipeline:
+    """
+    Streaming crawl pipeline: fetch -> parse -> extract -> caller.
+
+    Stages are joined by bounded queues and each stage has its own number of
+    workers. A full queue blocks the stage feeding it, so at most `queue_size`
+    pages per stage are held in memory and extraction overlaps with fetching.
+    The parse stage extracts the product off the event loop, in a thread or
+    one of the worker processes of `extraction_pool` (see `extract_page`);
+    only the syntaxes the extractors need are parsed. The extract stage
+    then handles caching, escalation and hand-off on the event loop.
+
+    With an `http_fetcher`, pages are first fetched without a browser. URLs that
+    yield no valid product are escalated to the browser pool, except for 404
+    and 410 answers, and `render_policy` remembers which domains always need
+    rendering so they skip the HTTP attempt.
+
+    With a `validator_store`, known URLs are re-fetched conditionally and a 304
+    answer yields the stored product without parsing or extraction.
+
+    With a `fingerprint_cache`, pages whose structured data (in the syntaxes the
+    stored product came from) is unchanged since the last run reuse the stored
+    product instead of running the extractors.
+
+    With a `frontier`, every URL's state and product are checkpointed to disk
+    so an interrupted crawl can resume where it stopped.
+
+    With a `robots_cache`, URLs disallowed by robots.txt are dropped before they
+    take a fetch or browser slot.
+
+    With a `host_scheduler`, every HTTP or browser request waits for a slot of
+    its domain, so each shop gets the concurrency and rate it can sustain while
+    the workers stay busy with other domains.
+
+    With a `concurrency_controller`, the number of pages rendered at once
+    follows the machine's memory, event-loop lag and page latency.
+
+    Failed fetches are re-queued with jittered exponential backoff until
+    `max_attempts` is reached. With a `circuit_breaker`, domains that keep
+    failing are paused and eventually deferred to the next run.
+
+    With a `crawl_budget`, a domain's URLs are skipped once it has used up its
+    pages, wall time or bytes. URLs arrive in priority order, so the most
+    valuable pages are the ones crawled within the budget.
+
+    With a `wait_policy`, rendered pages are returned as soon as product
+    structured data is in the DOM, with a per-domain fallback wait.
+
+    Extraction stops once the product is complete unless `full_extraction`;
+    `extraction_stats` reports per domain how often extractors were skipped.
+
+    `stats` counts how each URL ended: http, rendered, not_modified, no_product,
+    disallowed, over_budget, deferred or failed, plus the number of retries.
+    """
+
+    def __init__(
+        self,
+        pool: BrowserPool,
+        run_config: CrawlerRunConfig,
+        http_fetcher: HttpFetcher | None = None,
+        render_policy: RenderPolicy | None = None,
+        validator_store: ValidatorStore | None = None,
+        fingerprint_cache: FingerprintCache | None = None,
+        frontier: Frontier | None = None,
+        robots_cache: RobotsCache | None = None,
+        host_scheduler: HostScheduler | None = None,
+        concurrency_controller: ConcurrencyController | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        crawl_budget: CrawlBudget | None = None,
+        wait_policy: WaitPolicy | None = None,
+        extraction_pool: ExtractionPool | None = None,
+        full_extraction: bool = False,
+        max_attempts: int = 3,
+        retry_base_delay: float = 2.0,
+        fetch_workers: int = 100,
+        render_workers: int = 20,
+        parse_workers: int = 4,
+        extract_workers: int = 2,
+        queue_size: int = 64,
+    ):
+        self.pool = pool
+        self.run_config = run_config
+        self.http_fetcher = http_fetcher
+        self.render_policy = render_policy
+        self.validator_store = validator_store
+        self.fingerprint_cache = fingerprint_cache
+        self.frontier = frontier
+        self.robots_cache = robots_cache
+        self.host_scheduler = host_scheduler
+        self.concurrency_controller = concurrency_controller
+        self.circuit_breaker = circuit_breaker
+        self.crawl_budget = crawl_budget
+        self.wait_policy = wait_policy
+        self.extraction_pool = extraction_pool or ExtractionPool(processes=0)
+        self.full_extraction = full_extraction
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.fetch_workers = fetch_workers
+        self.render_workers = render_workers
+        self.parse_workers = parse_workers
+        self.extract_workers = extract_workers
+        self.queue_size = queue_size
+        self.stats = Counter()
+        self.extraction_stats = ExtractionStats()
+
+    async def run(
+        self, pending: Iterable[tuple[str, str]]
+    ) -> AsyncIterator[tuple[str, dict | list[dict]]]:
+        """Crawl (domain, url) pairs and yield (domain, product) as they are produced."""
+        self._outstanding = 0
+        self._feeding = True
+        self._fetch_queue = asyncio.Queue(self.queue_size)
+        # Escalations loop back from the extract stage; keeping this queue
+        # unbounded means that loop can never deadlock on backpressure.
+        self._render_queue = asyncio.Queue()
+        self._parse_queue = asyncio.Queue(self.queue_size)
+        self._extract_queue = asyncio.Queue(self.queue_size)
+        self._out_queue = asyncio.Queue(self.queue_size)
+        self._delayed: set[asyncio.Task] = set()
+
+        tasks = [asyncio.create_task(self._feed(pending))]
+        for work, inbox, workers in (
+            (self._fetch, self._fetch_queue, self.fetch_workers),
+            (self._render, self._render_queue, self.render_workers),
+            (self._parse, self._parse_queue, self.parse_workers),
+            (self._extract, self._extract_queue, self.extract_workers),
+        ):
+            tasks.extend(
+                asyncio.create_task(self._worker(work, inbox)) for _ in range(workers)
+            )
+        try:
+            while (item := await self._out_queue.get()) is not _DONE:
+                yield item
+        finally:
+            tasks.extend(self._delayed)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # The run's checkpoints and cache writes are committed on return.
+            for store in (self.frontier, self.validator_store, self.fingerprint_cache):
+                if store is not None:
+                    store.commit()
+
+    async def _feed(self, pending) -> None:
+        try:
+            for domain, url in pending:
+                self._outstanding += 1
+                task = CrawlTask(domain, url)
+                try:
+                    await self._enqueue(task)
+                except Exception as e:
+                    print(f"Pipeline error for {url}: {e}")
+                    await self._finish(task, "failed")
+        except Exception as e:
+            # The run still ends once the URLs fed so far are done.
+            print(f"Pipeline stopped reading pending URLs: {e}")
+        self._feeding = False
+        await self._check_done()
+
+    async def _enqueue(self, task: CrawlTask) -> None:
+        if self.frontier is not None:
+            task.attempts = self.frontier.attempts(task.url)
+        if self.robots_cache is not None and not await self.robots_cache.allowed(
+            task.url
+        ):
+            await self._finish(task, "disallowed")
+            return
+        if self.frontier is not None:
+            self.frontier.mark(task.url, IN_FLIGHT)
+        await self._fetch_queue.put(task)
+
+    async def _finish(
+        self, task: CrawlTask, outcome: str, product: dict | list[dict] | None = None
+    ) -> None:
+        """Record how `task` ended, hand its product to the caller and retire it."""
+        self.stats[outcome] += 1
+        if self.frontier is not None:
+            state = OUTCOME_STATES.get(outcome, DONE)
+            self.frontier.mark(task.url, state, product, task.attempts)
+        if product is not None:
+            await self._out_queue.put((task.domain, product))
+        self._outstanding -= 1
+        await self._check_done()
+
+    async def _check_done(self) -> None:
+        if not self._feeding and self._outstanding == 0:
+            await self._out_queue.put(_DONE)
+
+    async def _worker(self, work, inbox: asyncio.Queue) -> None:
+        while True:
+            task = await inbox.get()
+            try:
+                await work(task)
+            except Exception as e:
+                print(f"Pipeline error for {task.url}: {e}")
+                if task.html is None and task.extraction is None:
+                    # The page was never fetched: retry it like a failed fetch.
+                    await self._retry(task, e)
+                else:
+                    await self._finish(task, "failed")
+
+    async def _retry(self, task: CrawlTask, error) -> None:
+        """Re-queue a failed fetch after a backoff, or give up after `max_attempts`."""
+        task.attempts += 1
+        self._record_health(task.domain, False)
+        if task.attempts >= self.max_attempts:
+            print(f"Failed to crawl {task.url} after {task.attempts} attempts: {error}")
+            await self._finish(task, "failed")
+            return
+        self.stats["retried"] += 1
+        retry = CrawlTask(
+            task.domain, task.url, attempts=task.attempts, admitted=task.admitted
+        )
+        self._requeue(retry, backoff_delay(task.attempts, self.retry_base_delay))
+
+    def _requeue(self, task: CrawlTask, delay: float) -> None:
+        async def put_later():
+            await asyncio.sleep(delay)
+            await self._fetch_queue.put(task)
+
+        delayed = asyncio.create_task(put_later())
+        self._delayed.add(delayed)
+        delayed.add_done_callback(self._delayed.discard)
+
+    def _spend_bytes(self, domain: str, html: str | None) -> None:
+        if self.crawl_budget is not None and html:
+            self.crawl_budget.spend_bytes(domain, len(html.encode("utf-8")))
+
+    def _record_health(self, domain: str, ok: bool) -> None:
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(domain, ok)
+
+    def _host_slot(self, domain: str):
+        if self.host_scheduler is None:
+            return nullcontext(HostSlot())
+        return self.host_scheduler.slot(domain)
+
+    def _page_slot(self):
+        if self.concurrency_controller is None:
+            return nullcontext()
+        return self.concurrency_controller.slot()
+
+    async def _fetch(self, task: CrawlTask) -> None:
+        if self.circuit_breaker is not None:
+            wait = self.circuit_breaker.retry_after(task.domain)
+            if wait is None:
+                await self._finish(task, "deferred")
+                return
+            if wait > 0:
+                self._requeue(task, wait)
+                return
+        if self.crawl_budget is not None and not task.admitted:
+            if not self.crawl_budget.admit(task.domain):
+                await self._finish(task, "over_budget")
+                return
+            task.admitted = True
+        if self.http_fetcher is None:
+            await self._render(task)
+            return
+        render_only = (
+            self.render_policy is not None
+            and self.render_policy.needs_render(task.domain)
+        )
+        headers = (
+            self.validator_store.conditional_headers(task.url)
+            if self.validator_store is not None
+            else {}
+        )
+        if render_only and not headers:
+            await self._render(task)
+            return
+
+        async with self._host_slot(task.domain) as slot:
+            page = await self.http_fetcher.fetch(task.url, headers or None)
+            slot.status = page.status if page is not None else None
+        if page is not None and page.status == 304:
+            self._record_health(task.domain, True)
+            await self._finish(
+                task, "not_modified", self.validator_store.get(task.url)["product"]
+            )
+            return
+        if page is not None and page.status in _GONE_STATUSES:
+            self._record_health(task.domain, True)
+            print(f"{task.url} answered {page.status}, not rendering it")
+            await self._finish(task, "no_product")
+            return
+        if page is None or page.html is None or render_only:
+            await self._render(task)
+            return
+        self._record_health(task.domain, True)
+        self._spend_bytes(task.domain, page.html)
+        task.page_url, task.html = page.url, page.html
+        task.etag, task.last_modified = page.etag, page.last_modified
+        task.truncated = page.truncated
+        await self._parse_queue.put(task)
+
+    def _render_config(self, task: CrawlTask) -> CrawlerRunConfig:
+        if self.wait_policy is None:
+            return self.run_config
+        return self.wait_policy.run_config(task.domain, self.run_config)
+
+    async def _render(self, task: CrawlTask) -> None:
+        async with self._host_slot(task.domain) as slot:
+            async with self._page_slot():
+                started = time.monotonic()
+                result = await self.pool.fetch(task.url, self._render_config(task))
+            slot.status, slot.latency = result.status_code, time.monotonic() - started
+        if not result.success:
+            await self._retry(task, result.error_message)
+            return
+        self._record_health(task.domain, True)
+        self._spend_bytes(task.domain, result.html)
+        if self.wait_policy is not None:
+            self.wait_policy.observe(task.domain, result.html)
+        task.page_url, task.html, task.rendered = result.url, result.html, True
+        task.truncated = False
+        headers = {k.lower(): v for k, v in (result.response_headers or {}).items()}
+        task.etag = headers.get("etag", task.etag)
+        task.last_modified = headers.get("last-modified", task.last_modified)
+        await self._parse_queue.put(task)
+
+    async def _parse(self, task: CrawlTask) -> None:
+        known = None
+        if self.fingerprint_cache is not None:
+            fingerprint = self.fingerprint_cache.fingerprint(task.url)
+            if fingerprint is not None:
+                syntaxes = self.fingerprint_cache.syntaxes(task.url) or SYNTAXES
+                known = (syntaxes, fingerprint)
+        # Body syntaxes of a truncated page would only hold part of its data.
+        syntaxes = _HEAD_SYNTAXES if task.truncated else None
+        task.extraction = await self.extraction_pool.extract(
+            task.html,
+            task.page_url,
+            task.domain,
+            known,
+            self.full_extraction,
+            syntaxes,
+        )
+        task.html = None
+        await self._extract_queue.put(task)
+
+    def _extract_product(self, task: CrawlTask) -> dict | list[dict] | None:
+        extraction = task.extraction
+        self.extraction_stats.merge(extraction.stats)
+        cache = self.fingerprint_cache
+        if cache is None:
+            return extraction.product
+        cached = cache.lookup(
+            task.url, extraction.fingerprint if extraction.unchanged else None
+        )
+        if cached is not None:
+            return cached
+        if is_valid_product(extraction.product):
+            cache.store(
+                task.url,
+                extraction.fingerprint,
+                extraction.product,
+                extraction.syntaxes,
+            )
+        return extraction.product
+
+    async def _extract(self, task: CrawlTask) -> None:
+        extracted_data = self._extract_product(task)
+        task.extraction = None
+        if not is_valid_product(extracted_data):
+            if not task.rendered:
+                await self._render_queue.put(task)
+                return
+            print(f"No structured data found for {task.page_url}")
+            await self._finish(task, "no_product")
+            return
+        if self.render_policy is not None:
+            self.render_policy.record(task.domain, task.rendered)
+        if self.validator_store is not None:
+            self.validator_store.put(
+                task.url, task.etag, task.last_modified, extracted_data
+            )
+        await self._finish(
+            task, "rendered" if task.rendered else "http", extracted_data
+        )
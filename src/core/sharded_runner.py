@@ -0,0 +1,145 @@
+import asyncio
+import heapq
+import multiprocessing
+import os
+import queue
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from src.core.crawler import crawl_frontier, finalize_crawl, seed_frontier
+from src.core.utils.frontier import Frontier
+from src.core.utils.host_scheduler import HostScheduler
+from src.core.utils.render_policy import RenderPolicy
+from src.core.utils.wait_policy import WaitPolicy
+
+
+def shard_domains(urls_by_domain: dict[str, list[str]], shards: int) -> list[list[str]]:
+    """
+    Split domains into at most `shards` groups with similar URL counts.
+
+    Domains are assigned largest first to the currently lightest shard, so a
+    single huge shop does not end up sharing a process with many others.
+    """
+    heap = [(0, i) for i in range(max(1, min(shards, len(urls_by_domain))))]
+    groups: list[list[str]] = [[] for _ in heap]
+    for domain, urls in sorted(
+        urls_by_domain.items(), key=lambda item: len(item[1]), reverse=True
+    ):
+        load, index = heapq.heappop(heap)
+        groups[index].append(domain)
+        heapq.heappush(heap, (load + len(urls), index))
+    return [group for group in groups if group]
+
+
+def _run_shard(
+    index: int, domains: list[str], options: dict, progress_queue
+) -> dict[str, dict]:
+    """Worker process: crawl one shard with its own event loop and browser."""
+    render_policy = RenderPolicy()
+    host_scheduler = HostScheduler()
+    wait_policy = WaitPolicy()
+    if options.get("browser_cache") is not None:
+        # Browser profiles cannot be shared between concurrently running browsers.
+        options = {"browser_profile": f"shard-{index}", **options}
+    stats = asyncio.run(
+        crawl_frontier(
+            domains,
+            render_policy=render_policy,
+            host_scheduler=host_scheduler,
+            wait_policy=wait_policy,
+            on_progress=lambda stats: progress_queue.put((index, stats)),
+            **options,
+        )
+    )
+    progress_queue.put((index, stats))
+    return {
+        "stats": stats,
+        "render_policy": render_policy.export(domains),
+        "host_limits": host_scheduler.export(domains),
+        "wait_policy": wait_policy.export(domains),
+    }
+
+
+def _drain(progress_queue, latest: dict[int, dict]) -> Counter:
+    while True:
+        try:
+            index, stats = progress_queue.get_nowait()
+        except queue.Empty:
+            break
+        latest[index] = stats
+    return sum((Counter(stats) for stats in latest.values()), Counter())
+
+
+async def crawl_sharded(
+    domains: list[str],
+    processes: int | None = None,
+    sessions_per_process: int = 20,
+    resume: bool = True,
+    incremental: bool = True,
+    full_refresh_days: float | None = 30,
+    progress_interval: float = 10.0,
+    **options,
+) -> None:
+    """
+    Crawl `domains` with one worker process per CPU core.
+
+    The coordinator seeds the shared frontier once, shards the domains across
+    `processes` workers (each with its own event loop, browser and pipeline),
+    prints merged progress, merges the workers' per-domain render policies,
+    host limits and wait policies and finally writes the combined output.
+    """
+    await seed_frontier(domains, resume, incremental, full_refresh_days)
+    frontier = Frontier()
+    shards = shard_domains(frontier.remaining(domains), processes or os.cpu_count())
+    frontier.close()
+    if not shards:
+        finalize_crawl(domains)
+        return
+    print(f"Crawling {len(domains)} domains in {len(shards)} processes")
+
+    context = multiprocessing.get_context("spawn")
+    loop = asyncio.get_running_loop()
+    latest: dict[int, dict] = {}
+    with (
+        context.Manager() as manager,
+        ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as executor,
+    ):
+        progress_queue = manager.Queue()
+        options = {
+            "max_sessions": sessions_per_process,
+            "progress_interval": progress_interval,
+            # The shards already share the cores.
+            "extraction_processes": max(1, (os.cpu_count() or 1) // len(shards)),
+            **options,
+        }
+        futures = [
+            loop.run_in_executor(
+                executor, _run_shard, index, shard, options, progress_queue
+            )
+            for index, shard in enumerate(shards)
+        ]
+        gathered = asyncio.gather(*futures, return_exceptions=True)
+        while not gathered.done():
+            await asyncio.wait([gathered], timeout=progress_interval)
+            print(f"Progress: {dict(_drain(progress_queue, latest))}")
+        results = gathered.result()
+
+    render_policy = RenderPolicy()
+    host_scheduler = HostScheduler()
+    wait_policy = WaitPolicy()
+    for index, result in enumerate(results):
+        if isinstance(result, BaseException):
+            print(f"Shard {index} failed: {result}")
+            continue
+        render_policy.merge(result["render_policy"])
+        host_scheduler.merge(result["host_limits"])
+        wait_policy.merge(result["wait_policy"])
+    render_policy.save()
+    host_scheduler.save()
+    wait_policy.save()
+
+    finalize_crawl(domains)
+
+
+if __name__ == "__main__":
+    asyncio.run(crawl_sharded([""]))
@@ -0,0 +1,111 @@
+import os
+import re
+import shutil
+import time
+
+from crawl4ai import BrowserConfig
+
+from src.core.utils.storage import data_path
+
+_LAST_USED = ".last_used"
+# Created by Chromium in a profile directory while a browser is using it.
+_PROFILE_LOCK = "SingletonLock"
+
+
+def dir_size(path: str) -> int:
+    """Total size of the files below `path`, in bytes."""
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return size
+
+
+class BrowserCache:
+    """
+    Opt-in persistent Chromium profiles, so shop CSS, JS bundles and fonts come
+    from the browser's HTTP cache on repeat crawls instead of the network.
+
+    Profiles live below `root`, one shared profile or one per domain
+    (`per_domain`). Chromium keeps each profile's disk cache below
+    `max_profile_mb`; `evict` removes the least recently used profiles that
+    are not in use once all of them together exceed `max_total_mb`. A profile
+    can only be used by one browser at a time, so concurrent browsers need
+    different keys.
+    """
+
+    def __init__(
+        self,
+        root: str | None = None,
+        per_domain: bool = False,
+        max_profile_mb: int = 512,
+        max_total_mb: int = 4096,
+    ):
+        self.root = root or data_path("browser_profiles")
+        self.per_domain = per_domain
+        self.max_profile_mb = max_profile_mb
+        self.max_total_mb = max_total_mb
+
+    def key(self, domain: str | None = None) -> str:
+        return domain if self.per_domain and domain else "shared"
+
+    def profile_dir(self, key: str) -> str:
+        return os.path.join(self.root, re.sub(r"[^\w.-]", "_", key))
+
+    def browser_config(
+        self, config: BrowserConfig | None = None, key: str = "shared"
+    ) -> BrowserConfig:
+        """`config` with the persistent profile of `key` and a bounded disk cache."""
+        config = config or BrowserConfig(headless=True, verbose=False)
+        path = self.profile_dir(key)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, _LAST_USED), "w") as f:
+            f.write(str(time.time()))
+        return config.clone(
+            use_persistent_context=True,
+            user_data_dir=path,
+            extra_args=[
+                *(config.extra_args or []),
+                f"--disk-cache-size={self.max_profile_mb * 2**20}",
+            ],
+        )
+
+    def usage(self) -> dict[str, int]:
+        """Size in bytes of every profile."""
+        if not os.path.isdir(self.root):
+            return {}
+        return {
+            name: dir_size(os.path.join(self.root, name))
+            for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name))
+        }
+
+    def _last_used(self, name: str) -> float:
+        path = os.path.join(self.root, name)
+        try:
+            return os.path.getmtime(os.path.join(path, _LAST_USED))
+        except OSError:
+            return os.path.getmtime(path)
+
+    def evict(self, keep: tuple[str, ...] = ()) -> list[str]:
+        """Remove least recently used profiles (except `keep`) until under budget."""
+        usage = self.usage()
+        total = sum(usage.values())
+        keep = {os.path.basename(self.profile_dir(key)) for key in keep}
+        evicted = []
+        for name in sorted(usage, key=self._last_used):
+            if total <= self.max_total_mb * 2**20:
+                break
+            if name in keep or os.path.lexists(
+                os.path.join(self.root, name, _PROFILE_LOCK)
+            ):
+                continue
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+            total -= usage[name]
+            evicted.append(name)
+        if evicted:
+            print(f"Evicted {len(evicted)} browser profiles: {evicted}")
+        return evicted
@@ -0,0 +1,228 @@
+import asyncio
+import re
+
+import psutil
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+
+from src.core.utils.concurrency_controller import browser_processes, rss_bytes
+
+HOOK_TYPES = (
+    "on_browser_created",
+    "on_page_context_created",
+    "before_goto",
+    "after_goto",
+    "before_retrieve_html",
+    "before_return_html",
+)
+
+# Playwright/crawl4ai errors after which the browser can no longer be used.
+BROWSER_CRASH = re.compile(
+    r"Target (page, context or browser|closed|crashed)|browser has (been closed|"
+    r"disconnected)|Browser is not available|Page crashed|Connection closed",
+    re.IGNORECASE,
+)
+
+
+def is_browser_crash(error: str | None) -> bool:
+    return bool(error) and BROWSER_CRASH.search(error) is not None
+
+
+def browser_rss_mb() -> float:
+    """Resident memory of this process's browser children, in MB."""
+    return rss_bytes(browser_processes(psutil.Process())) / 2**20
+
+
+def install_hooks(crawler: AsyncWebCrawler, extensions) -> None:
+    """
+    Register the crawl4ai hooks of several extensions on one crawler.
+
+    crawl4ai takes a single function per hook type, so every extension method
+    named after a hook type is chained into one hook that calls them in order.
+    """
+    for hook_type in HOOK_TYPES:
+        handlers = [
+            getattr(ext, hook_type) for ext in extensions if hasattr(ext, hook_type)
+        ]
+        if not handlers:
+            continue
+
+        async def hook(*args, _handlers=handlers, **kwargs):
+            result = args[0] if args else kwargs.get("page")
+            for handler in _handlers:
+                result = await handler(*args, **kwargs)
+            return result
+
+        crawler.crawler_strategy.set_hook(hook_type, hook)
+
+
+class BrowserPool:
+    """
+    Long-lived headless browser shared by every domain of a crawl run.
+
+    One AsyncWebCrawler is started for the whole run. Concurrent fetches are
+    capped by `max_sessions`, and every slot keeps its own crawl4ai session
+    alive, so pages and contexts are reused across URLs and domains instead of
+    being created per request.
+
+    `extensions` are objects with crawl4ai hook methods (see `install_hooks`),
+    e.g. a ResourceBlocker.
+
+    To bound memory growth the browser is recycled after `max_pages` pages or
+    once its RSS (checked every `rss_check_every` pages) passes `max_rss_mb`:
+    new fetches wait while in-flight pages finish, then the browser is closed
+    and a fresh one started. A fetch that fails because the browser crashed
+    restarts it and is retried up to `max_crash_retries` times, so the URLs
+    in flight at the time of the crash are not lost.
+    """
+
+    def __init__(
+        self,
+        browser_config: BrowserConfig | None = None,
+        max_sessions: int = 100,
+        extensions: list | None = None,
+        max_pages: int | None = 2000,
+        max_rss_mb: float | None = 4096,
+        rss_check_every: int = 25,
+        max_crash_retries: int = 2,
+    ):
+        self.browser_config = browser_config or BrowserConfig(
+            headless=True, verbose=False
+        )
+        self.max_sessions = max_sessions
+        self.extensions = extensions or []
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.rss_check_every = rss_check_every
+        self.max_crash_retries = max_crash_retries
+        self.pages = 0
+        self.recycles = 0
+        self.restarts = 0
+        self._crawler: AsyncWebCrawler | None = None
+        self._slots: asyncio.Queue[str] = asyncio.Queue()
+        self._generation = 0
+        self._browser_pages = 0
+        self._in_flight = 0
+        self._paused = False
+        self._changed = asyncio.Condition()
+
+    def _new_crawler(self) -> AsyncWebCrawler:
+        return AsyncWebCrawler(config=self.browser_config)
+
+    async def _launch(self) -> None:
+        self._crawler = self._new_crawler()
+        install_hooks(self._crawler, self.extensions)
+        await self._crawler.start()
+        self._generation += 1
+        self._browser_pages = 0
+
+    async def _shutdown(self) -> None:
+        crawler, self._crawler = self._crawler, None
+        if crawler is not None:
+            try:
+                await crawler.close()
+            except Exception as e:
+                print(f"Error closing browser: {e}")
+
+    async def start(self) -> "BrowserPool":
+        await self._launch()
+        for i in range(self.max_sessions):
+            self._slots.put_nowait(f"pool-session-{i}")
+        return self
+
+    async def close(self) -> None:
+        await self._shutdown()
+        self._slots = asyncio.Queue()
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def _needs_recycle(self) -> bool:
+        if self.max_pages is not None and self._browser_pages >= self.max_pages:
+            return True
+        return (
+            self.max_rss_mb is not None
+            and self._browser_pages % self.rss_check_every == 0
+            and self._browser_pages > 0
+            and browser_rss_mb() > self.max_rss_mb
+        )
+
+    async def _relaunch(self, generation: int, drain: bool) -> int | None:
+        """
+        Replace the browser of `generation` with a new one, pausing new fetches.
+
+        With `drain`, in-flight pages are allowed to finish first. Returns the
+        number of pages the old browser served, or None if another fetch
+        already replaced it.
+        """
+        async with self._changed:
+            if self._paused or generation != self._generation:
+                return None
+            self._paused = True
+            if drain:
+                await self._changed.wait_for(lambda: self._in_flight == 0)
+        pages = self._browser_pages
+        try:
+            await self._shutdown()
+            await self._launch()
+        finally:
+            async with self._changed:
+                self._paused = False
+                self._changed.notify_all()
+        return pages
+
+    async def _recycle(self, generation: int) -> None:
+        pages = await self._relaunch(generation, drain=True)
+        if pages is not None:
+            self.recycles += 1
+            print(f"Recycled browser after {pages} pages")
+
+    async def _restart(self, generation: int, error: str) -> None:
+        """Restart a crashed browser, unless another fetch already did."""
+        if await self._relaunch(generation, drain=False) is not None:
+            self.restarts += 1
+            print(f"Browser crashed ({error}), restarted")
+
+    async def fetch(self, url: str, config: CrawlerRunConfig):
+        """Render `url` on a free session slot, waiting if all slots are busy."""
+        if self._crawler is None:
+            raise RuntimeError("BrowserPool is not started")
+        for attempt in range(self.max_crash_retries + 1):
+            session_id = await self._slots.get()
+            async with self._changed:
+                await self._changed.wait_for(lambda: not self._paused)
+                self._in_flight += 1
+            generation = self._generation
+            try:
+                result = await self._crawler.arun(
+                    url=url, config=config.clone(session_id=session_id)
+                )
+                error = None if result.success else result.error_message
+            except Exception as e:
+                if not is_browser_crash(str(e)) or attempt == self.max_crash_retries:
+                    raise
+                result, error = None, str(e)
+            finally:
+                self._slots.put_nowait(session_id)
+                async with self._changed:
+                    self._in_flight -= 1
+                    self._changed.notify_all()
+
+            if is_browser_crash(error) and attempt < self.max_crash_retries:
+                await self._restart(generation, error)
+                continue
+            self.pages += 1
+            if generation == self._generation:
+                self._browser_pages += 1
+                if self._needs_recycle():
+                    await self._recycle(generation)
+            return result
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "browser_pages": self.pages,
+            "browser_recycles": self.recycles,
+            "browser_restarts": self.restarts,
+        }
@@ -0,0 +1,99 @@
+import random
+import time
+from dataclasses import dataclass
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based)."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+@dataclass
+class _Circuit:
+    failures: int = 0
+    trips: int = 0
+    open_until: float = 0.0
+    probe_started: float | None = None
+
+
+class CircuitBreaker:
+    """
+    Per-domain circuit breaker that stops broken shops from taking crawl slots.
+
+    After `failure_threshold` consecutive failures a domain's circuit opens for
+    `cooldown` seconds (doubling with every trip up to `max_cooldown`). Then it
+    half-opens: a single probe request is let through, and its result closes
+    the circuit or opens it again. After `max_trips` trips the domain is given
+    up for this run and its remaining URLs are kept for the next one.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 60.0,
+        max_cooldown: float = 900.0,
+        max_trips: int = 3,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_trips = max_trips
+        self._circuits: dict[str, _Circuit] = {}
+
+    def _cooldown(self, circuit: _Circuit) -> float:
+        return min(self.max_cooldown, self.cooldown * 2 ** (circuit.trips - 1))
+
+    def state(self, domain: str, now: float | None = None) -> str:
+        now = time.monotonic() if now is None else now
+        circuit = self._circuits.get(domain)
+        if circuit is not None and circuit.trips > self.max_trips:
+            return "given_up"
+        if circuit is None or circuit.trips == 0 or circuit.open_until == 0:
+            return "closed"
+        return "open" if now < circuit.open_until else "half_open"
+
+    def retry_after(self, domain: str, now: float | None = None) -> float | None:
+        """
+        Seconds to wait before a request to `domain` may be sent.
+
+        Returns 0 if the request may go now and None if the domain was given up.
+        """
+        now = time.monotonic() if now is None else now
+        state = self.state(domain, now)
+        if state == "closed":
+            return 0.0
+        if state == "given_up":
+            return None
+        circuit = self._circuits[domain]
+        if state == "open":
+            return circuit.open_until - now
+        # Half-open: one probe at a time; a probe that never reports is replaced.
+        probe_timeout = self._cooldown(circuit)
+        if circuit.probe_started is None or now - circuit.probe_started > probe_timeout:
+            circuit.probe_started = now
+            return 0.0
+        return min(probe_timeout, 10.0)
+
+    def record(self, domain: str, ok: bool, now: float | None = None) -> None:
+        """Record the result of a request to `domain`."""
+        now = time.monotonic() if now is None else now
+        circuit = self._circuits.setdefault(domain, _Circuit())
+        if circuit.trips > self.max_trips:
+            # Late answers of requests sent before giving up change nothing.
+            return
+        half_open = circuit.probe_started is not None
+        circuit.probe_started = None
+        if ok:
+            circuit.failures = 0
+            circuit.open_until = 0.0
+            return
+        circuit.failures += 1
+        if half_open or (
+            circuit.open_until == 0 and circuit.failures >= self.failure_threshold
+        ):
+            circuit.trips += 1
+            circuit.open_until = now + self._cooldown(circuit)
+            if circuit.trips > self.max_trips:
+                print(f"Giving up on {domain} for this run after {circuit.trips} trips")
+            else:
+                print(f"Circuit open for {domain} for {self._cooldown(circuit):.0f}s")
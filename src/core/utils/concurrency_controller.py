@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import psutil
+
+
+def _is_python_worker(process: psutil.Process) -> bool:
+    try:
+        return any("multiprocessing" in arg for arg in process.cmdline())
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return True
+
+
+def browser_processes(process: psutil.Process) -> list[psutil.Process]:
+    """
+    Descendants of `process` that belong to the browser.
+
+    Python multiprocessing children (the ExtractionPool's workers and their
+    resource tracker) are left out, so their memory never counts as the
+    browser's.
+    """
+    processes = []
+    for child in process.children():
+        if _is_python_worker(child):
+            continue
+        try:
+            processes.extend([child, *child.children(recursive=True)])
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return processes
+
+
+def rss_bytes(processes: list[psutil.Process]) -> int:
+    rss = 0
+    for proc in processes:
+        try:
+            rss += proc.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return rss
+
+
+def process_tree_rss(process: psutil.Process) -> int:
+    """Resident memory of `process` and its browser (e.g. Chromium), in bytes."""
+    return rss_bytes([process, *browser_processes(process)])
+
+
+class ConcurrencyController:
+    """
+    Global AIMD limit on the number of in-flight browser pages.
+
+    Every `interval` seconds the controller samples system memory, the RSS of
+    this process and its browser children (not extraction workers), and
+    event-loop lag. The limit is
+    cut by `backoff` when memory use reaches `memory_high`, the loop lags by
+    more than `max_loop_lag` seconds or page latency rises above
+    `latency_factor` times its baseline; it grows by one while all slots are
+    busy and memory stays below `memory_low`. Every decision is kept in
+    `decisions` and summarized by `metrics`.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        memory_high: float = 0.85,
+        memory_low: float = 0.70,
+        max_loop_lag: float = 0.5,
+        latency_factor: float = 2.0,
+        backoff: float = 0.7,
+        interval: float = 2.0,
+    ):
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.memory_high = memory_high
+        self.memory_low = memory_low
+        self.max_loop_lag = max_loop_lag
+        self.latency_factor = latency_factor
+        self.backoff = backoff
+        self.interval = interval
+        self.in_flight = 0
+        self.latency: float | None = None
+        self.baseline: float | None = None
+        self.rss_mb = 0.0
+        self.decisions: deque[dict] = deque(maxlen=1000)
+        self.increases = 0
+        self.decreases = 0
+        self._changed = asyncio.Condition()
+        self._sampler: asyncio.Task | None = None
+        self._process = psutil.Process()
+
+    async def start(self) -> "ConcurrencyController":
+        self._sampler = asyncio.create_task(self._sample_loop())
+        return self
+
+    async def close(self) -> None:
+        if self._sampler is not None:
+            self._sampler.cancel()
+            await asyncio.gather(self._sampler, return_exceptions=True)
+            self._sampler = None
+
+    async def __aenter__(self) -> "ConcurrencyController":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the `limit` page slots and record the page's latency."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record_latency(time.monotonic() - started)
+            async with self._changed:
+                self.in_flight -= 1
+                self._changed.notify_all()
+
+    def _record_latency(self, latency: float) -> None:
+        if self.latency is None:
+            self.latency = self.baseline = latency
+            return
+        self.latency = 0.9 * self.latency + 0.1 * latency
+        self.baseline = min(
+            self.latency, self.baseline + 0.01 * (self.latency - self.baseline)
+        )
+
+    async def _sample_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            loop_lag = max(0.0, loop.time() - started - self.interval)
+            memory, rss = await asyncio.to_thread(self._sample_memory)
+            async with self._changed:
+                self.observe(memory, loop_lag, rss / 2**20)
+                self._changed.notify_all()
+
+    def _sample_memory(self) -> tuple[float, int]:
+        return psutil.virtual_memory().percent / 100, process_tree_rss(self._process)
+
+    def observe(self, memory: float, loop_lag: float, rss_mb: float) -> str:
+        """Adjust the limit to one sample and return the action taken."""
+        self.rss_mb = rss_mb
+        if memory >= self.memory_high:
+            action, reason = "decrease", "memory"
+        elif loop_lag > self.max_loop_lag:
+            action, reason = "decrease", "loop_lag"
+        elif (
+            self.latency is not None
+            and self.latency > self.latency_factor * self.baseline
+        ):
+            action, reason = "decrease", "latency"
+        elif self.in_flight >= self.limit and memory < self.memory_low:
+            action, reason = "increase", "saturated"
+        else:
+            action, reason = "hold", ""
+
+        previous = self.limit
+        if action == "decrease":
+            self.limit = max(self.min_limit, int(self.limit * self.backoff))
+        elif action == "increase":
+            self.limit = min(self.max_limit, self.limit + 1)
+        if self.limit < previous:
+            self.decreases += 1
+        elif self.limit > previous:
+            self.increases += 1
+        else:
+            action = "hold"
+
+        self.decisions.append(
+            {
+                "time": time.time(),
+                "action": action,
+                "reason": reason,
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "memory": round(memory, 3),
+                "rss_mb": round(rss_mb, 1),
+                "loop_lag": round(loop_lag, 3),
+                "latency": round(self.latency, 3) if self.latency else None,
+            }
+        )
+        if action == "decrease":
+            print(f"Concurrency limit {previous} -> {self.limit} ({reason})")
+        return action
+
+    def metrics(self) -> dict[str, float]:
+        return {
+            "concurrency_limit": self.limit,
+            "concurrency_in_flight": self.in_flight,
+            "concurrency_increases": self.increases,
+            "concurrency_decreases": self.decreases,
+            "rss_mb": round(self.rss_mb, 1),
+        }
@@ -0,0 +1,69 @@
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class DomainBudget:
+    """Per-domain crawl caps; None means unlimited."""
+
+    max_pages: int | None = None
+    max_seconds: float | None = None
+    max_bytes: int | None = None
+
+
+@dataclass
+class _Usage:
+    started: float = field(default_factory=time.monotonic)
+    pages: int = 0
+    bytes: int = 0
+
+
+class CrawlBudget:
+    """
+    Tracks pages, wall time and bytes spent per domain against its budget.
+
+    `default` applies to every domain without an entry in `per_domain`. The
+    wall-time clock of a domain starts with its first admitted page.
+    """
+
+    def __init__(
+        self,
+        default: DomainBudget | None = None,
+        per_domain: dict[str, DomainBudget] | None = None,
+    ):
+        self.default = default or DomainBudget()
+        self.per_domain = per_domain or {}
+        self._usage: dict[str, _Usage] = {}
+
+    def budget(self, domain: str) -> DomainBudget:
+        return self.per_domain.get(domain, self.default)
+
+    def admit(self, domain: str, now: float | None = None) -> bool:
+        """Count one more page for `domain` if its budget is not exhausted."""
+        now = time.monotonic() if now is None else now
+        budget = self.budget(domain)
+        usage = self._usage.setdefault(domain, _Usage(started=now))
+        if (
+            (budget.max_pages is not None and usage.pages >= budget.max_pages)
+            or (
+                budget.max_seconds is not None
+                and now - usage.started >= budget.max_seconds
+            )
+            or (budget.max_bytes is not None and usage.bytes >= budget.max_bytes)
+        ):
+            return False
+        usage.pages += 1
+        return True
+
+    def spend_bytes(self, domain: str, size: int) -> None:
+        self._usage.setdefault(domain, _Usage()).bytes += size
+
+    def usage(self, domain: str) -> dict[str, float]:
+        usage = self._usage.get(domain)
+        if usage is None:
+            return {"pages": 0, "seconds": 0.0, "bytes": 0}
+        return {
+            "pages": usage.pages,
+            "seconds": time.monotonic() - usage.started,
+            "bytes": usage.bytes,
+        }
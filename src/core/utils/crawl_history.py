@@ -0,0 +1,100 @@
+import time
+from datetime import datetime, timezone
+
+from src.core.utils.storage import SqliteStore, data_path
+
+DAY = 86400.0
+
+CHANGEFREQ_SECONDS = {
+    "always": 0.0,
+    "hourly": 3600.0,
+    "daily": DAY,
+    "weekly": 7 * DAY,
+    "monthly": 30 * DAY,
+    "yearly": 365 * DAY,
+    "never": float("inf"),
+}
+
+
+def parse_lastmod(value: str | None) -> float | None:
+    """Parse a sitemap W3C datetime (date or full timestamp) into a UTC timestamp."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def is_due(
+    entry: dict,
+    last_crawled: float | None,
+    now: float,
+    full_refresh_after: float | None = None,
+) -> bool:
+    """
+    Decide whether a seeded URL has to be crawled in an incremental run.
+
+    New URLs are always due. Known URLs are due when their sitemap `lastmod` is
+    newer than the last crawl or, without a lastmod, when their `changefreq`
+    interval has passed. `full_refresh_after` (seconds) re-crawls every URL
+    whose last crawl is older than that, whatever the sitemap says.
+    """
+    if last_crawled is None:
+        return True
+    if full_refresh_after is not None and now - last_crawled >= full_refresh_after:
+        return True
+    lastmod = parse_lastmod(entry.get("lastmod"))
+    if lastmod is not None:
+        return lastmod > last_crawled
+    interval = CHANGEFREQ_SECONDS.get((entry.get("changefreq") or "").lower())
+    if interval is None:
+        return True
+    return now - last_crawled >= interval
+
+
+class CrawlHistory(SqliteStore):
+    """Persistent time of the last successful crawl of every URL."""
+
+    schema = (
+        "CREATE TABLE IF NOT EXISTS history ("
+        "url TEXT PRIMARY KEY, last_crawled REAL NOT NULL)",
+    )
+
+    def __init__(self, file_path: str | None = None, commit_every: int = 1000):
+        super().__init__(file_path or data_path("crawl_history.sqlite3"), commit_every)
+
+    def last_crawled(self, url: str) -> float | None:
+        row = self._conn.execute(
+            "SELECT last_crawled FROM history WHERE url = ?", (url,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def record(self, url: str, crawled_at: float) -> None:
+        self._write("INSERT OR REPLACE INTO history VALUES (?, ?)", (url, crawled_at))
+
+    def select_due(
+        self,
+        entries_by_domain: dict[str, list[dict]],
+        full_refresh_days: float | None = None,
+        now: float | None = None,
+    ) -> dict[str, list[dict]]:
+        """Keep only the seeded entries that changed since their last crawl."""
+        self.commit()
+        now = time.time() if now is None else now
+        full_refresh_after = (
+            full_refresh_days * DAY if full_refresh_days is not None else None
+        )
+        return {
+            domain: [
+                entry
+                for entry in entries
+                if is_due(
+                    entry, self.last_crawled(entry["url"]), now, full_refresh_after
+                )
+            ]
+            for domain, entries in entries_by_domain.items()
+        }
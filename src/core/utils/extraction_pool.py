@@ -0,0 +1,161 @@
+import asyncio
+import contextlib
+import io
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+from src.core.utils.fingerprint_cache import structured_fingerprint
+from src.core.utils.standards_extractor import (
+    ExtractionStats,
+    extract_standard,
+    is_valid_product,
+)
+from src.core.utils.structured_data import HtmlDocument, LazyStructuredData
+
+# Touches every syntax and language detection, so a warmed-up worker has
+# imported and initialised everything a real page needs.
+_WARMUP_PAGE = b"""<html><head><meta property="og:title" content="Vase">
+<script type="application/ld+json">{"@type": "Product", "name": "Blue glass vase",
+"offers": {"price": "12.00", "priceCurrency": "EUR"}}</script></head>
+<body vocab="http://schema.org/"><div typeof="Product"><span property="name">Vase</span>
+</div><div itemscope itemtype="http://schema.org/Product"><span itemprop="name">Vase
+</span></div></body></html>"""
+
+
+@dataclass
+class PageExtraction:
+    """What `extract_page` sends back; small, so it pickles cheaply."""
+
+    product: dict | list[dict] | None = None
+    syntaxes: list[str] = field(default_factory=list)
+    fingerprint: str | None = None
+    unchanged: bool = False
+    stats: dict[str, Counter] = field(default_factory=dict)
+
+
+def extract_page(
+    html: str | bytes,
+    url: str,
+    domain: str,
+    known: tuple[list[str], str] | None = None,
+    full: bool = False,
+    syntaxes: list[str] | None = None,
+) -> PageExtraction:
+    """
+    Run `extract_standard` on a page; called in a worker thread or process.
+
+    `known` holds the syntaxes and fingerprint of the product stored for the
+    URL. If the page's structured data in those syntaxes is unchanged, only
+    `unchanged` is set and the caller reuses the stored product. Otherwise
+    a valid product comes back with the fingerprint of the syntaxes read.
+    Only `syntaxes` (all if None) are read, e.g. of a truncated page.
+    """
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", "replace")
+    structured = LazyStructuredData(HtmlDocument(html, url), syntaxes)
+    if known is not None and set(known[0]) <= set(structured):
+        syntaxes, fingerprint = known
+        if structured_fingerprint({s: structured[s] for s in syntaxes}) == fingerprint:
+            return PageExtraction(
+                syntaxes=syntaxes, fingerprint=fingerprint, unchanged=True
+            )
+    stats = ExtractionStats()
+    product = asyncio.run(
+        extract_standard(structured, url, full=full, stats=stats, domain=domain)
+    )
+    extraction = PageExtraction(product, list(structured.parsed), stats=stats.domains)
+    if is_valid_product(product):
+        extraction.fingerprint = structured_fingerprint(
+            {s: structured[s] for s in extraction.syntaxes}
+        )
+    return extraction
+
+
+def _warm_up() -> None:
+    """Process pool initializer."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        extract_page(_WARMUP_PAGE, "https://warmup.invalid/", "warmup", full=True)
+
+
+class ExtractionPool:
+    """
+    Runs `extract_page` off the event loop that drives fetching and the browser.
+
+    Pages of up to `thread_max_chars` are extracted in a thread, which costs
+    no hand-over. Larger pages go to `processes` worker processes (one per
+    CPU core if None, none if 0), so extraction uses every core instead of
+    competing with the event loop for the GIL. Entering the pool starts all
+    workers and warms them up (imports, parsers, language profiles). Pages
+    are sent to workers as UTF-8 bytes, the cheapest payload to pickle.
+    """
+
+    def __init__(self, processes: int | None = None, thread_max_chars: int = 65536):
+        self.processes = (os.cpu_count() or 1) if processes is None else processes
+        self.thread_max_chars = thread_max_chars
+        self.counts = Counter()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _start(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up,
+        )
+
+    async def __aenter__(self):
+        if self.processes:
+            self._executor = self._start()
+            loop = asyncio.get_running_loop()
+            # Every worker is started and warmed up before the first page.
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._executor, os.getpid)
+                    for _ in range(self.processes)
+                )
+            )
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, cancel_futures=True)
+
+    async def extract(
+        self,
+        html: str,
+        url: str,
+        domain: str,
+        known: tuple[list[str], str] | None = None,
+        full: bool = False,
+        syntaxes: list[str] | None = None,
+    ) -> PageExtraction:
+        executor = self._executor
+        if executor is not None and len(html) > self.thread_max_chars:
+            page = html.encode("utf-8")
+            try:
+                extraction = await asyncio.get_running_loop().run_in_executor(
+                    executor, extract_page, page, url, domain, known, full, syntaxes
+                )
+                self.counts["processes"] += 1
+                return extraction
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); the page falls back to
+                # a thread and the first failed page replaces the pool.
+                if self._executor is executor:
+                    print(f"Extraction worker died on {url}, restarting workers")
+                    self._executor = self._start()
+                    executor.shutdown(wait=False)
+        self.counts["threads"] += 1
+        return await asyncio.to_thread(
+            extract_page, html, url, domain, known, full, syntaxes
+        )
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "extracted_in_threads": self.counts["threads"],
+            "extracted_in_processes": self.counts["processes"],
+        }
@@ -0,0 +1,100 @@
+import hashlib
+import json
+
+from src.core.utils.storage import SqliteStore, data_path
+
+
+def structured_fingerprint(data: dict) -> str:
+    """Stable hash of an extruct payload, independent of dict key order."""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class FingerprintCache(SqliteStore):
+    """
+    Per-URL cache of `extract_standard` results keyed by structured-data hash.
+
+    Pages often change (CSRF tokens, ads, timestamps) while their JSON-LD,
+    microdata, RDFa and OpenGraph blocks stay byte-identical. When the hash of
+    the extruct payload matches the stored one, the stored product is reused
+    and the strategies, merging and language detection are skipped.
+
+    Extraction only parses the syntaxes it needs, so the hash covers the
+    `syntaxes` the stored product was extracted from.
+    """
+
+    schema = (
+        "CREATE TABLE IF NOT EXISTS fingerprints ("
+        "url TEXT PRIMARY KEY, fingerprint TEXT, product TEXT, syntaxes TEXT)",
+    )
+
+    def __init__(self, file_path: str | None = None, commit_every: int = 100):
+        super().__init__(file_path or data_path("fingerprints.sqlite3"), commit_every)
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, url: str) -> str | None:
+        """Fingerprint of the stored product of `url`, None if there is none."""
+        row = self._conn.execute(
+            "SELECT fingerprint FROM fingerprints WHERE url = ?", (url,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def syntaxes(self, url: str) -> list[str] | None:
+        """Syntaxes the stored product of `url` was extracted from (None: all)."""
+        row = self._conn.execute(
+            "SELECT syntaxes FROM fingerprints WHERE url = ?", (url,)
+        ).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def lookup(self, url: str, fingerprint: str | None) -> dict | list[dict] | None:
+        """Return the stored product if `fingerprint` is unchanged for `url`."""
+        row = self._conn.execute(
+            "SELECT fingerprint, product FROM fingerprints WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None or row[0] != fingerprint:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[1])
+
+    def product(self, url: str) -> dict | list[dict] | None:
+        """The stored product of `url`, None if there is none."""
+        row = self._conn.execute(
+            "SELECT product FROM fingerprints WHERE url = ?", (url,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def has_product(self, url: str) -> bool:
+        """Whether `url` produced a product in an earlier run."""
+        return (
+            self._conn.execute(
+                "SELECT 1 FROM fingerprints WHERE url = ?", (url,)
+            ).fetchone()
+            is not None
+        )
+
+    def store(
+        self,
+        url: str,
+        fingerprint: str,
+        product: dict | list[dict],
+        syntaxes: list[str] | None = None,
+    ) -> None:
+        self._write(
+            "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?)",
+            (
+                url,
+                fingerprint,
+                json.dumps(product, ensure_ascii=False),
+                json.dumps(syntaxes) if syntaxes is not None else None,
+            ),
+        )
+
+    def counters(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
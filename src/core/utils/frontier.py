@@ -0,0 +1,205 @@
+import json
+import time
+
+from src.core.utils.storage import SqliteStore, data_path
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+RETRY = "retry"
+UNCHANGED = "unchanged"
+
+
+class Frontier(SqliteStore):
+    """
+    On-disk crawl frontier that makes `crawl_batch` resumable.
+
+    Every seeded URL is recorded with its state (pending, in_flight, done,
+    failed, skipped, retry) and, once done, the product extracted from it.
+    After a crash the crawl resumes with the pending and in-flight URLs only;
+    finished URLs are never fetched again. State changes are committed in
+    batches by a background writer (see `SqliteStore`), so the sharded
+    runner's workers share the file without blocking their event loops.
+
+    URLs in the retry state failed with retries left when the run ended; they
+    are carried over into the next run's frontier with their attempt count.
+    URLs in the unchanged state were not due in an incremental run; they are
+    never fetched and carry the product stored by an earlier run.
+
+    Methods that take `domains` only touch those domains' URLs (all if None),
+    so crawls of different domains keep each other's checkpoints.
+    """
+
+    schema = (
+        "CREATE TABLE IF NOT EXISTS frontier ("
+        "url TEXT PRIMARY KEY, domain TEXT NOT NULL, state TEXT NOT NULL, "
+        "product TEXT, updated_at REAL, attempts INTEGER NOT NULL DEFAULT 0, "
+        "priority REAL NOT NULL DEFAULT 0)",
+        "CREATE INDEX IF NOT EXISTS frontier_state ON frontier (state)",
+        "CREATE INDEX IF NOT EXISTS frontier_domain ON frontier (domain)",
+    )
+
+    def __init__(
+        self,
+        file_path: str | None = None,
+        commit_every: int = 500,
+        commit_interval: float = 1.0,
+    ):
+        super().__init__(
+            file_path or data_path("frontier.sqlite3"), commit_every, commit_interval
+        )
+
+    def is_empty(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM frontier LIMIT 1").fetchone() is None
+
+    def clear(self, domains: list[str] | None = None) -> None:
+        if domains is None:
+            self._conn.execute("DELETE FROM frontier")
+        else:
+            self._conn.executemany(
+                "DELETE FROM frontier WHERE domain = ?", ((d,) for d in domains)
+            )
+        self.commit()
+
+    def add_urls(
+        self,
+        urls_by_domain: dict[str, list[str]],
+        priorities: dict[str, float] | None = None,
+    ) -> None:
+        """Record seeded URLs as pending; URLs already known keep their state."""
+        priorities = priorities or {}
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO frontier (url, domain, state, priority) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                (url, domain, PENDING, priorities.get(url, 0.0))
+                for domain, urls in urls_by_domain.items()
+                for url in urls
+            ),
+        )
+        self.commit()
+
+    def remaining(self, domains: list[str] | None = None) -> dict[str, list[str]]:
+        """
+        URLs still to crawl, grouped by domain and optionally limited to `domains`.
+
+        Each domain's URLs are ordered by priority, highest first. In-flight
+        URLs are included: they were interrupted by a crash.
+        """
+        self.commit()
+        wanted = set(domains) if domains is not None else None
+        remaining: dict[str, list[str]] = {}
+        rows = self._conn.execute(
+            "SELECT domain, url FROM frontier WHERE state IN (?, ?) "
+            "ORDER BY priority DESC, rowid",
+            (PENDING, IN_FLIGHT),
+        )
+        for domain, url in rows:
+            if wanted is None or domain in wanted:
+                remaining.setdefault(domain, []).append(url)
+        return remaining
+
+    def add_unchanged(self, products_by_domain: dict[str, dict[str, object]]) -> None:
+        """Record URLs that are not crawled this run with their stored products."""
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO frontier (url, domain, state, product) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                (url, domain, UNCHANGED, json.dumps(product, ensure_ascii=False))
+                for domain, products in products_by_domain.items()
+                for url, product in products.items()
+            ),
+        )
+        self.commit()
+
+    def add_retries(self, retries: dict[str, dict[str, int]]) -> None:
+        """Queue URLs carried over from an earlier run with their attempt counts."""
+        self._conn.executemany(
+            "INSERT INTO frontier (url, domain, state, attempts) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (url) DO UPDATE SET attempts = excluded.attempts",
+            (
+                (url, domain, PENDING, attempts)
+                for domain, urls in retries.items()
+                for url, attempts in urls.items()
+            ),
+        )
+        self.commit()
+
+    def retries(self, domains: list[str] | None = None) -> dict[str, dict[str, int]]:
+        """URLs left for the next run, grouped by domain, with their attempts."""
+        self.commit()
+        wanted = set(domains) if domains is not None else None
+        retries: dict[str, dict[str, int]] = {}
+        rows = self._conn.execute(
+            "SELECT domain, url, attempts FROM frontier WHERE state = ?", (RETRY,)
+        )
+        for domain, url, attempts in rows:
+            if wanted is None or domain in wanted:
+                retries.setdefault(domain, {})[url] = attempts
+        return retries
+
+    def attempts(self, url: str) -> int:
+        row = self._conn.execute(
+            "SELECT attempts FROM frontier WHERE url = ?", (url,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def mark(
+        self, url: str, state: str, product=None, attempts: int | None = None
+    ) -> None:
+        self._write(
+            "UPDATE frontier SET state = ?, product = ?, updated_at = ?, "
+            "attempts = COALESCE(?, attempts) WHERE url = ?",
+            (
+                state,
+                None if product is None else json.dumps(product, ensure_ascii=False),
+                time.time(),
+                attempts,
+                url,
+            ),
+        )
+
+    def results(self, domains: list[str] | None = None) -> dict[str, list]:
+        """Products of all finished and unchanged URLs, grouped by domain."""
+        self.commit()
+        wanted = set(domains) if domains is not None else None
+        results: dict[str, list] = {}
+        rows = self._conn.execute(
+            "SELECT domain, product FROM frontier "
+            "WHERE state IN (?, ?) AND product IS NOT NULL ORDER BY rowid",
+            (DONE, UNCHANGED),
+        )
+        for domain, product in rows:
+            if wanted is None or domain in wanted:
+                results.setdefault(domain, []).append(json.loads(product))
+        return results
+
+    def finished(self, domains: list[str] | None = None) -> list[tuple[str, float]]:
+        """(url, finished_at) of every URL that was crawled successfully."""
+        return [
+            (url, finished_at)
+            for domain, url, finished_at in self._done(domains, "updated_at")
+        ]
+
+    def outcomes(self, domains: list[str] | None = None) -> list[tuple[str, str, bool]]:
+        """(domain, url, found_product) of every URL that was crawled successfully."""
+        return [
+            (domain, url, bool(found))
+            for domain, url, found in self._done(domains, "product IS NOT NULL")
+        ]
+
+    def _done(self, domains: list[str] | None, column: str):
+        self.commit()
+        wanted = set(domains) if domains is not None else None
+        rows = self._conn.execute(
+            f"SELECT domain, url, {column} FROM frontier WHERE state = ?", (DONE,)
+        )
+        return [row for row in rows if wanted is None or row[0] in wanted]
+
+    def counts(self) -> dict[str, int]:
+        self.commit()
+        return dict(
+            self._conn.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state")
+        )
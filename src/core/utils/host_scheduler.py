@@ -0,0 +1,169 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from src.core.utils.storage import DomainStore
+
+THROTTLE_STATUSES = {429, 503}
+
+
+@dataclass
+class HostSlot:
+    """
+    Permission to send one request; set `status` so the scheduler can adapt.
+
+    `latency` defaults to the time the slot was held; set it to exclude time
+    spent waiting for other limits.
+    """
+
+    status: int | None = None
+    latency: float | None = None
+
+
+@dataclass
+class _HostState:
+    concurrency: float
+    rate: float
+    max_rate: float
+    tokens: float = 1.0
+    refilled_at: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    latency: float | None = None
+    baseline: float | None = None
+    decreased_at: float = 0.0
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+
+class HostScheduler(DomainStore):
+    """
+    Per-domain politeness: a token bucket plus an adaptive concurrency limit.
+
+    Requests to a domain need a free slot (at most `concurrency` in flight) and
+    a token (refilled at `rate` per second). Both limits grow additively while
+    response latency stays near the domain's baseline and are cut by `backoff`
+    on 429/503, connection errors or latency above `latency_factor` times the
+    baseline (AIMD). The learned limits are stored per domain, so the next run
+    starts where this one ended. A robots.txt Crawl-delay caps the rate.
+    """
+
+    filename = "host_limits.json"
+
+    def __init__(
+        self,
+        file_path: str | None = None,
+        initial_concurrency: float = 2.0,
+        max_concurrency: float = 16.0,
+        initial_rate: float = 2.0,
+        min_rate: float = 0.2,
+        max_rate: float = 20.0,
+        latency_factor: float = 2.0,
+        backoff: float = 0.5,
+    ):
+        super().__init__(file_path)
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.latency_factor = latency_factor
+        self.backoff = backoff
+        self._hosts: dict[str, _HostState] = {}
+
+    def _state(self, domain: str) -> _HostState:
+        if domain not in self._hosts:
+            stored = self.domains.get(domain, {})
+            self._hosts[domain] = _HostState(
+                concurrency=stored.get("concurrency", self.initial_concurrency),
+                rate=stored.get("rate", self.initial_rate),
+                max_rate=self.max_rate,
+            )
+        return self._hosts[domain]
+
+    def set_crawl_delay(self, domain: str, delay: float | None) -> None:
+        """Cap `domain`'s request rate at one request per `delay` seconds."""
+        if not delay:
+            return
+        state = self._state(domain)
+        state.max_rate = min(self.max_rate, 1.0 / delay)
+        state.rate = min(state.rate, state.max_rate)
+
+    def limits(self, domain: str) -> dict[str, float]:
+        state = self._state(domain)
+        return {"concurrency": state.concurrency, "rate": state.rate}
+
+    @asynccontextmanager
+    async def slot(self, domain: str) -> AsyncIterator[HostSlot]:
+        """Wait for a slot and a token of `domain`, then adapt to the response."""
+        state = self._state(domain)
+        async with state.changed:
+            while True:
+                now = time.monotonic()
+                state.tokens = min(
+                    max(1.0, state.concurrency),
+                    state.tokens + (now - state.refilled_at) * state.rate,
+                )
+                state.refilled_at = now
+                if state.in_flight < int(state.concurrency) and state.tokens >= 1:
+                    break
+                if state.in_flight >= int(state.concurrency):
+                    await state.changed.wait()
+                    continue
+                try:
+                    await asyncio.wait_for(
+                        state.changed.wait(), (1 - state.tokens) / state.rate
+                    )
+                except TimeoutError:
+                    pass
+            state.tokens -= 1
+            state.in_flight += 1
+
+        slot = HostSlot()
+        started = time.monotonic()
+        try:
+            yield slot
+        finally:
+            async with state.changed:
+                state.in_flight -= 1
+                latency = slot.latency
+                if latency is None:
+                    latency = time.monotonic() - started
+                self._adapt(domain, state, slot.status, latency)
+                state.changed.notify_all()
+
+    def _adapt(
+        self, domain: str, state: _HostState, status: int | None, latency: float
+    ) -> None:
+        if state.latency is None:
+            state.latency = state.baseline = latency
+        else:
+            state.latency = 0.8 * state.latency + 0.2 * latency
+            # The baseline follows the fastest latency and only drifts up slowly.
+            state.baseline = min(
+                state.latency, state.baseline + 0.01 * (state.latency - state.baseline)
+            )
+
+        overloaded = (
+            status is None
+            or status in THROTTLE_STATUSES
+            or state.latency > self.latency_factor * state.baseline
+        )
+        now = time.monotonic()
+        if overloaded:
+            # Back off at most once per round trip, not once per slow response.
+            if now - state.decreased_at >= state.latency:
+                state.concurrency = max(1.0, state.concurrency * self.backoff)
+                state.rate = max(self.min_rate, state.rate * self.backoff)
+                state.decreased_at = now
+            if status in THROTTLE_STATUSES:
+                state.tokens = 0.0
+        else:
+            state.concurrency = min(
+                self.max_concurrency, state.concurrency + 1 / state.concurrency
+            )
+            state.rate = min(state.max_rate, state.rate + 1 / state.rate)
+        self.domains[domain] = {
+            "concurrency": round(state.concurrency, 2),
+            "rate": round(state.rate, 2),
+        }
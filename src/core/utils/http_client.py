@@ -0,0 +1,60 @@
+import asyncio
+
+import aiohttp
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+}
+
+_shared: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+def create_session(
+    timeout: float = 20.0,
+    limit: int = 100,
+    limit_per_host: int = 8,
+    dns_ttl: int = 300,
+    keepalive_timeout: float = 30.0,
+    headers: dict | None = None,
+) -> aiohttp.ClientSession:
+    """
+    aiohttp session used for all non-browser HTTP.
+
+    Connections are pooled and kept alive for `keepalive_timeout` seconds, at
+    most `limit` in total and `limit_per_host` per host. DNS answers are
+    cached for `dns_ttl` seconds. Responses are requested with gzip, deflate
+    and (with the `brotli` package installed) br and decoded transparently.
+    """
+    return aiohttp.ClientSession(
+        headers=DEFAULT_HEADERS if headers is None else headers,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        connector=aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=dns_ttl,
+            keepalive_timeout=keepalive_timeout,
+        ),
+    )
+
+
+def shared_session() -> aiohttp.ClientSession:
+    """
+    Process-wide session of the running event loop, created on first use.
+
+    For one-off requests (the UI, `single_url`, `send_items`) that should reuse
+    connections across calls instead of opening a session per request.
+    """
+    loop = asyncio.get_running_loop()
+    for other in [other for other in _shared if other.is_closed()]:
+        del _shared[other]
+    session = _shared.get(loop)
+    if session is None or session.closed:
+        session = _shared[loop] = create_session()
+    return session
+
+
+async def close_shared_session() -> None:
+    session = _shared.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
@@ -0,0 +1,135 @@
+import codecs
+import re
+from dataclasses import dataclass
+
+import aiohttp
+
+from src.core.utils.http_client import create_session
+from src.core.utils.product_scanner import ProductScanner
+
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w-]+)", re.IGNORECASE)
+
+
+@dataclass
+class HttpPage:
+    """
+    Response of a plain HTTP fetch; `html` is None unless it is a 200 HTML page.
+
+    `truncated` pages were cut off after their product JSON-LD.
+    """
+
+    url: str
+    status: int
+    html: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    truncated: bool = False
+
+
+def stream_encoding(charset: str | None, head: bytes) -> str:
+    """Encoding of a streamed page: the header charset, a <meta> charset or UTF-8."""
+    match = _META_CHARSET.search(head)
+    for candidate in (charset, match and match[1].decode("ascii")):
+        if candidate:
+            try:
+                return codecs.lookup(candidate).name
+            except LookupError:
+                continue
+    return "utf-8"
+
+
+class HttpFetcher:
+    """
+    Plain async HTTP fetcher for server-rendered pages.
+
+    One pooled session (see `http_client.create_session`) is kept open for the
+    whole run, or a given `session` is used and left open. `fetch` returns a page
+    without `html` for anything that is not a successful HTML response (and None
+    if the request failed), so the caller can fall back to the browser.
+
+    With `stop_early`, bodies are streamed and the download is stopped as soon
+    as a complete product JSON-LD block has been read. Such pages are marked
+    `truncated`, and the pipeline only reads their head syntaxes.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 20.0,
+        limit_per_host: int = 8,
+        stop_early: bool = False,
+        chunk_size: int = 16384,
+        session: aiohttp.ClientSession | None = None,
+    ):
+        self.timeout = timeout
+        self.limit_per_host = limit_per_host
+        self.stop_early = stop_early
+        self.chunk_size = chunk_size
+        self._owns_session = session is None
+        self._session = session
+
+    async def start(self) -> "HttpFetcher":
+        if self._owns_session:
+            self._session = create_session(
+                timeout=self.timeout, limit_per_host=self.limit_per_host
+            )
+        return self
+
+    async def close(self) -> None:
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "HttpFetcher":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def fetch(self, url: str, headers: dict | None = None) -> HttpPage | None:
+        """
+        Fetch `url`, optionally with extra (e.g. conditional) request headers.
+
+        Returns None if the request failed and a page without `html` if the
+        response is not a 200 HTML page.
+        """
+        if self._session is None:
+            raise RuntimeError("HttpFetcher is not started")
+        try:
+            async with self._session.get(url, headers=headers) as resp:
+                if resp.status != 200 or "html" not in resp.content_type:
+                    return HttpPage(str(resp.url), resp.status)
+                if self.stop_early:
+                    html, truncated = await self._read_until_product(resp)
+                else:
+                    html, truncated = await resp.text(), False
+                return HttpPage(
+                    str(resp.url),
+                    resp.status,
+                    html,
+                    resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"),
+                    truncated,
+                )
+        except (aiohttp.ClientError, TimeoutError, UnicodeDecodeError):
+            return None
+
+    async def _read_until_product(
+        self, resp: aiohttp.ClientResponse
+    ) -> tuple[str, bool]:
+        """Read the body until a product JSON-LD block is complete or it ends."""
+        scanner = ProductScanner()
+        decoder = None
+        parts = []
+        async for chunk in resp.content.iter_chunked(self.chunk_size):
+            if decoder is None:
+                encoding = stream_encoding(resp.charset, chunk[:2048])
+                decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            text = decoder.decode(chunk)
+            parts.append(text)
+            if scanner.feed(text):
+                # The rest of the body is never read, so the connection is dropped.
+                resp.close()
+                return "".join(parts), True
+        if decoder is not None:
+            parts.append(decoder.decode(b"", final=True))
+        return "".join(parts), False
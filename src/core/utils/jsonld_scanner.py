@@ -0,0 +1,120 @@
+import json
+import re
+from html import unescape
+
+import orjson
+
+# extruct, like this scanner, only matches the MIME type in lower case, so
+# pages are searched for it with a plain substring search instead of a regex.
+_JSONLD_TYPE = r"<script\b[^>]*\btype\s*=\s*[\"']?\s*application/ld\+json"
+_SCRIPT_END = r"</script\s*>"
+
+
+def _patterns(text_type: type) -> dict:
+    def encode(value: str):
+        return value if text_type is str else value.encode()
+
+    return {
+        "needle": encode("application/ld+json"),
+        "tag_start": encode("<"),
+        "tag_end": encode(">"),
+        "comment_start": encode("<!--"),
+        "comment_end": encode("-->"),
+        "jsonld_type": re.compile(encode(_JSONLD_TYPE), re.IGNORECASE),
+        "script_end": re.compile(encode(_SCRIPT_END), re.IGNORECASE),
+    }
+
+
+_PATTERNS = {str: _patterns(str), bytes: _patterns(bytes)}
+
+# Strings are matched (and kept) first, so what the other alternatives remove
+# is never inside a string: comments, CDATA and HTML comment markers and
+# commas before a closing bracket.
+_LENIENT = re.compile(
+    r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/|<!--|-->|<!\[CDATA\[|\]\]>|,(?=\s*[\]}])',
+    re.DOTALL,
+)
+
+_decoder = json.JSONDecoder(strict=False)
+
+
+def _loads_lenient(text: str) -> list:
+    """Every JSON value in `text`, after removing what shops commonly get wrong."""
+    text = _LENIENT.sub(lambda m: m[1] or "", text)
+    values, position = [], 0
+    while True:
+        while position < len(text) and text[position] in " \t\n\r,;":
+            position += 1
+        if position == len(text):
+            return values
+        value, position = _decoder.raw_decode(text, position)
+        values.append(value)
+
+
+def load_jsonld(script: str | bytes) -> list:
+    """
+    The JSON values in the body of a JSON-LD script, empty if it is unreadable.
+
+    Tolerates comments, trailing commas, several concatenated values and
+    bodies that were HTML-escaped as a whole.
+    """
+    try:
+        return [orjson.loads(script)]
+    except orjson.JSONDecodeError:
+        pass
+    if isinstance(script, bytes):
+        script = script.decode("utf-8", "replace")
+    try:
+        return _loads_lenient(script)
+    except ValueError:
+        pass
+    if "&" in script:
+        try:
+            return _loads_lenient(unescape(script))
+        except ValueError:
+            pass
+    return []
+
+
+def _in_comment(html: str | bytes, position: int, p: dict) -> bool:
+    start = html.rfind(p["comment_start"], 0, position)
+    return start != -1 and html.find(p["comment_end"], start, position) == -1
+
+
+def iter_jsonld_scripts(html: str | bytes):
+    """
+    Bodies of the `<script type="application/ld+json">` elements in `html`.
+
+    Scripts inside HTML comments are skipped, as an HTML parser would.
+    """
+    p = _PATTERNS[type(html)]
+    position = 0
+    while (found := html.find(p["needle"], position)) != -1:
+        position = found + len(p["needle"])
+        start = html.rfind(p["tag_start"], 0, found)
+        if start == -1 or not p["jsonld_type"].match(html, start, position):
+            continue
+        body_start = html.find(p["tag_end"], found) + 1
+        end = p["script_end"].search(html, body_start) if body_start else None
+        if end is None:
+            return
+        position = end.end()
+        if not _in_comment(html, start, p):
+            yield html[body_start : end.start()]
+
+
+def scan_jsonld(html: str | bytes) -> list:
+    """
+    JSON-LD items of a page without parsing its HTML.
+
+    Same shape as extruct's `JsonLdExtractor`: a top-level list contributes
+    its items, and empty items are dropped.
+    """
+    items = []
+    for script in iter_jsonld_scripts(html):
+        for value in load_jsonld(script):
+            if isinstance(value, list):
+                items.extend(item for item in value if item)
+            elif isinstance(value, dict) and value:
+                items.append(value)
+    return items
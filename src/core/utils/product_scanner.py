@@ -0,0 +1,69 @@
+import re
+
+from src.core.utils.jsonld_scanner import load_jsonld
+
+# Syntaxes whose data can be anywhere in the body; a page cut off after its
+# product JSON-LD would lose them.
+FULL_PAGE_SYNTAXES = frozenset({"microdata", "rdfa", "microformat", "dublincore"})
+
+PRODUCT_TYPES = frozenset({"Product", "ProductGroup"})
+
+_JSONLD_SCRIPT = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']?application/ld\+json[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def can_stop_early(syntaxes: list[str] | None) -> bool:
+    """Whether a page can be cut off once product JSON-LD was found."""
+    return syntaxes is not None and not FULL_PAGE_SYNTAXES.intersection(syntaxes)
+
+
+def _type_names(node: dict) -> list[str]:
+    types = node.get("@type", [])
+    if isinstance(types, str):
+        types = [types]
+    return [str(t).rsplit("/", 1)[-1].removeprefix("schema:") for t in types]
+
+
+def is_product_jsonld(data) -> bool:
+    """True if `data` (a parsed JSON-LD block) contains a named product."""
+    if isinstance(data, list):
+        return any(is_product_jsonld(item) for item in data)
+    if not isinstance(data, dict):
+        return False
+    if PRODUCT_TYPES.intersection(_type_names(data)) and data.get("name"):
+        return True
+    return is_product_jsonld(data.get("@graph"))
+
+
+class ProductScanner:
+    """
+    Incremental scanner for a complete product JSON-LD block in a page.
+
+    `feed` takes the decoded HTML chunk by chunk and returns True once a
+    closed `<script type="application/ld+json">` with a named Product has been
+    seen. Only the unscanned tail is searched again on every chunk.
+    """
+
+    def __init__(self):
+        self.found = False
+        self._buffer = ""
+        self._scanned = 0
+
+    def feed(self, chunk: str) -> bool:
+        if self.found:
+            return True
+        self._buffer += chunk
+        for match in _JSONLD_SCRIPT.finditer(self._buffer, self._scanned):
+            self._scanned = match.end()
+            if is_product_jsonld(load_jsonld(match[1])):
+                self.found = True
+                return True
+        # An unterminated script may still be completed by the next chunk.
+        start = self._buffer.lower().rfind("<script", self._scanned)
+        if start == -1:
+            start = max(self._scanned, len(self._buffer) - len("<script"))
+        self._buffer = self._buffer[start:]
+        self._scanned = 0
+        return False
@@ -0,0 +1,37 @@
+from src.core.utils.storage import DomainStore
+
+
+class RenderPolicy(DomainStore):
+    """
+    Per-domain memory of whether product data needs a rendered browser page.
+
+    Every product found is recorded with the tier that found it: plain HTTP or
+    the browser after escalation. Once a domain has enough samples and nearly
+    all of its products came from the browser, its URLs skip the HTTP attempt.
+    """
+
+    filename = "render_policy.json"
+
+    def __init__(
+        self,
+        file_path: str | None = None,
+        min_samples: int = 5,
+        render_ratio: float = 0.9,
+    ):
+        super().__init__(file_path)
+        self.min_samples = min_samples
+        self.render_ratio = render_ratio
+
+    def needs_render(self, domain: str) -> bool:
+        stats = self.domains.get(domain)
+        if not stats:
+            return False
+        total = stats["http"] + stats["rendered"]
+        return (
+            total >= self.min_samples and stats["rendered"] / total >= self.render_ratio
+        )
+
+    def record(self, domain: str, rendered: bool) -> None:
+        """Record which tier produced a valid product for `domain`."""
+        stats = self.domains.setdefault(domain, {"http": 0, "rendered": 0})
+        stats["rendered" if rendered else "http"] += 1
@@ -0,0 +1,213 @@
+import time
+from collections import Counter
+from dataclasses import dataclass
+from statistics import mean
+from urllib.parse import urlsplit
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+DENIED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com",
+    "doubleclick.net", "googlesyndication.com", "facebook.net", "facebook.com",
+    "connect.facebook.net", "hotjar.com", "clarity.ms", "bing.com",
+    "tiktok.com", "pinterest.com", "criteo.com", "criteo.net", "taboola.com",
+    "outbrain.com", "youtube.com", "vimeo.com", "newrelic.com", "nr-data.net",
+    "segment.io", "mixpanel.com", "cookiebot.com", "usercentrics.eu",
+)  # fmt: skip
+
+# File extensions of the resource types, for URL-pattern blocking.
+TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"),
+    "media": ("mp4", "webm", "mp3", "m4a", "ogg", "mov"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+}
+
+# Typical transfer sizes, used until real sizes have been observed.
+TYPICAL_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 80_000,
+    "document": 50_000,
+}
+
+
+def site_of(host: str) -> str:
+    """Registrable part of a host, e.g. `shop.example.co.uk` -> `example.co.uk`."""
+    labels = host.lower().rstrip(".").split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and len(labels[-2]) <= 3:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _host_matches(host: str, patterns: tuple[str, ...]) -> bool:
+    return any(host == p or host.endswith(f".{p}") for p in patterns)
+
+
+@dataclass(frozen=True)
+class BlockingProfile:
+    """
+    Which requests a rendered page may make.
+
+    `allow_hosts` always pass, `deny_hosts` are always blocked, and of the
+    remaining requests those of `block_types` (Playwright resource types) are
+    blocked, as are third-party iframes if `block_third_party_frames` is set.
+    The page's own document is never blocked.
+    """
+
+    block_types: frozenset[str] = BLOCKED_RESOURCE_TYPES
+    deny_hosts: tuple[str, ...] = DENIED_HOSTS
+    allow_hosts: tuple[str, ...] = ()
+    block_third_party_frames: bool = True
+
+    def should_block(
+        self, url: str, resource_type: str, page_url: str, is_subframe: bool
+    ) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        if _host_matches(host, self.allow_hosts):
+            return False
+        if _host_matches(host, self.deny_hosts):
+            return True
+        if resource_type in self.block_types:
+            return True
+        if is_subframe and self.block_third_party_frames:
+            page_host = urlsplit(page_url).hostname or ""
+            return site_of(host) != site_of(page_host)
+        return False
+
+    def url_patterns(self) -> list[str]:
+        """Approximation of the profile as Chromium blocked-URL patterns."""
+        patterns = []
+        for host in self.deny_hosts:
+            patterns += [f"*://{host}/*", f"*://*.{host}/*"]
+        for resource_type in sorted(self.block_types):
+            for ext in TYPE_EXTENSIONS.get(resource_type, ()):
+                patterns += [f"*.{ext}", f"*.{ext}?*"]
+        return patterns
+
+
+class ResourceBlocker:
+    """
+    crawl4ai hooks that apply a BlockingProfile to every rendered page.
+
+    Every `baseline_every`-th page is rendered without blocking to measure
+    resource sizes and page time; `report` uses them to estimate the bytes and
+    render time saved on the blocked pages.
+
+    Playwright request interception disables the browser's HTTP cache, so with
+    `routing=False` requests are blocked by URL pattern through the DevTools
+    protocol instead (see `BlockingProfile.url_patterns`). That keeps a
+    persistent browser cache working, at the cost of matching by file
+    extension, ignoring `allow_hosts` and not blocking third-party frames.
+    """
+
+    def __init__(
+        self,
+        profile: BlockingProfile | None = None,
+        baseline_every: int = 50,
+        routing: bool = True,
+    ):
+        self.profile = profile or BlockingProfile()
+        self.baseline_every = baseline_every
+        self.routing = routing
+        self.blocked = Counter()
+        self._pages = 0
+        self._baseline: dict[int, bool] = {}
+        self._started: dict[int, float] = {}
+        self._page_times: dict[bool, list[float]] = {True: [], False: []}
+        self._sizes: dict[str, list[int]] = {}
+
+    async def on_page_context_created(self, page, context=None, **kwargs):
+        if getattr(page, "_resource_blocker_routed", False):
+            return page
+        if self.routing:
+
+            async def handle(route):
+                await self._route(page, route)
+
+            await page.route("**/*", handle)
+        else:
+            cdp = await page.context.new_cdp_session(page)
+            await cdp.send("Network.enable")
+            page._resource_blocker_cdp = cdp
+            page.on("requestfailed", self._on_request_failed)
+        page.on("response", self._on_response)
+        page._resource_blocker_routed = True
+        return page
+
+    async def before_goto(self, page, context=None, url=None, **kwargs):
+        self._pages += 1
+        baseline = self._pages % self.baseline_every == 0
+        self._baseline[id(page)] = baseline
+        cdp = getattr(page, "_resource_blocker_cdp", None)
+        if cdp is not None:
+            urls = [] if baseline else self.profile.url_patterns()
+            await cdp.send("Network.setBlockedURLs", {"urls": urls})
+        self._started[id(page)] = time.monotonic()
+        return page
+
+    async def before_return_html(self, page, html=None, **kwargs):
+        started = self._started.pop(id(page), None)
+        if started is not None:
+            baseline = self._baseline.get(id(page), False)
+            self._page_times[baseline].append(time.monotonic() - started)
+        return page
+
+    async def _route(self, page, route) -> None:
+        request = route.request
+        is_main_document = (
+            request.frame == page.main_frame and request.is_navigation_request()
+        )
+        if (
+            not is_main_document
+            and not self._baseline.get(id(page), False)
+            and self.profile.should_block(
+                request.url,
+                request.resource_type,
+                page.url,
+                request.frame != page.main_frame,
+            )
+        ):
+            self.blocked[request.resource_type] += 1
+            await route.abort()
+            return
+        await route.continue_()
+
+    def _on_request_failed(self, request) -> None:
+        if "ERR_BLOCKED_BY_CLIENT" in (request.failure or ""):
+            self.blocked[request.resource_type] += 1
+
+    def _on_response(self, response) -> None:
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            sizes = self._sizes.setdefault(response.request.resource_type, [])
+            if len(sizes) < 1000:
+                sizes.append(int(length))
+
+    def bytes_saved(self) -> int:
+        return int(
+            sum(
+                count
+                * (
+                    mean(self._sizes[resource_type])
+                    if self._sizes.get(resource_type)
+                    else TYPICAL_BYTES.get(resource_type, 10_000)
+                )
+                for resource_type, count in self.blocked.items()
+            )
+        )
+
+    def time_saved(self) -> float:
+        baseline, blocked = self._page_times[True], self._page_times[False]
+        if not baseline or not blocked:
+            return 0.0
+        return max(0.0, mean(baseline) - mean(blocked)) * len(blocked)
+
+    def report(self) -> dict[str, float]:
+        return {
+            "blocked_requests": sum(self.blocked.values()),
+            "bytes_saved": self.bytes_saved(),
+            "seconds_saved": round(self.time_saved(), 1),
+            "baseline_pages": len(self._page_times[True]),
+        }
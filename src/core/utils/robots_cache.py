@@ -0,0 +1,118 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+
+from src.core.utils.http_client import create_session
+from src.core.utils.storage import SqliteStore, data_path
+
+
+def robots_host(url: str) -> str:
+    """`scheme://host` of a URL or bare domain, the key robots rules apply to."""
+    if "://" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class RobotsCache(SqliteStore):
+    """
+    robots.txt cache shared by seeding, crawling, worker processes and runs.
+
+    Raw robots.txt files are stored per host on disk and refetched after
+    `ttl_hours`; parsed rules are memoized in-process, so every host's file is
+    fetched and parsed at most once per TTL. Fetch errors allow crawling, like
+    crawl4ai's own robots check, but are not persisted.
+    """
+
+    schema = (
+        "CREATE TABLE IF NOT EXISTS robots ("
+        "host TEXT PRIMARY KEY, content TEXT NOT NULL, fetched_at REAL NOT NULL)",
+    )
+
+    def __init__(
+        self,
+        file_path: str | None = None,
+        ttl_hours: float = 24.0,
+        user_agent: str = "*",
+        timeout: float = 15.0,
+    ):
+        super().__init__(file_path or data_path("robots.sqlite3"), commit_every=1)
+        self.ttl = ttl_hours * 3600
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self._session: aiohttp.ClientSession | None = None
+        self._contents: dict[str, asyncio.Future] = {}
+        self._parsers: dict[str, RobotFileParser] = {}
+
+    async def __aenter__(self) -> "RobotsCache":
+        self._session = create_session(timeout=self.timeout, headers={})
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self.close()
+
+    async def robots_txt(self, url: str) -> str:
+        """Raw robots.txt of the host of `url` ("" if it has none)."""
+        host = robots_host(url)
+        if host not in self._contents:
+            self._contents[host] = asyncio.ensure_future(self._load(host))
+        return await self._contents[host]
+
+    async def _load(self, host: str) -> str:
+        row = self._conn.execute(
+            "SELECT content, fetched_at FROM robots WHERE host = ?", (host,)
+        ).fetchone()
+        if row is not None and time.time() - row[1] < self.ttl:
+            return row[0]
+
+        try:
+            async with self._session.get(f"{host}/robots.txt") as resp:
+                if resp.status >= 500:
+                    return ""
+                content = await resp.text() if resp.status == 200 else ""
+        except (aiohttp.ClientError, TimeoutError, UnicodeDecodeError):
+            return ""
+        self._write(
+            "INSERT OR REPLACE INTO robots VALUES (?, ?, ?)",
+            (host, content, time.time()),
+        )
+        return content
+
+    async def parser(self, url: str) -> RobotFileParser:
+        host = robots_host(url)
+        if host not in self._parsers:
+            parser = RobotFileParser()
+            parser.parse((await self.robots_txt(host)).splitlines())
+            self._parsers[host] = parser
+        return self._parsers[host]
+
+    async def allowed(self, url: str) -> bool:
+        return (await self.parser(url)).can_fetch(self.user_agent, url)
+
+    async def prefetch(self, urls) -> None:
+        """Load the rules of all hosts of `urls` concurrently."""
+        hosts = {robots_host(url) for url in urls}
+        await asyncio.gather(*(self.parser(host) for host in hosts))
+
+    async def filter(
+        self, entries_by_domain: dict[str, list[dict]]
+    ) -> dict[str, list[dict]]:
+        """Drop seeded entries that robots.txt disallows."""
+        await self.prefetch(
+            entry["url"] for entries in entries_by_domain.values() for entry in entries
+        )
+        filtered = {}
+        for domain, entries in entries_by_domain.items():
+            filtered[domain] = [e for e in entries if await self.allowed(e["url"])]
+            dropped = len(entries) - len(filtered[domain])
+            if dropped:
+                print(
+                    f"robots.txt disallows {dropped}/{len(entries)} URLs for {domain}"
+                )
+        return filtered
@@ -1,18 +1,17 @@
-import httpx
 import os
 import sys
 from dotenv import load_dotenv
 
+from src.core.utils.http_client import shared_session
+
+load_dotenv()
+
 
 async def send_items(items):
-    async with httpx.AsyncClient() as client:
-        load_dotenv()
-        api_url = os.getenv("AWS_API_URL")
-        if not api_url:
-            print("ERROR: AWS_API_URL environment variable is not set.")
-            sys.exit(1)
+    api_url = os.getenv("AWS_API_URL")
+    if not api_url:
+        print("ERROR: AWS_API_URL environment variable is not set.")
+        sys.exit(1)
 
-        response = await client.put(
-            api_url, json={"items": items}, headers={"Content-Type": "application/json"}
-        )
-        print(f"Response: {response}")
+    async with shared_session().put(api_url, json={"items": items}) as response:
+        print(f"Response: {response.status}")
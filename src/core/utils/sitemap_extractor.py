@@ -1,20 +1,159 @@
+import asyncio
+import gzip
+
+import aiohttp
 from crawl4ai import AsyncUrlSeeder, SeedingConfig
+from lxml import etree
 
+from src.core.utils.http_client import create_session
+from src.core.utils.robots_cache import RobotsCache, robots_host
 
-async def sitemap_extractor(domains: list[str]) -> dict[str, list[str]]:
-    """Seed URLs using sitemap + Common Crawl."""
-    async with AsyncUrlSeeder() as seeder:
-        config = SeedingConfig(source="sitemap+cc", concurrency=50, force=True)
-        results = await seeder.many_urls(domains, config)
-        print(
-            {domain: [item["url"] for item in urls] for domain, urls in results.items()}
+DEFAULT_SITEMAPS = ("/sitemap.xml", "/sitemap_index.xml")
+
+
+def _local_name(element) -> str:
+    return etree.QName(element).localname
+
+
+def _child_text(element, name: str) -> str | None:
+    for child in element:
+        if isinstance(child.tag, str) and _local_name(child) == name:
+            return (child.text or "").strip() or None
+    return None
+
+
+def _parse_priority(value: str | None) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def parse_sitemap(content: bytes) -> tuple[list[str], list[dict]]:
+    """
+    Parse a (possibly gzipped) sitemap or sitemap index.
+
+    Returns the child sitemap URLs of an index and the page entries of a
+    urlset, each entry keeping `lastmod`, `changefreq` and `priority`.
+    """
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    parser = etree.XMLParser(recover=True, huge_tree=True, resolve_entities=False)
+    root = etree.fromstring(content, parser)
+    if root is None:
+        return [], []
+
+    children, entries = [], []
+    for element in root:
+        if not isinstance(element.tag, str):
+            continue
+        loc = _child_text(element, "loc")
+        if not loc:
+            continue
+        if _local_name(element) == "sitemap":
+            children.append(loc)
+        elif _local_name(element) == "url":
+            entries.append(
+                {
+                    "url": loc,
+                    "lastmod": _child_text(element, "lastmod"),
+                    "changefreq": _child_text(element, "changefreq"),
+                    "priority": _parse_priority(_child_text(element, "priority")),
+                }
+            )
+    return children, entries
+
+
+async def _get(session: aiohttp.ClientSession, url: str) -> bytes | None:
+    try:
+        async with session.get(url) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.read()
+    except (aiohttp.ClientError, TimeoutError):
+        return None
+
+
+async def sitemap_entries(
+    session: aiohttp.ClientSession,
+    domain: str,
+    max_sitemaps: int = 500,
+    robots_cache: RobotsCache | None = None,
+) -> list[dict]:
+    """Collect all page entries from the sitemaps listed in robots.txt (or the defaults)."""
+    base = robots_host(domain)
+
+    if robots_cache is not None:
+        robots = await robots_cache.robots_txt(base)
+    else:
+        robots = (await _get(session, f"{base}/robots.txt") or b"").decode(
+            "utf-8", errors="ignore"
         )
-        return {
-            domain: [item["url"] for item in urls] for domain, urls in results.items()
-        }
+    queue = []
+    if robots:
+        for line in robots.splitlines():
+            key, _, value = line.partition(":")
+            if key.strip().lower() == "sitemap" and value.strip():
+                queue.append(value.strip())
+    if not queue:
+        queue = [base + path for path in DEFAULT_SITEMAPS]
 
+    seen, entries = set(), {}
+    while queue and len(seen) < max_sitemaps:
+        sitemap_url = queue.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        content = await _get(session, sitemap_url)
+        if not content:
+            continue
+        children, page_entries = parse_sitemap(content)
+        queue.extend(children)
+        for entry in page_entries:
+            entries.setdefault(entry["url"], entry)
+    return list(entries.values())
 
-if __name__ == "__main__":
-    import asyncio
 
+async def sitemap_extractor(
+    domains: list[str], robots_cache: RobotsCache | None = None
+) -> dict[str, list[dict]]:
+    """
+    Seed URLs using sitemap + Common Crawl.
+
+    Sitemap entries keep their `lastmod`, `changefreq` and `priority`; URLs only
+    known from Common Crawl get None for all three. With a `robots_cache`, the
+    sitemaps are discovered from the cached robots.txt files.
+    """
+    async with create_session(timeout=60, headers={}) as session:
+        from_sitemaps = await asyncio.gather(
+            *(
+                sitemap_entries(session, domain, robots_cache=robots_cache)
+                for domain in domains
+            )
+        )
+
+    async with AsyncUrlSeeder() as seeder:
+        config = SeedingConfig(source="cc", concurrency=50, force=True)
+        from_cc = await seeder.many_urls(domains, config)
+
+    results = {}
+    for domain, entries in zip(domains, from_sitemaps):
+        known = {entry["url"] for entry in entries}
+        for item in from_cc.get(domain, []):
+            if item["url"] not in known:
+                known.add(item["url"])
+                entries.append(
+                    {
+                        "url": item["url"],
+                        "lastmod": None,
+                        "changefreq": None,
+                        "priority": None,
+                    }
+                )
+        results[domain] = entries
+        print(f"Seeded {len(entries)} URLs for {domain}")
+    return results
+
+
+if __name__ == "__main__":
     asyncio.run(sitemap_extractor([""]))
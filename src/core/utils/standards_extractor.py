@@ -1,8 +1,18 @@
 import asyncio
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from urllib.parse import urlparse
+
 from langdetect import detect, LangDetectException
+from pydantic import BaseModel
+
+from src.core.model.item import Item
 from src.strategies.registry import EXTRACTORS
-import aiohttp
-from extruct import extract as extruct_extract
+from src.core.utils.http_client import shared_session
+from src.core.utils.http_fetcher import HttpFetcher
+from src.core.utils.product_scanner import can_stop_early
+from src.core.utils.structured_data import HtmlDocument, LazyStructuredData
 
 
 def is_valid_product(extracted) -> bool:
@@ -133,29 +143,92 @@ def merge_product_lists(list1: list[dict], list2: list[dict]) -> list[dict]:
     return merged
 
 
-async def extract_standard(
-    data: dict, url: str, preferred: list[str] | None = None
-) -> dict | list[dict] | None:
+# `Item` fields the extractors fill; the shop fields and url come from the crawl.
+REQUIRED_FIELDS = tuple(
+    name for name in Item.model_fields if name not in ("shopId", "shopName", "url")
+)
+# Nested fields that language detection fills after extraction, so they are
+# never a reason to run another extractor.
+DETECTED_FIELDS = frozenset({"language"})
+
+
+def _missing(name: str, value, annotation) -> set[str]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        value = value if isinstance(value, dict) else {}
+        return set().union(
+            *(
+                _missing(f"{name}.{key}", value.get(key), field.annotation)
+                for key, field in annotation.model_fields.items()
+                if key not in DETECTED_FIELDS
+            )
+        )
+    return {name} if not value or value == "UNKNOWN" else set()
+
+
+def missing_fields(product: dict | list[dict] | None) -> set[str]:
     """
-    Combines results from multiple extractors to create the most complete and deduplicated product data possible.
+    `REQUIRED_FIELDS` (or nested fields, like `price.currency`) that are still
+    empty or UNKNOWN in `product` (in any product of a list). Languages are
+    not required (see `DETECTED_FIELDS`).
     """
-    extractors = EXTRACTORS
-    if preferred:
-        extractors = sorted(
-            EXTRACTORS,
-            key=lambda e: preferred.index(e.name)
-            if e.name in preferred
-            else len(preferred),
+    if not product:
+        return set(REQUIRED_FIELDS)
+    if isinstance(product, list):
+        return set().union(*(missing_fields(item) for item in product))
+    missing = set().union(
+        *(
+            _missing(name, product.get(name), Item.model_fields[name].annotation)
+            for name in REQUIRED_FIELDS
         )
+    )
+    # A product URL is only a stand-in for the shop's item id.
+    if str(product.get("shopsItemId", "")).startswith("http"):
+        missing.add("shopsItemId")
+    return missing
 
-    combined_result = None
 
-    for extractor in extractors:
-        result = await extractor.extract(data, url)
-        print(f"Extractor '{extractor.name}' result: {result}")
-        if not is_valid_product(result):
-            continue
+class ExtractionStats:
+    """
+    Per-domain counts of how often `extract_standard` stopped early.
+
+    `skip_rate` is the share of a domain's pages on which extractors were
+    skipped because the product was already complete. Thread-safe, since
+    extraction runs in worker threads.
+    """
+
+    def __init__(self):
+        self.domains: dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def record(self, domain: str, skipped: list[str]) -> None:
+        with self._lock:
+            stats = self.domains.setdefault(domain, Counter())
+            stats["pages"] += 1
+            stats["early_exits"] += bool(skipped)
+            stats["skipped_extractors"] += len(skipped)
+
+    def merge(self, domains: dict[str, Counter]) -> None:
+        """Add the counts of another `ExtractionStats`, e.g. of a worker process."""
+        with self._lock:
+            for domain, stats in domains.items():
+                self.domains.setdefault(domain, Counter()).update(stats)
+
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return dict(sum(self.domains.values(), Counter()))
+
+    def report(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                domain: {**stats, "skip_rate": stats["early_exits"] / stats["pages"]}
+                for domain, stats in self.domains.items()
+            }
+
 
+def combine_results(results: list) -> dict | list[dict] | None:
+    """Merge extractor results; earlier results take precedence."""
+    combined_result = None
+    for result in results:
         if combined_result is None:
             combined_result = result
         else:
@@ -168,6 +241,67 @@ async def extract_standard(
                 combined_result = merge_product_lists(combined_result, [result])
             elif isinstance(combined_result, dict) and isinstance(result, list):
                 combined_result = merge_product_lists([combined_result], result)
+    return combined_result
+
+
+async def extract_standard(
+    data: Mapping,
+    url: str,
+    preferred: list[str] | None = None,
+    full: bool = False,
+    stats: ExtractionStats | None = None,
+    domain: str | None = None,
+) -> dict | list[dict] | None:
+    """
+    Combines results from multiple extractors to create the most complete and deduplicated product data possible.
+
+    Extractors run in order of their syntaxes' parse cost and stop once no
+    field is missing (see `missing_fields`), so with a `LazyStructuredData`
+    the expensive syntaxes are usually never parsed. `full` runs every
+    extractor regardless. Extractors whose syntaxes are not in `data` never
+    run. Results are merged in `preferred` order. Skipped
+    extractors are recorded in `stats` under `domain` (the URL's host by
+    default).
+    """
+    extractors = EXTRACTORS
+    if preferred:
+        extractors = sorted(
+            EXTRACTORS,
+            key=lambda e: preferred.index(e.name)
+            if e.name in preferred
+            else len(preferred),
+        )
+
+    results = {}
+    # Iterating does not extract anything, unlike `in` on a LazyStructuredData.
+    available = set(data)
+    pending = sorted(
+        (e for e in extractors if available.issuperset(e.syntaxes)),
+        key=lambda e: e.cost,
+    )
+    while pending:
+        if (
+            not full
+            and results
+            and not missing_fields(
+                combine_results(
+                    [results[e.name] for e in extractors if e.name in results]
+                )
+            )
+        ):
+            break
+        extractor = pending.pop(0)
+        result = await extractor.extract(data, url)
+        print(f"Extractor '{extractor.name}' result: {result}")
+        if is_valid_product(result):
+            results[extractor.name] = result
+
+    if stats is not None:
+        stats.record(domain or urlparse(url).netloc, [e.name for e in pending])
+
+    combined_result = combine_results(
+        [results[e.name] for e in extractors if e.name in results]
+    )
 
     # Fallback language detection
     if isinstance(combined_result, dict):
@@ -201,19 +335,23 @@ async def extract_standard(
     return combined_result
 
 
-async def single_url(url: str):
-    """Fetch a product page and test extraction with all registered extractors."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            html = await resp.text()
-            base_url = str(resp.url)
+async def single_url(url: str, syntaxes: list[str] | None = None):
+    """
+    Fetch a product page and test extraction with all registered extractors.
 
-    # Run extruct to collect all structured data syntaxes
-    data = extruct_extract(
-        html,
-        base_url=base_url,
-        syntaxes=["json-ld", "microdata", "rdfa", "opengraph", "microformat"],
-    )
+    If only head syntaxes are requested, the download stops once the product
+    JSON-LD has been read.
+    """
+    syntaxes = syntaxes or ["json-ld", "microdata", "rdfa", "opengraph", "microformat"]
+    async with HttpFetcher(
+        stop_early=can_stop_early(syntaxes), session=shared_session()
+    ) as fetcher:
+        page = await fetcher.fetch(url)
+    if page is None or page.html is None:
+        print(f"Failed to fetch {url}")
+        return
+    # Syntaxes are extracted as the extractors ask for them
+    data = LazyStructuredData(HtmlDocument(page.html, page.url), syntaxes)
 
     result = await extract_standard(
         data, url, preferred=["json-ld", "microdata", "rdfa", "opengraph"]
@@ -0,0 +1,154 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data"
+)
+
+
+# Tells a SqliteStore's writer thread to stop.
+_STOP = object()
+
+
+def data_path(filename: str) -> str:
+    """Absolute path of a file inside the repository's data/ directory."""
+    return os.path.normpath(os.path.join(DATA_DIR, filename))
+
+
+def load_json(file_path: str, default=None):
+    """Load a JSON file, returning `default` if it does not exist yet."""
+    if not os.path.exists(file_path):
+        return {} if default is None else default
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(file_path: str, data) -> None:
+    """Write JSON atomically so an interrupted run never leaves a truncated file."""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, file_path)
+
+
+class DomainStore:
+    """
+    Base class for small per-domain state persisted as one JSON object.
+
+    Worker processes `export` the state of the domains they crawled and the
+    coordinator `merge`s it, so parallel workers never overwrite each other.
+    """
+
+    filename = ""
+
+    def __init__(self, file_path: str | None = None):
+        self.file_path = file_path or data_path(self.filename)
+        self.domains: dict[str, dict] = load_json(self.file_path)
+
+    def export(self, domains: list[str]) -> dict[str, dict]:
+        return {d: self.domains[d] for d in domains if d in self.domains}
+
+    def merge(self, state: dict[str, dict]) -> None:
+        self.domains.update(state)
+
+    def save(self) -> None:
+        save_json(self.file_path, self.domains)
+
+
+class SqliteStore:
+    """
+    Base class for the crawler's SQLite-backed stores.
+
+    Subclasses pass their `CREATE TABLE` statements as `schema`. Writes go
+    through `_write`, which only queues them: a background thread with its
+    own connection executes them in transactions of up to `commit_every`
+    statements, committed at the latest `commit_interval` seconds after their
+    first write. The event loop therefore never waits for the write lock of a
+    file that the sharded runner's workers share, and a crash loses at most
+    `commit_interval` seconds of writes. Reads see queued writes once
+    `commit` (which waits for them) or `close` returns.
+    """
+
+    schema: tuple[str, ...] = ()
+
+    def __init__(
+        self, file_path: str, commit_every: int = 100, commit_interval: float = 1.0
+    ):
+        self.file_path = file_path
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._writes: queue.SimpleQueue | None = None
+        self._writer: threading.Thread | None = None
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        self._conn = self._connect()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in self.schema:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.file_path, timeout=60)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _write(self, sql: str, params: tuple = ()) -> None:
+        if self._writer is None:
+            self._writes = queue.SimpleQueue()
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+        self._writes.put((sql, params))
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        stopped = False
+        while not stopped:
+            batch, flushed = [], None
+            item = self._writes.get()
+            deadline = time.monotonic() + self.commit_interval
+            while True:
+                if item is _STOP:
+                    stopped = True
+                    break
+                if isinstance(item, threading.Event):
+                    flushed = item
+                    break
+                batch.append(item)
+                if len(batch) >= self.commit_every:
+                    break
+                try:
+                    item = self._writes.get(
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    with conn:
+                        for sql, params in batch:
+                            conn.execute(sql, params)
+                except sqlite3.Error as e:
+                    print(f"Failed to write {len(batch)} rows to {self.file_path}: {e}")
+            if flushed is not None:
+                flushed.set()
+        conn.close()
+
+    def commit(self) -> None:
+        """Commit direct writes and wait until every queued write is committed."""
+        self._conn.commit()
+        if self._writer is not None:
+            flushed = threading.Event()
+            self._writes.put(flushed)
+            flushed.wait()
+
+    def close(self) -> None:
+        self._conn.commit()
+        if self._writer is not None:
+            self._writes.put(_STOP)
+            self._writer.join()
+            self._writer = None
+        self._conn.close()
@@ -0,0 +1,199 @@
+import copy
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from functools import cached_property
+from urllib.parse import urljoin
+
+from extruct import extract as extruct_extract
+from extruct.microformat import MicroformatExtractor
+from extruct.utils import parse_html, parse_xmldom_html
+from lxml.html import HtmlElement
+from w3lib.url import safe_url_string
+
+from src.core.utils.jsonld_scanner import scan_jsonld
+
+SYNTAXES = ["json-ld", "microdata", "rdfa", "opengraph"]
+
+_HTML5_WHITESPACE = " \t\n\r\x0c"
+
+# Order in which extruct returns the syntaxes.
+_OUTPUT_ORDER = [
+    "microdata",
+    "json-ld",
+    "opengraph",
+    "microformat",
+    "rdfa",
+    "dublincore",
+]
+
+_RDFA_ELEMENTS = (
+    "//*[@property or @typeof or @about or @resource or @rel or @rev or @vocab"
+    " or @prefix or @datatype or @inlist]"
+)
+# Descendants whose URL can be the object of a hanging `rel`/`rev`.
+_RDFA_RESOURCES = ".//*[@href or @src]"
+# Attributes that give a `rel`/`rev` its object on the element itself.
+_RDFA_OBJECTS = ("href", "src", "resource", "typeof")
+
+
+@dataclass
+class HtmlDocument:
+    """
+    A page parsed at most once, shared by base-URL detection and every syntax.
+
+    The HTML is only parsed on first access of `tree` (or `base_url`), so
+    pages whose JSON-LD is enough are never parsed. RDFa needs extruct's
+    DOM-compatible element classes, so those are only used if `rdfa`.
+    """
+
+    html: str
+    url: str
+    rdfa: bool = True
+
+    @cached_property
+    def tree(self) -> HtmlElement:
+        parser = parse_xmldom_html if self.rdfa else parse_html
+        return parser(self.html, encoding="UTF-8")
+
+    @cached_property
+    def base_url(self) -> str:
+        return document_base_url(self.tree, self.url)
+
+
+def document_base_url(tree: HtmlElement, url: str) -> str:
+    """The first `<base href>` of `tree` resolved against `url`, like w3lib's."""
+    href = tree.xpath("string((//base[@href])[1]/@href)").strip(_HTML5_WHITESPACE)
+    if not href:
+        return safe_url_string(url)
+    return urljoin(safe_url_string(url), safe_url_string(href))
+
+
+def parse_document(html: str, url: str, rdfa: bool = True) -> HtmlDocument:
+    """Parse `html` with lxml right away, e.g. to keep it off the event loop."""
+    document = HtmlDocument(html, url, rdfa)
+    _ = document.base_url
+    return document
+
+
+def _has_hanging_rel(element: HtmlElement) -> bool:
+    attrib = element.attrib
+    return ("rel" in attrib or "rev" in attrib) and not any(
+        name in attrib for name in _RDFA_OBJECTS
+    )
+
+
+def prune_for_rdfa(tree: HtmlElement) -> None:
+    """
+    Remove the subtrees of `tree` that cannot produce RDFa triples.
+
+    pyRdfa walks every element, which makes RDFa by far the slowest syntax on
+    large pages. Only elements with RDFa attributes, their ancestors, the
+    content of `property` elements (whose text may be the value) and the
+    `href`/`src` elements that complete a hanging `rel`/`rev` are kept.
+    """
+    keep = {tree}
+
+    def keep_with_ancestors(element: HtmlElement) -> None:
+        keep.add(element)
+        for ancestor in element.iterancestors():
+            if ancestor in keep:
+                break
+            keep.add(ancestor)
+
+    # Elements inside kept `property` content, which is kept as a whole.
+    contents = set()
+    for element in tree.xpath(_RDFA_ELEMENTS):
+        if element in contents:
+            continue
+        keep_with_ancestors(element)
+        if "property" in element.attrib:
+            contents.update(element.iterdescendants())
+            keep.update(contents)
+        if _has_hanging_rel(element):
+            for resource in element.xpath(_RDFA_RESOURCES):
+                if resource not in keep:
+                    keep_with_ancestors(resource)
+    for element in list(tree.iter()):
+        parent = element.getparent()
+        if element not in keep and parent is not None and parent in keep:
+            parent.remove(element)
+
+
+def extract_syntaxes(document: HtmlDocument, syntaxes: list[str]) -> dict:
+    """
+    Run extruct's extractors for `syntaxes` over the parsed `document`.
+
+    JSON-LD is read by `scan_jsonld` without the tree. RDFa runs last, on a
+    pruned tree (see `prune_for_rdfa`), so the document cannot be extracted
+    again afterwards.
+    """
+    data = {}
+    tree_syntaxes = [s for s in syntaxes if s not in ("json-ld", "microformat", "rdfa")]
+    if tree_syntaxes:
+        data = extruct_extract(
+            document.tree, base_url=document.base_url, syntaxes=tree_syntaxes
+        )
+    if "json-ld" in syntaxes:
+        data["json-ld"] = scan_jsonld(document.html)
+    if "microformat" in syntaxes:
+        # mf2py only works on its own BeautifulSoup tree.
+        data["microformat"] = list(
+            MicroformatExtractor().extract_items(
+                document.html, base_url=document.base_url
+            )
+        )
+    if "rdfa" in syntaxes:
+        prune_for_rdfa(document.tree)
+        data.update(
+            extruct_extract(
+                document.tree, base_url=document.base_url, syntaxes=["rdfa"]
+            )
+        )
+    return {s: data[s] for s in _OUTPUT_ORDER if s in data}
+
+
+class LazyStructuredData(Mapping):
+    """
+    extruct output of a page that extracts each syntax on first access.
+
+    Behaves like the dict `parse_structured_data` returns, but syntaxes nobody
+    reads are never extracted. `parsed` holds the ones extracted so far.
+    """
+
+    def __init__(self, document: HtmlDocument, syntaxes: list[str] | None = None):
+        self.document = document
+        self.syntaxes = list(syntaxes or SYNTAXES)
+        self.parsed: dict[str, list] = {}
+
+    def __getitem__(self, syntax: str) -> list:
+        if syntax not in self.syntaxes:
+            raise KeyError(syntax)
+        if syntax not in self.parsed:
+            self.parsed[syntax] = self._extract(syntax)
+        return self.parsed[syntax]
+
+    def _extract(self, syntax: str) -> list:
+        document = self.document
+        if syntax == "rdfa" and any(
+            s not in self.parsed and s not in ("json-ld", "microformat", "rdfa")
+            for s in self.syntaxes
+        ):
+            # RDFa prunes the tree, which other syntaxes may still need.
+            document = copy.copy(document)
+            if "tree" in vars(self.document):
+                document.tree = copy.deepcopy(self.document.tree)
+        return extract_syntaxes(document, [syntax])[syntax]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.syntaxes)
+
+    def __len__(self) -> int:
+        return len(self.syntaxes)
+
+
+def parse_structured_data(
+    html: str, url: str, syntaxes: list[str] | None = None
+) -> dict:
+    """Run extruct over `html`, resolving relative URLs against the page's base URL."""
+    syntaxes = syntaxes or SYNTAXES
+    return extract_syntaxes(parse_document(html, url, "rdfa" in syntaxes), syntaxes)
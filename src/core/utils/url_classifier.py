@@ -0,0 +1,112 @@
+import re
+import zlib
+from urllib.parse import urlsplit
+
+from src.core.utils.storage import DomainStore
+
+NON_HTML_EXTENSIONS = {
+    "jpg", "jpeg", "png", "gif", "webp", "avif", "svg", "ico", "bmp", "tif",
+    "tiff", "pdf", "zip", "gz", "rar", "7z", "tar", "css", "js", "json", "xml",
+    "txt", "csv", "rss", "atom", "doc", "docx", "xls", "xlsx", "ppt", "pptx",
+    "mp3", "mp4", "m4a", "wav", "webm", "mov", "avi", "woff", "woff2", "ttf",
+    "eot", "otf",
+}  # fmt: skip
+
+_NUMERIC = re.compile(r"^\d+$")
+
+
+def url_extension(url: str) -> str:
+    last = urlsplit(url).path.rsplit("/", 1)[-1]
+    return last.rsplit(".", 1)[-1].lower() if "." in last else ""
+
+
+def url_pattern(url: str) -> str:
+    """
+    Generalise a URL path into a pattern shared by pages of the same kind.
+
+    Numeric segments become `{num}`, the last segment becomes `{slug}` (keeping
+    its extension) and the leading segments stay literal, so
+    `/shop/medal-set-1940s/` and `/shop/helmet/` both map to `/shop/{slug}`.
+    """
+    segments = [s for s in urlsplit(url).path.split("/") if s]
+    if not segments:
+        return "/"
+    pattern = []
+    for i, segment in enumerate(segments):
+        if _NUMERIC.match(segment):
+            pattern.append("{num}")
+        elif i == len(segments) - 1:
+            ext = url_extension(segment)
+            pattern.append(f"{{slug}}.{ext}" if ext else "{slug}")
+        else:
+            pattern.append(segment.lower())
+    return "/" + "/".join(pattern)
+
+
+class UrlClassifier(DomainStore):
+    """
+    Prefilter that drops seeded URLs which are unlikely to be product pages.
+
+    Non-HTML resources are always dropped. Per domain, the product yield of
+    every URL pattern is learned from earlier runs; patterns crawled at least
+    `min_samples` times with a yield below `min_yield` are skipped, except for
+    an `explore_rate` share of their URLs so a pattern can recover.
+    """
+
+    filename = "url_patterns.json"
+
+    def __init__(
+        self,
+        file_path: str | None = None,
+        min_samples: int = 20,
+        min_yield: float = 0.02,
+        explore_rate: float = 0.02,
+    ):
+        super().__init__(file_path)
+        self.min_samples = min_samples
+        self.min_yield = min_yield
+        self.explore_rate = explore_rate
+
+    def should_crawl(self, domain: str, url: str) -> bool:
+        if url_extension(url) in NON_HTML_EXTENSIONS:
+            return False
+        stats = self.domains.get(domain, {}).get(url_pattern(url))
+        if stats is None or stats["crawled"] < self.min_samples:
+            return True
+        if stats["products"] / stats["crawled"] >= self.min_yield:
+            return True
+        # Deterministic exploration so the same URLs are re-checked each run.
+        return zlib.crc32(url.encode("utf-8")) % 10000 < self.explore_rate * 10000
+
+    def prefilter(
+        self, entries_by_domain: dict[str, list[dict]]
+    ) -> dict[str, list[dict]]:
+        filtered = {}
+        for domain, entries in entries_by_domain.items():
+            filtered[domain] = [
+                e for e in entries if self.should_crawl(domain, e["url"])
+            ]
+            dropped = len(entries) - len(filtered[domain])
+            if dropped:
+                print(f"Prefilter dropped {dropped}/{len(entries)} URLs for {domain}")
+        return filtered
+
+    def record(self, domain: str, url: str, found_product: bool) -> None:
+        patterns = self.domains.setdefault(domain, {})
+        stats = patterns.setdefault(url_pattern(url), {"crawled": 0, "products": 0})
+        stats["crawled"] += 1
+        stats["products"] += int(found_product)
+
+    def report(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Product yield per URL pattern and domain, best patterns first."""
+        return {
+            domain: {
+                pattern: {**stats, "yield": stats["products"] / stats["crawled"]}
+                for pattern, stats in sorted(
+                    patterns.items(),
+                    key=lambda item: item[1]["products"] / item[1]["crawled"],
+                    reverse=True,
+                )
+            }
+            for domain, patterns in self.domains.items()
+        }
@@ -0,0 +1,21 @@
+from src.core.utils.crawl_history import DAY, parse_lastmod
+
+DEFAULT_SITEMAP_PRIORITY = 0.5
+
+
+def url_priority(entry: dict, known_product: bool, now: float) -> float:
+    """
+    Crawl priority of a seeded URL; higher values are crawled first.
+
+    Combines the sitemap `priority` (0.5 if missing), a bonus for URLs that
+    produced a product before and a bonus for recent changes that halves
+    with every week since the sitemap `lastmod`.
+    """
+    priority = entry.get("priority")
+    score = DEFAULT_SITEMAP_PRIORITY if priority is None else priority
+    if known_product:
+        score += 1.0
+    lastmod = parse_lastmod(entry.get("lastmod"))
+    if lastmod is not None:
+        score += 0.5 ** (max(0.0, now - lastmod) / (7 * DAY))
+    return score
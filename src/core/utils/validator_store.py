@@ -0,0 +1,61 @@
+import json
+
+from src.core.utils.storage import SqliteStore, data_path
+
+
+class ValidatorStore(SqliteStore):
+    """
+    Persistent per-URL store of HTTP validators and the last extracted product.
+
+    Re-crawls send the stored ETag / Last-Modified back as conditional headers;
+    a 304 answer lets the caller reuse `product` without parsing the page again.
+    """
+
+    schema = (
+        "CREATE TABLE IF NOT EXISTS validators ("
+        "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, product TEXT)",
+    )
+
+    def __init__(self, file_path: str | None = None, commit_every: int = 100):
+        super().__init__(file_path or data_path("validators.sqlite3"), commit_every)
+
+    def get(self, url: str) -> dict | None:
+        row = self._conn.execute(
+            "SELECT etag, last_modified, product FROM validators WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, product = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "product": json.loads(product),
+        }
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Request headers that let the server answer 304 for an unchanged page."""
+        entry = self.get(url)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        product: dict | list[dict],
+    ) -> None:
+        """Remember the validators of a page and the product extracted from it."""
+        if not etag and not last_modified:
+            return
+        self._write(
+            "INSERT OR REPLACE INTO validators VALUES (?, ?, ?, ?)",
+            (url, etag, last_modified, json.dumps(product, ensure_ascii=False)),
+        )
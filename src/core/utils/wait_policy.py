@@ -0,0 +1,134 @@
+import re
+
+from crawl4ai import CrawlerRunConfig
+
+from src.core.utils.storage import DomainStore
+
+# Polled by crawl4ai until it returns true. Returns as soon as product
+# structured data is in the DOM, otherwise once the page has loaded (if
+# `requireLoad`) and `graceMs` have passed, and in any case after `timeoutMs`:
+# crawl4ai fails the render when its own `wait_for_timeout` fires. Every poll
+# records the outcome on <html data-crawler-wait="found,present_at_start,waited_ms">.
+_WAIT_CONDITION = """() => {
+    const graceMs = %(grace_ms)d, requireLoad = %(require_load)s,
+        timeoutMs = %(timeout_ms)d;
+    const state = window.__crawlerWait || (window.__crawlerWait = {start: performance.now()});
+    const found = Array.from(
+        document.querySelectorAll('script[type="application/ld+json"]')
+    ).some(s => /"@type"\\s*:\\s*(\\[[^\\]]*)?"(schema:|https?:\\/\\/schema\\.org\\/)?Product"/.test(s.textContent))
+        || !!document.querySelector('[itemtype*="schema.org/Product"], [typeof*="Product"]');
+    const waited = performance.now() - state.start;
+    if (state.atStart === undefined) state.atStart = found;
+    document.documentElement.setAttribute(
+        'data-crawler-wait', [+found, +state.atStart, Math.round(waited)].join(',')
+    );
+    const loaded = !requireLoad || document.readyState === 'complete';
+    return found || (loaded && waited >= graceMs) || waited >= timeoutMs;
+}"""
+
+_WAIT_MARKER = re.compile(r'data-crawler-wait="(\d),(\d),(\d+)"')
+
+# How much longer crawl4ai's `wait_for_timeout` is than the condition's own
+# deadline, so the condition always gives up first.
+_TIMEOUT_MARGIN_MS = 10000
+
+
+def wait_condition(grace_ms: int, require_load: bool, timeout_ms: int) -> str:
+    """crawl4ai `wait_for` value that returns early once product data appears."""
+    return "js:" + _WAIT_CONDITION % {
+        "grace_ms": grace_ms,
+        "require_load": "true" if require_load else "false",
+        "timeout_ms": timeout_ms,
+    }
+
+
+def parse_wait_marker(html: str | None) -> tuple[bool, bool, int] | None:
+    """(found, present_at_start, waited_ms) recorded by the wait condition."""
+    match = _WAIT_MARKER.search(html or "")
+    if match is None:
+        return None
+    return bool(int(match[1])), bool(int(match[2])), int(match[3])
+
+
+class WaitPolicy(DomainStore):
+    """
+    Per-domain choice of how long a rendered page is waited for.
+
+    Pages are returned as soon as product structured data is in the DOM. The
+    fallback depends on what was observed for the domain: `domcontentloaded`
+    returns right away when the data has (nearly) always been present at that
+    point, `structured_data` waits for the load event plus a grace period
+    learned from how late the data appeared, and `load` waits only for the
+    load event when rendered pages never contained structured data. Pages
+    that never finish loading are returned as they are after `max_grace_ms`
+    plus the grace period instead of failing the render.
+    """
+
+    filename = "wait_policy.json"
+
+    def __init__(
+        self,
+        file_path: str | None = None,
+        min_samples: int = 10,
+        early_ratio: float = 0.95,
+        default_grace_ms: int = 5000,
+        max_grace_ms: int = 15000,
+    ):
+        super().__init__(file_path)
+        self.min_samples = min_samples
+        self.early_ratio = early_ratio
+        self.default_grace_ms = default_grace_ms
+        self.max_grace_ms = max_grace_ms
+
+    def strategy(self, domain: str) -> tuple[str, int]:
+        """(strategy name, grace period in ms) for the next render of `domain`."""
+        stats = self.domains.get(domain)
+        if not stats or stats["renders"] < self.min_samples:
+            return "structured_data", self.default_grace_ms
+        if stats["at_start"] / stats["renders"] >= self.early_ratio:
+            return "domcontentloaded", 0
+        if stats["found"] == 0:
+            return "load", 0
+        return "structured_data", min(
+            self.max_grace_ms, max(1000, int(1.5 * stats["max_wait_ms"]))
+        )
+
+    def run_config(self, domain: str, config: CrawlerRunConfig) -> CrawlerRunConfig:
+        strategy, grace_ms = self.strategy(domain)
+        timeout_ms = self.max_grace_ms + grace_ms
+        return config.clone(
+            wait_for=wait_condition(
+                grace_ms, strategy != "domcontentloaded", timeout_ms
+            ),
+            wait_for_timeout=timeout_ms + _TIMEOUT_MARGIN_MS,
+        )
+
+    def observe(self, domain: str, html: str | None) -> None:
+        """Record the wait outcome of a rendered page of `domain`."""
+        marker = parse_wait_marker(html)
+        if marker is None:
+            return
+        found, at_start, waited_ms = marker
+        stats = self.domains.setdefault(
+            domain,
+            {"renders": 0, "at_start": 0, "found": 0, "wait_ms": 0, "max_wait_ms": 0},
+        )
+        stats["renders"] += 1
+        stats["at_start"] += int(at_start)
+        stats["found"] += int(found)
+        if found:
+            stats["wait_ms"] += waited_ms
+            stats["max_wait_ms"] = max(stats["max_wait_ms"], waited_ms)
+
+    def report(self) -> dict[str, dict]:
+        """Chosen strategy and mean wait until structured data appeared, per domain."""
+        return {
+            domain: {
+                "strategy": self.strategy(domain)[0],
+                "renders": stats["renders"],
+                "mean_wait_ms": stats["wait_ms"] / stats["found"]
+                if stats["found"]
+                else None,
+            }
+            for domain, stats in self.domains.items()
+        }
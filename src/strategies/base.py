@@ -2,7 +2,17 @@ from typing import Optional
 
 
 class BaseExtractor:
+    """
+    Extraction strategy for one structured-data syntax.
+
+    `syntaxes` are the extruct syntaxes the strategy reads and `cost` their
+    relative parse cost; `extract_standard` runs cheap strategies first and
+    skips strategies whose syntaxes the data does not hold.
+    """
+
     name: str = "base"
+    syntaxes: tuple[str, ...] = ()
+    cost: int = 1
 
     async def extract(self, data: dict, url: str) -> Optional[dict]:
         """Extract structured product data from extruct output."""
@@ -5,6 +5,8 @@ from ..core.utils.availability_normalizer import map_availability_to_state
 
 class JsonLDExtractor(BaseExtractor):
     name = "json-ld"
+    syntaxes = ("json-ld",)
+    cost = 1
 
     async def extract(self, data: dict, url: str) -> Optional[dict]:
         products = []
@@ -6,6 +6,8 @@ from ..core.utils.availability_normalizer import map_availability_to_state
 
 class MicrodataExtractor(BaseExtractor):
     name = "microdata"
+    syntaxes = ("microdata",)
+    cost = 3
 
     async def extract(self, data: dict, url: str) -> Optional[dict]:
         def find_products(data):
@@ -5,6 +5,8 @@ from ..core.utils.availability_normalizer import map_availability_to_state
 
 class OpenGraphExtractor(BaseExtractor):
     name = "opengraph"
+    syntaxes = ("opengraph",)
+    cost = 1
 
     async def extract(self, data: dict, url: str) -> Optional[dict]:
         og_data = data.get("opengraph", {})
@@ -4,6 +4,8 @@ from ..core.utils.availability_normalizer import map_availability_to_state
 
 class RdfaExtractor(BaseExtractor):
     name = "rdfa"
+    syntaxes = ("rdfa",)
+    cost = 10
 
     async def extract(self, data: dict, url: str) -> dict | None:
         """
@@ -0,0 +1,39 @@
+from src.core.crawler import interleave_domains, stored_product
+from src.core.utils.fingerprint_cache import FingerprintCache
+from src.core.utils.validator_store import ValidatorStore
+
+
+def test_interleave_domains_round_robin():
+    """URLs of different shops are alternated instead of crawled shop by shop."""
+    urls = {"a.test": ["a1", "a2", "a3"], "b.test": ["b1"], "c.test": ["c1", "c2"]}
+    assert list(interleave_domains(urls)) == [
+        ("a.test", "a1"),
+        ("b.test", "b1"),
+        ("c.test", "c1"),
+        ("a.test", "a2"),
+        ("c.test", "c2"),
+        ("a.test", "a3"),
+    ]
+
+
+def test_interleave_domains_empty():
+    assert list(interleave_domains({})) == []
+
+
+def test_stored_product_prefers_fingerprint_cache(tmp_path):
+    fingerprint_cache = FingerprintCache(str(tmp_path / "fingerprints.sqlite3"))
+    validator_store = ValidatorStore(str(tmp_path / "validators.sqlite3"))
+    fingerprint_cache.store("https://a.test/1", "f", {"shopsItemId": "1"})
+    validator_store.put("https://a.test/1", '"e1"', None, {"shopsItemId": "old"})
+    validator_store.put("https://a.test/2", '"e2"', None, {"shopsItemId": "2"})
+    fingerprint_cache.commit()
+    validator_store.commit()
+
+    def stored(url):
+        return stored_product(url, fingerprint_cache, validator_store)
+
+    assert stored("https://a.test/1") == {"shopsItemId": "1"}
+    assert stored("https://a.test/2") == {"shopsItemId": "2"}
+    assert stored("https://a.test/3") is None
+    fingerprint_cache.close()
+    validator_store.close()
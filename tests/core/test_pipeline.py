@@ -0,0 +1,429 @@
+import asyncio
+from contextlib import aclosing
+from types import SimpleNamespace
+
+import pytest
+from crawl4ai import CrawlerRunConfig
+
+from src.core.pipeline import CrawlPipeline
+from src.core.utils.circuit_breaker import CircuitBreaker
+from src.core.utils.crawl_budget import CrawlBudget, DomainBudget
+from src.core.utils.fingerprint_cache import FingerprintCache
+from src.core.utils.frontier import Frontier
+from src.core.utils.http_fetcher import HttpPage
+from src.core.utils.render_policy import RenderPolicy
+from src.core.utils.validator_store import ValidatorStore
+from src.core.utils.wait_policy import WaitPolicy
+
+PRODUCT_HTML = """
+<html><head><script type="application/ld+json">
+{"@type": "Product", "name": "Test Product", "sku": "P1",
+ "offers": {"price": "9.99", "priceCurrency": "EUR"}}
+</script></head><body></body></html>
+"""
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    import src.core.pipeline as pipeline_module
+
+    monkeypatch.setattr(pipeline_module, "backoff_delay", lambda attempt, base: 0)
+
+
+class FakePool:
+    def __init__(self, pages: dict[str, str | None]):
+        self.pages = pages
+        self.fetched = []
+        self.configs = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch(self, url, config):
+        self.fetched.append(url)
+        self.configs.append(config)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+        finally:
+            self.in_flight -= 1
+        html = self.pages[url]
+        return SimpleNamespace(
+            success=html is not None,
+            url=url,
+            html=html,
+            error_message="boom",
+            status_code=200 if html is not None else None,
+            response_headers={"ETag": f'"{url}"'},
+        )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_yields_products_and_skips_failures():
+    pool = FakePool(
+        {
+            "http://a.test/1": PRODUCT_HTML,
+            "http://a.test/2": None,
+            "http://b.test/1": "<html></html>",
+        }
+    )
+    pipeline = CrawlPipeline(pool, None, fetch_workers=2, queue_size=1)
+    pending = [("a.test", url) for url in ("http://a.test/1", "http://a.test/2")]
+    pending.append(("b.test", "http://b.test/1"))
+
+    produced = [item async for item in pipeline.run(pending)]
+
+    assert len(produced) == 1
+    domain, product = produced[0]
+    assert domain == "a.test"
+    assert product["title"]["text"] == "Test Product"
+    assert product["price"]["amount"] == 999
+    assert pool.max_in_flight <= 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stops_cleanly_when_consumer_breaks():
+    pool = FakePool({f"http://a.test/{i}": PRODUCT_HTML for i in range(20)})
+    pipeline = CrawlPipeline(pool, None, fetch_workers=4, queue_size=2)
+    pending = [("a.test", url) for url in pool.pages]
+
+    async with aclosing(pipeline.run(pending)) as stream:
+        async for _ in stream:
+            break
+
+    assert pool.in_flight == 0
+
+
+class FakeHttpFetcher:
+    def __init__(self, pages: dict[str, str | None]):
+        self.pages = pages
+        self.requests = []
+
+    async def fetch(self, url, headers=None):
+        self.requests.append((url, headers))
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return HttpPage(url, 304)
+        html = self.pages.get(url)
+        return None if html is None else HttpPage(url, 200, html, '"v1"')
+
+
+@pytest.mark.asyncio
+async def test_pipeline_escalates_to_browser_only_without_http_product(tmp_path):
+    pool = FakePool(
+        {"http://a.test/js": PRODUCT_HTML, "http://a.test/missing": PRODUCT_HTML}
+    )
+    http = FakeHttpFetcher(
+        {"http://a.test/static": PRODUCT_HTML, "http://a.test/js": "<html></html>"}
+    )
+    policy = RenderPolicy(str(tmp_path / "render_policy.json"))
+    pipeline = CrawlPipeline(pool, None, http_fetcher=http, render_policy=policy)
+    pending = [
+        ("a.test", "http://a.test/static"),
+        ("a.test", "http://a.test/js"),
+        ("a.test", "http://a.test/missing"),
+    ]
+
+    produced = [item async for item in pipeline.run(pending)]
+
+    assert len(produced) == 3
+    assert sorted(pool.fetched) == ["http://a.test/js", "http://a.test/missing"]
+    assert policy.domains["a.test"] == {"http": 1, "rendered": 2}
+
+
+class StatusHttpFetcher(FakeHttpFetcher):
+    async def fetch(self, url, headers=None):
+        return HttpPage(url, int(url.rsplit("/", 1)[1]))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_renders_only_pages_that_are_not_gone():
+    urls = [f"http://a.test/{status}" for status in (404, 410, 503)]
+    pool = FakePool({url: PRODUCT_HTML for url in urls})
+    pipeline = CrawlPipeline(pool, None, http_fetcher=StatusHttpFetcher({}))
+
+    produced = [item async for item in pipeline.run([("a.test", u) for u in urls])]
+
+    assert len(produced) == 1
+    assert pool.fetched == ["http://a.test/503"]
+    assert pipeline.stats["no_product"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_http_for_render_only_domains(tmp_path):
+    pool = FakePool({"http://a.test/1": PRODUCT_HTML})
+    http = FakeHttpFetcher({"http://a.test/1": PRODUCT_HTML})
+    policy = RenderPolicy(str(tmp_path / "render_policy.json"), min_samples=1)
+    policy.record("a.test", rendered=True)
+    pipeline = CrawlPipeline(pool, None, http_fetcher=http, render_policy=policy)
+
+    produced = [item async for item in pipeline.run([("a.test", "http://a.test/1")])]
+
+    assert len(produced) == 1
+    assert pool.fetched == ["http://a.test/1"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reuses_stored_product_on_not_modified(tmp_path):
+    pool = FakePool({})
+    http = FakeHttpFetcher({"http://a.test/1": PRODUCT_HTML})
+    store = ValidatorStore(str(tmp_path / "validators.sqlite3"))
+    pending = [("a.test", "http://a.test/1")]
+
+    first = CrawlPipeline(pool, None, http_fetcher=http, validator_store=store)
+    first_run = [item async for item in first.run(pending)]
+    second = CrawlPipeline(pool, None, http_fetcher=http, validator_store=store)
+    second_run = [item async for item in second.run(pending)]
+
+    assert first_run == second_run
+    assert first.stats["http"] == 1
+    assert second.stats == {"not_modified": 1}
+    assert http.requests[-1] == ("http://a.test/1", {"If-None-Match": '"v1"'})
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_extractors_for_unchanged_structured_data(
+    tmp_path, monkeypatch
+):
+    import src.core.utils.extraction_pool as extraction_module
+
+    calls = []
+    original = extraction_module.extract_standard
+
+    async def counting_extract_standard(data, url, **kwargs):
+        calls.append(url)
+        return await original(data, url, **kwargs)
+
+    monkeypatch.setattr(
+        extraction_module, "extract_standard", counting_extract_standard
+    )
+    http = FakeHttpFetcher({"http://a.test/1": PRODUCT_HTML})
+    cache = FingerprintCache(str(tmp_path / "fingerprints.sqlite3"))
+    pending = [("a.test", "http://a.test/1")]
+
+    for _ in range(2):
+        pipeline = CrawlPipeline(
+            FakePool({}), None, http_fetcher=http, fingerprint_cache=cache
+        )
+        produced = [item async for item in pipeline.run(pending)]
+        assert produced[0][1]["title"]["text"] == "Test Product"
+
+    assert calls == ["http://a.test/1"]
+    assert cache.counters()["hits"] == 1
+    cache.close()
+
+
+class TruncatingHttpFetcher(FakeHttpFetcher):
+    async def fetch(self, url, headers=None):
+        page = await super().fetch(url, headers)
+        page.truncated = True
+        return page
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reads_only_head_syntaxes_of_truncated_pages(tmp_path):
+    http = TruncatingHttpFetcher({"http://a.test/1": PRODUCT_HTML})
+    cache = FingerprintCache(str(tmp_path / "fingerprints.sqlite3"))
+    pipeline = CrawlPipeline(
+        FakePool({}),
+        None,
+        http_fetcher=http,
+        fingerprint_cache=cache,
+        full_extraction=True,
+    )
+
+    produced = [item async for item in pipeline.run([("a.test", "http://a.test/1")])]
+
+    assert len(produced) == 1
+    assert set(cache.syntaxes("http://a.test/1")) == {"json-ld", "opengraph"}
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_checkpoints_every_url_in_frontier(tmp_path):
+    pool = FakePool({"http://a.test/1": PRODUCT_HTML, "http://a.test/2": None})
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls({"a.test": list(pool.pages)})
+    pipeline = CrawlPipeline(pool, None, frontier=frontier)
+
+    produced = [
+        item async for item in pipeline.run([("a.test", u) for u in pool.pages])
+    ]
+
+    assert frontier.counts() == {"done": 1, "failed": 1}
+    assert frontier.results() == {"a.test": [produced[0][1]]}
+    assert frontier.remaining() == {}
+    frontier.close()
+
+
+class FakeRobotsCache:
+    async def allowed(self, url):
+        return not url.endswith("/cart")
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_urls_disallowed_by_robots(tmp_path):
+    pool = FakePool({"http://a.test/1": PRODUCT_HTML, "http://a.test/cart": None})
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls({"a.test": list(pool.pages)})
+    pipeline = CrawlPipeline(
+        pool, None, frontier=frontier, robots_cache=FakeRobotsCache()
+    )
+
+    produced = [
+        item async for item in pipeline.run([("a.test", u) for u in pool.pages])
+    ]
+
+    assert len(produced) == 1
+    assert pool.fetched == ["http://a.test/1"]
+    assert pipeline.stats["disallowed"] == 1
+    assert frontier.counts() == {"done": 1, "skipped": 1}
+    frontier.close()
+
+
+class BrokenRobotsCache:
+    async def allowed(self, url):
+        if url.endswith("/2"):
+            raise RuntimeError("database is locked")
+        return True
+
+
+@pytest.mark.asyncio
+async def test_pipeline_finishes_when_feeding_a_url_fails():
+    pages = {"http://a.test/1": PRODUCT_HTML, "http://a.test/2": PRODUCT_HTML}
+    pipeline = CrawlPipeline(FakePool(pages), None, robots_cache=BrokenRobotsCache())
+
+    def pending():
+        yield from (("a.test", url) for url in pages)
+        raise RuntimeError("sitemap gone")
+
+    async def collect():
+        return [item async for item in pipeline.run(pending())]
+
+    assert len(await asyncio.wait_for(collect(), 5)) == 1
+    assert pipeline.stats["failed"] == 1
+
+
+class FlakyPool(FakePool):
+    def __init__(self, pages, failures: int):
+        super().__init__(pages)
+        self.failures = failures
+
+    async def fetch(self, url, config):
+        result = await super().fetch(url, config)
+        if self.failures:
+            self.failures -= 1
+            result.success = False
+        return result
+
+
+@pytest.mark.asyncio
+async def test_pipeline_retries_failed_fetches(tmp_path):
+    pool = FlakyPool({"http://a.test/1": PRODUCT_HTML}, failures=2)
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls({"a.test": list(pool.pages)})
+    pipeline = CrawlPipeline(pool, None, frontier=frontier, max_attempts=3)
+
+    produced = [item async for item in pipeline.run([("a.test", "http://a.test/1")])]
+
+    assert len(produced) == 1
+    assert pool.fetched == ["http://a.test/1"] * 3
+    assert pipeline.stats["retried"] == 2
+    assert frontier.attempts("http://a.test/1") == 2
+    frontier.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_does_not_charge_budget_for_retries(tmp_path):
+    pool = FlakyPool({"http://a.test/1": PRODUCT_HTML}, failures=1)
+    budget = CrawlBudget(DomainBudget(max_pages=1))
+    pipeline = CrawlPipeline(
+        pool, None, crawl_budget=budget, max_attempts=2, retry_base_delay=0
+    )
+
+    produced = [item async for item in pipeline.run([("a.test", "http://a.test/1")])]
+
+    assert len(produced) == 1
+    assert pool.fetched == ["http://a.test/1"] * 2
+    assert budget.usage("a.test")["pages"] == 1
+
+
+class RaisingPool(FakePool):
+    async def fetch(self, url, config):
+        self.fetched.append(url)
+        raise RuntimeError("browser gone")
+
+
+@pytest.mark.asyncio
+async def test_pipeline_finishes_tasks_when_a_stage_raises(monkeypatch):
+    pool = RaisingPool({"http://a.test/1": PRODUCT_HTML})
+    pipeline = CrawlPipeline(pool, None, max_attempts=2)
+
+    async def collect():
+        return [item async for item in pipeline.run([("a.test", "http://a.test/1")])]
+
+    assert await asyncio.wait_for(collect(), 5) == []
+    assert pool.fetched == ["http://a.test/1"] * 2
+    assert pipeline.stats["failed"] == 1
+
+    async def broken_extract(*args, **kwargs):
+        raise RuntimeError("extraction failed")
+
+    pipeline = CrawlPipeline(FakePool({"http://a.test/1": PRODUCT_HTML}), None)
+    monkeypatch.setattr(pipeline.extraction_pool, "extract", broken_extract)
+    assert await asyncio.wait_for(collect(), 5) == []
+    assert pipeline.stats["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_defers_domains_with_open_circuit(tmp_path):
+    pages = {f"http://dead.test/{i}": None for i in range(5)}
+    pool = FakePool(pages)
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls({"dead.test": list(pages)})
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=0, max_trips=0)
+    pipeline = CrawlPipeline(
+        pool, None, frontier=frontier, circuit_breaker=breaker, fetch_workers=1
+    )
+
+    produced = [item async for item in pipeline.run([("dead.test", u) for u in pages])]
+
+    assert produced == []
+    assert len(pool.fetched) == 2
+    assert pipeline.stats["deferred"] == 5
+    assert sum(len(urls) for urls in frontier.retries().values()) == 5
+    frontier.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stops_domains_over_budget(tmp_path):
+    pages = {f"http://a.test/{i}": PRODUCT_HTML for i in range(5)}
+    pages["http://b.test/1"] = PRODUCT_HTML
+    pool = FakePool(pages)
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls({"a.test": list(pages)[:5], "b.test": ["http://b.test/1"]})
+    budget = CrawlBudget(DomainBudget(max_pages=2))
+    pipeline = CrawlPipeline(pool, None, frontier=frontier, crawl_budget=budget)
+
+    pending = [(url.split("/")[2], url) for url in pages]
+    produced = [item async for item in pipeline.run(pending)]
+
+    assert [domain for domain, _ in produced].count("a.test") == 2
+    assert pool.fetched[:2] == ["http://a.test/0", "http://a.test/1"]
+    assert "http://b.test/1" in pool.fetched
+    assert frontier.counts() == {"done": 3, "skipped": 3}
+    frontier.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_renders_with_per_domain_wait_policy(tmp_path):
+    html = PRODUCT_HTML.replace("<html>", '<html data-crawler-wait="1,1,40">')
+    pool = FakePool({"http://a.test/1": html})
+    policy = WaitPolicy(str(tmp_path / "wait_policy.json"))
+    pipeline = CrawlPipeline(pool, CrawlerRunConfig(), wait_policy=policy)
+
+    produced = [item async for item in pipeline.run([("a.test", "http://a.test/1")])]
+
+    assert len(produced) == 1
+    assert pool.configs[0].wait_for.startswith("js:")
+    assert policy.domains["a.test"]["at_start"] == 1
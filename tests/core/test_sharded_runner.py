@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core import sharded_runner
+from src.core.sharded_runner import shard_domains
+from src.core.utils import storage
+from src.core.utils.frontier import DONE, Frontier
+from src.core.utils.host_scheduler import HostScheduler
+from src.core.utils.render_policy import RenderPolicy
+from src.core.utils.wait_policy import WaitPolicy
+
+
+def test_shard_domains_balances_url_counts():
+    urls = {
+        "big.test": ["u"] * 10,
+        "mid.test": ["u"] * 6,
+        "small1.test": ["u"] * 3,
+        "small2.test": ["u"] * 2,
+        "small3.test": ["u"] * 1,
+    }
+    shards = shard_domains(urls, 2)
+    loads = sorted(sum(len(urls[d]) for d in shard) for shard in shards)
+    assert loads == [11, 11]
+    assert sorted(d for shard in shards for d in shard) == sorted(urls)
+
+
+def test_shard_domains_never_returns_empty_shards():
+    assert shard_domains({"a.test": ["u"]}, 8) == [["a.test"]]
+    assert shard_domains({}, 4) == []
+
+
+@pytest.mark.asyncio
+async def test_crawl_sharded_merges_the_state_of_every_shard(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DATA_DIR", str(tmp_path))
+    domains = ["a.test", "b.test", "c.test"]
+    finalized = []
+
+    async def seed_frontier(domains, *args):
+        frontier = Frontier()
+        frontier.add_urls({d: [f"https://{d}/1", f"https://{d}/2"] for d in domains})
+        frontier.close()
+
+    async def crawl_frontier(
+        domains, render_policy, host_scheduler, wait_policy, on_progress, **options
+    ):
+        frontier = Frontier()
+        for domain, urls in frontier.remaining(domains).items():
+            render_policy.record(domain, rendered=True)
+            host_scheduler.domains[domain] = {"concurrency": 2}
+            wait_policy.domains[domain] = {"pages": len(urls)}
+            for url in urls:
+                frontier.mark(url, DONE, {"shopsItemId": url})
+        frontier.close()
+        on_progress({"done": len(domains)})
+        return {"done": len(domains)}
+
+    monkeypatch.setattr(sharded_runner, "seed_frontier", seed_frontier)
+    monkeypatch.setattr(sharded_runner, "crawl_frontier", crawl_frontier)
+    monkeypatch.setattr(sharded_runner, "finalize_crawl", finalized.append)
+    # Shards run in threads, which see the patched functions and data dir.
+    monkeypatch.setattr(
+        sharded_runner,
+        "ProcessPoolExecutor",
+        lambda max_workers, mp_context: ThreadPoolExecutor(max_workers),
+    )
+
+    await sharded_runner.crawl_sharded(domains, processes=2, progress_interval=0.01)
+
+    assert RenderPolicy().domains == {d: {"http": 0, "rendered": 1} for d in domains}
+    assert HostScheduler().domains == {d: {"concurrency": 2} for d in domains}
+    assert WaitPolicy().domains == {d: {"pages": 2} for d in domains}
+    frontier = Frontier()
+    assert frontier.counts() == {"done": 6}
+    frontier.close()
+    assert finalized == [domains]
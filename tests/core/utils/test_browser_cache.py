@@ -0,0 +1,41 @@
+import os
+
+from crawl4ai import BrowserConfig
+
+from src.core.utils.browser_cache import BrowserCache
+
+
+def fill(cache, key, size, last_used):
+    path = cache.profile_dir(key)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "data"), "wb") as f:
+        f.write(b"x" * size)
+    marker = os.path.join(path, ".last_used")
+    open(marker, "w").close()
+    os.utime(marker, (last_used, last_used))
+    return path
+
+
+def test_browser_config_uses_persistent_profile(tmp_path):
+    cache = BrowserCache(str(tmp_path), per_domain=True, max_profile_mb=64)
+    config = cache.browser_config(
+        BrowserConfig(extra_args=["--foo"]), cache.key("shop.test")
+    )
+
+    assert config.use_persistent_context
+    assert config.user_data_dir == str(tmp_path / "shop.test")
+    assert config.extra_args == ["--foo", f"--disk-cache-size={64 * 2**20}"]
+    assert os.path.exists(tmp_path / "shop.test" / ".last_used")
+    assert BrowserCache(str(tmp_path)).key("shop.test") == "shared"
+
+
+def test_evict_removes_least_recently_used_profiles(tmp_path):
+    cache = BrowserCache(str(tmp_path), max_total_mb=2)
+    fill(cache, "old", 600_000, 100)
+    locked = fill(cache, "locked", 600_000, 50)
+    os.symlink("host-123", os.path.join(locked, "SingletonLock"))
+    fill(cache, "kept", 600_000, 10)
+    fill(cache, "new", 300_000, 200)
+
+    assert cache.evict(keep=("kept",)) == ["old"]
+    assert sorted(cache.usage()) == ["kept", "locked", "new"]
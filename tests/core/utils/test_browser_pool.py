@@ -0,0 +1,114 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from crawl4ai import CrawlerRunConfig
+
+from src.core.utils.browser_pool import BrowserPool, install_hooks, is_browser_crash
+
+
+class FakeStrategy:
+    def __init__(self):
+        self.hooks = {}
+
+    def set_hook(self, hook_type, hook):
+        self.hooks[hook_type] = hook
+
+
+class Recorder:
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    async def before_goto(self, page, **kwargs):
+        self.calls.append((self.name, kwargs["url"]))
+        return page
+
+
+@pytest.mark.asyncio
+async def test_install_hooks_chains_extensions():
+    crawler = SimpleNamespace(crawler_strategy=FakeStrategy())
+    calls = []
+    install_hooks(crawler, [Recorder("a", calls), object(), Recorder("b", calls)])
+
+    assert set(crawler.crawler_strategy.hooks) == {"before_goto"}
+    page = object()
+    result = await crawler.crawler_strategy.hooks["before_goto"](page, url="u")
+    assert result is page
+    assert calls == [("a", "u"), ("b", "u")]
+
+
+class FakeCrawler:
+    def __init__(self, crash_on=()):
+        self.crawler_strategy = FakeStrategy()
+        self.crash_on = set(crash_on)
+        self.closed = False
+        self.urls = []
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    async def arun(self, url, config):
+        await asyncio.sleep(0)
+        self.urls.append(url)
+        if self.closed or url in self.crash_on:
+            return SimpleNamespace(
+                success=False,
+                html="",
+                error_message="Page.goto: Target page, context or browser has been closed",
+            )
+        return SimpleNamespace(success=True, html=f"<p>{url}</p>", error_message="")
+
+
+class FakeBrowserPool(BrowserPool):
+    def __init__(self, crash_on=(), **kwargs):
+        super().__init__(max_rss_mb=None, **kwargs)
+        self.crash_on = crash_on
+        self.crawlers = []
+
+    def _new_crawler(self):
+        # Only the first browser crashes.
+        self.crawlers.append(FakeCrawler(self.crash_on if not self.crawlers else ()))
+        return self.crawlers[-1]
+
+
+@pytest.mark.asyncio
+async def test_browser_is_recycled_after_max_pages():
+    async with FakeBrowserPool(max_sessions=2, max_pages=3) as pool:
+        results = await asyncio.gather(
+            *(pool.fetch(f"u{i}", CrawlerRunConfig()) for i in range(7))
+        )
+
+    assert all(result.success for result in results)
+    assert pool.metrics() == {
+        "browser_pages": 7,
+        "browser_recycles": 2,
+        "browser_restarts": 0,
+    }
+    # Pages already in flight when the limit is hit still finish on the old browser.
+    assert sum(len(crawler.urls) for crawler in pool.crawlers) == 7
+    assert all(len(crawler.urls) >= 3 for crawler in pool.crawlers[:2])
+    assert all(crawler.closed for crawler in pool.crawlers)
+
+
+@pytest.mark.asyncio
+async def test_crashed_browser_is_restarted_and_fetch_retried():
+    async with FakeBrowserPool(crash_on={"u1"}, max_sessions=4) as pool:
+        results = await asyncio.gather(
+            *(pool.fetch(f"u{i}", CrawlerRunConfig()) for i in range(4))
+        )
+
+    assert all(result.success for result in results)
+    assert pool.restarts == 1
+    assert len(pool.crawlers) == 2
+    assert "u1" in pool.crawlers[1].urls
+
+
+def test_is_browser_crash():
+    assert is_browser_crash("Page.goto: Target crashed")
+    assert is_browser_crash("Browser has been closed")
+    assert not is_browser_crash("net::ERR_NAME_NOT_RESOLVED")
+    assert not is_browser_crash(None)
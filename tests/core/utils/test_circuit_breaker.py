@@ -0,0 +1,56 @@
+from src.core.utils.circuit_breaker import CircuitBreaker, backoff_delay
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    delays = [backoff_delay(attempt, base=1.0, cap=5.0) for attempt in range(1, 10)]
+    assert all(0 <= delay <= 5.0 for delay in delays)
+    assert all(backoff_delay(1, base=1.0) <= 1.0 for _ in range(100))
+
+
+def test_circuit_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=10)
+    for _ in range(2):
+        breaker.record("a.test", False, now=0)
+    breaker.record("a.test", True, now=0)
+    breaker.record("a.test", False, now=0)
+    assert breaker.state("a.test", now=0) == "closed"
+
+    breaker.record("a.test", False, now=0)
+    breaker.record("a.test", False, now=0)
+    assert breaker.state("a.test", now=1) == "open"
+    assert breaker.retry_after("a.test", now=1) == 9
+    assert breaker.retry_after("b.test", now=1) == 0
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=10)
+    breaker.record("a.test", False, now=0)
+    assert breaker.retry_after("a.test", now=10) == 0
+    assert breaker.retry_after("a.test", now=10) > 0
+
+    breaker.record("a.test", True, now=11)
+    assert breaker.state("a.test", now=11) == "closed"
+    assert breaker.retry_after("a.test", now=11) == 0
+
+
+def test_failed_probe_reopens_with_longer_cooldown_and_gives_up():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=10, max_trips=2)
+    breaker.record("a.test", False, now=0)
+    breaker.retry_after("a.test", now=10)
+    breaker.record("a.test", False, now=10)
+    assert breaker.retry_after("a.test", now=11) == 19
+
+    breaker.retry_after("a.test", now=30)
+    breaker.record("a.test", False, now=30)
+    assert breaker.state("a.test", now=100) == "given_up"
+    assert breaker.retry_after("a.test", now=100) is None
+
+
+def test_late_success_does_not_revive_a_given_up_domain():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=10, max_trips=0)
+    breaker.record("a.test", False, now=0)
+    assert breaker.state("a.test", now=1) == "given_up"
+
+    breaker.record("a.test", True, now=2)
+    assert breaker.state("a.test", now=3) == "given_up"
+    assert breaker.retry_after("a.test", now=3) is None
@@ -0,0 +1,59 @@
+import asyncio
+
+import psutil
+import pytest
+
+from src.core.utils.concurrency_controller import (
+    ConcurrencyController,
+    process_tree_rss,
+)
+
+
+def test_process_tree_rss_includes_this_process():
+    assert process_tree_rss(psutil.Process()) > 0
+
+
+def test_memory_pressure_and_loop_lag_decrease_the_limit():
+    controller = ConcurrencyController(initial_limit=10, backoff=0.5)
+    assert controller.observe(memory=0.9, loop_lag=0.0, rss_mb=100) == "decrease"
+    assert controller.limit == 5
+    assert controller.observe(memory=0.5, loop_lag=2.0, rss_mb=100) == "decrease"
+    assert controller.limit == 2
+    assert controller.decisions[-1]["reason"] == "loop_lag"
+    assert controller.metrics()["concurrency_decreases"] == 2
+
+
+def test_limit_grows_only_when_saturated_with_memory_headroom():
+    controller = ConcurrencyController(initial_limit=2, max_limit=3)
+    assert controller.observe(memory=0.5, loop_lag=0.0, rss_mb=100) == "hold"
+    controller.in_flight = 2
+    assert controller.observe(memory=0.5, loop_lag=0.0, rss_mb=100) == "increase"
+    controller.in_flight = 3
+    assert controller.observe(memory=0.8, loop_lag=0.0, rss_mb=100) == "hold"
+    assert controller.observe(memory=0.5, loop_lag=0.0, rss_mb=100) == "hold"
+    assert controller.limit == 3
+
+
+def test_rising_latency_decreases_the_limit():
+    controller = ConcurrencyController(initial_limit=10)
+    controller._record_latency(1.0)
+    for _ in range(20):
+        controller._record_latency(10.0)
+    assert controller.observe(memory=0.5, loop_lag=0.0, rss_mb=100) == "decrease"
+    assert controller.decisions[-1]["reason"] == "latency"
+
+
+@pytest.mark.asyncio
+async def test_slots_respect_the_limit():
+    controller = ConcurrencyController(initial_limit=2)
+    seen = []
+
+    async def page():
+        async with controller.slot():
+            seen.append(controller.in_flight)
+            await asyncio.sleep(0.01)
+
+    async with controller:
+        await asyncio.gather(*(page() for _ in range(6)))
+    assert max(seen) == 2
+    assert controller.in_flight == 0
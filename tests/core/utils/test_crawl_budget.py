@@ -0,0 +1,24 @@
+from src.core.utils.crawl_budget import CrawlBudget, DomainBudget
+
+
+def test_page_budget_per_domain():
+    budget = CrawlBudget(DomainBudget(max_pages=2), {"big.test": DomainBudget()})
+    assert [budget.admit("a.test") for _ in range(3)] == [True, True, False]
+    assert all(budget.admit("big.test") for _ in range(10))
+    assert budget.usage("a.test")["pages"] == 2
+
+
+def test_wall_time_budget_starts_with_first_page():
+    budget = CrawlBudget(DomainBudget(max_seconds=60))
+    assert budget.admit("a.test", now=100)
+    assert budget.admit("a.test", now=159)
+    assert not budget.admit("a.test", now=160)
+    assert budget.admit("b.test", now=160)
+
+
+def test_byte_budget():
+    budget = CrawlBudget(DomainBudget(max_bytes=1000))
+    assert budget.admit("a.test")
+    budget.spend_bytes("a.test", 1200)
+    assert not budget.admit("a.test")
+    assert budget.usage("a.test")["bytes"] == 1200
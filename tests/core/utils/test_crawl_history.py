@@ -0,0 +1,53 @@
+from src.core.utils.crawl_history import DAY, CrawlHistory, is_due, parse_lastmod
+
+NOW = parse_lastmod("2025-10-10T00:00:00+00:00")
+
+
+def test_parse_lastmod_formats():
+    assert parse_lastmod("2025-10-01") == parse_lastmod("2025-10-01T00:00:00Z")
+    assert parse_lastmod("2025-10-01T02:00:00+02:00") == parse_lastmod("2025-10-01")
+    assert parse_lastmod("yesterday") is None
+    assert parse_lastmod(None) is None
+
+
+def test_new_urls_are_always_due():
+    assert is_due({"url": "u"}, None, NOW) is True
+
+
+def test_lastmod_newer_than_last_crawl_is_due():
+    last_crawled = NOW - 5 * DAY
+    assert is_due({"lastmod": "2025-10-08"}, last_crawled, NOW) is True
+    assert is_due({"lastmod": "2025-10-01"}, last_crawled, NOW) is False
+
+
+def test_changefreq_is_used_without_lastmod():
+    last_crawled = NOW - 2 * DAY
+    assert is_due({"changefreq": "daily"}, last_crawled, NOW) is True
+    assert is_due({"changefreq": "weekly"}, last_crawled, NOW) is False
+    assert is_due({}, last_crawled, NOW) is True
+
+
+def test_full_refresh_overrides_unchanged_lastmod():
+    last_crawled = NOW - 40 * DAY
+    entry = {"lastmod": "2025-01-01"}
+    assert is_due(entry, last_crawled, NOW) is False
+    assert is_due(entry, last_crawled, NOW, full_refresh_after=30 * DAY) is True
+
+
+def test_select_due_filters_unchanged_urls(tmp_path):
+    history = CrawlHistory(str(tmp_path / "history.sqlite3"))
+    history.record("https://shop.test/old", NOW - DAY)
+    history.record("https://shop.test/changed", NOW - 3 * DAY)
+    entries = {
+        "shop.test": [
+            {"url": "https://shop.test/old", "lastmod": "2025-10-01"},
+            {"url": "https://shop.test/changed", "lastmod": "2025-10-08"},
+            {"url": "https://shop.test/new", "lastmod": None},
+        ]
+    }
+    due = history.select_due(entries, full_refresh_days=30, now=NOW)
+    assert [e["url"] for e in due["shop.test"]] == [
+        "https://shop.test/changed",
+        "https://shop.test/new",
+    ]
+    history.close()
@@ -0,0 +1,49 @@
+import subprocess
+
+import psutil
+import pytest
+
+from src.core.utils.concurrency_controller import browser_processes
+from src.core.utils.extraction_pool import ExtractionPool, extract_page
+
+URL = "https://shop.test/p/vase"
+PAGE = """<html><head><script type="application/ld+json">{"@type": "Product",
+"name": "Vase", "sku": "V1", "offers": {"price": "12.00", "priceCurrency": "EUR"}}
+</script></head><body></body></html>"""
+
+
+def test_extract_page_reports_unchanged_structured_data():
+    extraction = extract_page(PAGE.encode(), URL, "shop.test")
+    assert extraction.product["shopsItemId"] == "V1"
+    assert "json-ld" in extraction.syntaxes
+    assert extraction.stats["shop.test"]["pages"] == 1
+
+    known = (extraction.syntaxes, extraction.fingerprint)
+    again = extract_page(PAGE + "<!-- ad -->", URL, "shop.test", known)
+    assert again.unchanged and again.product is None
+
+    changed = extract_page(PAGE.replace("12.00", "13.00"), URL, "shop.test", known)
+    assert not changed.unchanged
+    assert changed.product["price"]["amount"] == 1300
+
+
+@pytest.mark.asyncio
+async def test_pool_sends_large_pages_to_warm_workers():
+    async with ExtractionPool(processes=1, thread_max_chars=len(PAGE)) as pool:
+        large = await pool.extract(PAGE + " " * 10, URL, "shop.test")
+        small = await pool.extract(PAGE, URL, "shop.test")
+
+    assert large.product == small.product
+    assert pool.metrics() == {"extracted_in_threads": 1, "extracted_in_processes": 1}
+
+
+@pytest.mark.asyncio
+async def test_workers_do_not_count_as_browser_memory():
+    browser = subprocess.Popen(["sleep", "30"])
+    try:
+        async with ExtractionPool(processes=1):
+            pids = {proc.pid for proc in browser_processes(psutil.Process())}
+            assert pids == {browser.pid}
+    finally:
+        browser.kill()
+        browser.wait()
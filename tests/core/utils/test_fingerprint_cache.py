@@ -0,0 +1,37 @@
+from src.core.utils.fingerprint_cache import FingerprintCache, structured_fingerprint
+
+PRODUCT = {"title": {"text": "Test Product", "language": "en"}}
+
+
+def test_fingerprint_ignores_key_order():
+    a = {"json-ld": [{"@type": "Product", "name": "A"}], "microdata": []}
+    b = {"microdata": [], "json-ld": [{"name": "A", "@type": "Product"}]}
+    assert structured_fingerprint(a) == structured_fingerprint(b)
+
+
+def test_fingerprint_changes_with_payload():
+    a = {"json-ld": [{"@type": "Product", "name": "A"}]}
+    b = {"json-ld": [{"@type": "Product", "name": "B"}]}
+    assert structured_fingerprint(a) != structured_fingerprint(b)
+
+
+def test_lookup_hits_only_on_matching_fingerprint(tmp_path):
+    cache = FingerprintCache(str(tmp_path / "fingerprints.sqlite3"))
+    assert cache.lookup("http://a.test/1", "f1") is None
+    cache.store("http://a.test/1", "f1", PRODUCT)
+    cache.commit()
+    assert cache.lookup("http://a.test/1", "f1") == PRODUCT
+    assert cache.lookup("http://a.test/1", "f2") is None
+    assert cache.counters() == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+    cache.close()
+
+
+def test_store_remembers_extracted_syntaxes(tmp_path):
+    cache = FingerprintCache(str(tmp_path / "fingerprints.sqlite3"))
+    cache.store("http://a.test/1", "f1", PRODUCT, ["json-ld"])
+    cache.store("http://a.test/2", "f2", PRODUCT)
+    cache.commit()
+    assert cache.syntaxes("http://a.test/1") == ["json-ld"]
+    assert cache.syntaxes("http://a.test/2") is None
+    assert cache.syntaxes("http://a.test/3") is None
+    cache.close()
@@ -0,0 +1,143 @@
+import sqlite3
+import time
+
+from src.core.utils.frontier import (
+    DONE,
+    FAILED,
+    IN_FLIGHT,
+    RETRY,
+    UNCHANGED,
+    Frontier,
+)
+
+PRODUCT = {"title": {"text": "Test Product", "language": "en"}}
+
+
+def test_resume_skips_finished_urls(tmp_path):
+    file_path = str(tmp_path / "frontier.sqlite3")
+    frontier = Frontier(file_path)
+    frontier.add_urls({"a.test": ["a1", "a2", "a3"], "b.test": ["b1"]})
+    frontier.mark("a1", DONE, PRODUCT)
+    frontier.mark("a2", IN_FLIGHT)
+    frontier.mark("b1", FAILED)
+    frontier.close()
+
+    resumed = Frontier(file_path)
+    assert resumed.remaining() == {"a.test": ["a2", "a3"]}
+    assert resumed.results() == {"a.test": [PRODUCT]}
+    assert resumed.counts() == {"done": 1, "failed": 1, "in_flight": 1, "pending": 1}
+    resumed.close()
+
+
+def test_workers_can_share_one_frontier_file(tmp_path):
+    file_path = str(tmp_path / "frontier.sqlite3")
+    first, second = Frontier(file_path), Frontier(file_path)
+    first.add_urls({"a.test": ["a1"], "b.test": ["b1"]})
+
+    # Another worker holding the write lock does not block marking.
+    locker = sqlite3.connect(file_path)
+    locker.execute("BEGIN IMMEDIATE")
+    started = time.monotonic()
+    first.mark("a1", IN_FLIGHT)
+    second.mark("b1", DONE, PRODUCT)
+    first.mark("a1", DONE, PRODUCT)
+    assert time.monotonic() - started < 0.5
+    locker.rollback()
+    locker.close()
+
+    first.commit()
+    assert second.counts() == {"done": 2}
+    first.close()
+    second.close()
+
+
+def test_marks_are_committed_in_batches(tmp_path):
+    file_path = str(tmp_path / "frontier.sqlite3")
+    frontier = Frontier(file_path, commit_every=2, commit_interval=60)
+    frontier.add_urls({"a.test": ["a1", "a2", "a3"]})
+    reader = Frontier(file_path)
+    frontier.mark("a1", DONE)
+    frontier.mark("a2", DONE)
+    frontier.mark("a3", DONE)
+    deadline = time.monotonic() + 5
+    while reader.counts().get(DONE) != 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert reader.counts() == {"done": 2, "pending": 1}
+    frontier.close()
+    assert reader.counts() == {"done": 3}
+    reader.close()
+
+
+def test_reseeding_keeps_known_state(tmp_path):
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls({"a.test": ["a1"]})
+    frontier.mark("a1", DONE, PRODUCT)
+    frontier.add_urls({"a.test": ["a1", "a2"]})
+    assert frontier.remaining() == {"a.test": ["a2"]}
+    frontier.close()
+
+
+def test_clear_empties_frontier(tmp_path):
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls({"a.test": ["a1"]})
+    assert frontier.is_empty() is False
+    frontier.clear()
+    assert frontier.is_empty() is True
+    frontier.close()
+
+
+def test_domains_keep_each_others_checkpoints(tmp_path):
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls({"a.test": ["a1", "a2"], "b.test": ["b1", "b2"]})
+    frontier.mark("a1", DONE, PRODUCT)
+    frontier.mark("b1", DONE)
+    frontier.mark("b2", RETRY, attempts=1)
+
+    assert frontier.results(["b.test"]) == {}
+    assert frontier.finished(["a.test"])[0][0] == "a1"
+    assert frontier.outcomes(["b.test"]) == [("b.test", "b1", False)]
+    assert frontier.retries(["a.test"]) == {}
+
+    frontier.clear(["b.test"])
+    assert frontier.remaining() == {"a.test": ["a2"]}
+    assert frontier.results() == {"a.test": [PRODUCT]}
+    frontier.close()
+
+
+def test_unchanged_urls_are_not_crawled_but_keep_their_products(tmp_path):
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls({"a.test": ["a1"]})
+    frontier.add_unchanged({"a.test": {"a2": PRODUCT}})
+    frontier.mark("a1", DONE, PRODUCT)
+
+    assert frontier.remaining() == {}
+    assert frontier.results() == {"a.test": [PRODUCT, PRODUCT]}
+    assert [url for url, _ in frontier.finished()] == ["a1"]
+    assert frontier.counts() == {DONE: 1, UNCHANGED: 1}
+    frontier.close()
+
+
+def test_retries_are_carried_over_with_attempts(tmp_path):
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls({"a.test": ["a1", "a2"]})
+    frontier.mark("a1", RETRY, attempts=2)
+    frontier.mark("a2", DONE, PRODUCT, attempts=0)
+    retries = frontier.retries()
+    assert retries == {"a.test": {"a1": 2}}
+
+    frontier.clear()
+    frontier.add_urls({"a.test": ["a1", "a3"]})
+    frontier.add_retries(retries)
+    assert frontier.remaining() == {"a.test": ["a1", "a3"]}
+    assert frontier.attempts("a1") == 2
+    assert frontier.attempts("a3") == 0
+    frontier.close()
+
+
+def test_remaining_is_ordered_by_priority(tmp_path):
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.add_urls(
+        {"a.test": ["a1", "a2", "a3"], "b.test": ["b1"]}, {"a2": 1.5, "a3": 0.9}
+    )
+    assert frontier.remaining() == {"a.test": ["a2", "a3", "a1"], "b.test": ["b1"]}
+    frontier.close()
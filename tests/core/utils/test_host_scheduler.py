@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+
+from src.core.utils.host_scheduler import HostScheduler
+
+
+def make_scheduler(tmp_path, **kwargs) -> HostScheduler:
+    return HostScheduler(str(tmp_path / "host_limits.json"), **kwargs)
+
+
+async def request(scheduler, domain, status=200, latency=0.0, in_flight=None):
+    async with scheduler.slot(domain) as slot:
+        if in_flight is not None:
+            in_flight.append(scheduler._hosts[domain].in_flight)
+        await asyncio.sleep(latency)
+        slot.status = status
+
+
+@pytest.mark.asyncio
+async def test_concurrency_per_domain_is_limited(tmp_path):
+    scheduler = make_scheduler(
+        tmp_path, initial_concurrency=2, max_concurrency=2, initial_rate=1000
+    )
+    in_flight = []
+    await asyncio.gather(
+        *(
+            request(scheduler, "a.test", latency=0.01, in_flight=in_flight)
+            for _ in range(6)
+        )
+    )
+    assert max(in_flight) == 2
+
+
+@pytest.mark.asyncio
+async def test_limits_grow_while_latency_is_flat(tmp_path):
+    scheduler = make_scheduler(tmp_path, initial_concurrency=1, initial_rate=1000)
+    for _ in range(10):
+        await request(scheduler, "a.test")
+    assert scheduler.limits("a.test")["concurrency"] > 1
+
+
+@pytest.mark.asyncio
+async def test_throttling_halves_the_limits(tmp_path):
+    scheduler = make_scheduler(tmp_path, initial_concurrency=8, initial_rate=1000)
+    await request(scheduler, "a.test", status=429)
+    assert scheduler.limits("a.test") == {"concurrency": 4, "rate": 500}
+    assert scheduler.limits("b.test")["concurrency"] == 8
+
+
+@pytest.mark.asyncio
+async def test_crawl_delay_caps_the_rate(tmp_path):
+    scheduler = make_scheduler(tmp_path, initial_rate=10)
+    scheduler.set_crawl_delay("a.test", 2)
+    assert scheduler.limits("a.test")["rate"] == 0.5
+    scheduler.set_crawl_delay("b.test", None)
+    assert scheduler.limits("b.test")["rate"] == 10
+
+
+@pytest.mark.asyncio
+async def test_learned_limits_persist_between_runs(tmp_path):
+    scheduler = make_scheduler(tmp_path, initial_concurrency=8, initial_rate=1000)
+    await request(scheduler, "a.test", status=503)
+    scheduler.save()
+
+    with open(tmp_path / "host_limits.json") as f:
+        assert json.load(f) == {"a.test": {"concurrency": 4.0, "rate": 500.0}}
+    reloaded = make_scheduler(tmp_path)
+    assert reloaded.limits("a.test") == {"concurrency": 4.0, "rate": 500.0}
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from src.core.utils.http_client import (
+    close_shared_session,
+    create_session,
+    shared_session,
+)
+
+
+@pytest.mark.asyncio
+async def test_create_session_pools_connections():
+    async with create_session(limit=50, limit_per_host=4, dns_ttl=60) as session:
+        connector = session.connector
+        assert (connector.limit, connector.limit_per_host) == (50, 4)
+        assert connector.use_dns_cache
+        assert "User-Agent" in session.headers
+
+
+def test_shared_session_is_reused_per_event_loop():
+    async def session_pair():
+        first, second = shared_session(), shared_session()
+        await close_shared_session()
+        return first, second, first.closed
+
+    first, second, closed = asyncio.run(session_pair())
+    assert first is second and closed
+    assert asyncio.run(session_pair())[0] is not first
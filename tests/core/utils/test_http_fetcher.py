@@ -0,0 +1,58 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.core.utils.http_fetcher import HttpFetcher, stream_encoding
+
+HEAD = (
+    '<html><head><meta charset="iso-8859-1">'
+    '<script type="application/ld+json">{"@type": "Product", "name": "Stuhl"}</script>'
+    "</head><body>"
+)
+BODY = "<p>Gr\xfc\xdfe</p>" * 50_000 + "</body></html>"
+
+
+async def product_page(request):
+    response = web.StreamResponse(
+        headers={"Content-Type": "text/html; charset=iso-8859-1"}
+    )
+    await response.prepare(request)
+    await response.write(HEAD.encode("iso-8859-1"))
+    for i in range(0, len(BODY), 65536):
+        await response.write(BODY[i : i + 65536].encode("iso-8859-1"))
+    await response.write_eof()
+    return response
+
+
+@pytest_asyncio.fixture
+async def server():
+    app = web.Application()
+    app.router.add_get("/product", product_page)
+    async with TestServer(app) as server:
+        yield server
+
+
+@pytest.mark.asyncio
+async def test_stop_early_truncates_after_product_jsonld(server):
+    async with HttpFetcher(stop_early=True, chunk_size=1024) as fetcher:
+        page = await fetcher.fetch(str(server.make_url("/product")))
+
+    assert page.truncated
+    assert page.html.startswith(HEAD)
+    assert len(page.html) < len(HEAD) + 10_000
+
+
+@pytest.mark.asyncio
+async def test_full_download_without_stop_early(server):
+    async with HttpFetcher() as fetcher:
+        page = await fetcher.fetch(str(server.make_url("/product")))
+
+    assert not page.truncated
+    assert page.html.endswith("</body></html>")
+
+
+def test_stream_encoding():
+    assert stream_encoding("UTF-8", b"") == "utf-8"
+    assert stream_encoding(None, b'<meta charset="windows-1252">') == "cp1252"
+    assert stream_encoding("bogus", b"") == "utf-8"
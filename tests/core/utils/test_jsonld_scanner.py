@@ -0,0 +1,41 @@
+from extruct.jsonld import JsonLdExtractor
+
+from src.core.utils.jsonld_scanner import load_jsonld, scan_jsonld
+
+PAGE = """<html><head>
+<script type="application/ld+json">{"@type": "Organization", "name": "Shop"}</script>
+<script type='application/ld+json'>[{"@type": "Product", "name": "Vase"}, {}]</script>
+<script>document.querySelector('script[type="application/ld+json"]')</script>
+<script type="text/javascript">var x = 1;</script>
+</head><body><script type="application/ld+json">
+{"@graph": [{"@type": "WebPage", "url": "https://shop.test/p/vase"}]}
+</script></body></html>"""
+
+
+def test_scan_matches_extruct():
+    expected = JsonLdExtractor().extract(PAGE)
+    assert scan_jsonld(PAGE) == expected
+    assert scan_jsonld(PAGE.encode()) == expected
+
+
+def test_scan_skips_commented_out_scripts():
+    html = (
+        '<!-- <script type="application/ld+json">{"name": "Old"}</script> -->'
+        '<SCRIPT TYPE=application/ld+json>{"name": "New"}</SCRIPT>'
+    )
+    assert scan_jsonld(html) == [{"name": "New"}]
+    assert scan_jsonld('<script type="application/ld+json">{"a": 1}') == []
+
+
+def test_load_tolerates_common_shop_errors():
+    assert load_jsonld('{"name": "Vase",}') == [{"name": "Vase"}]
+    assert load_jsonld('{"a": 1}\n{"b": 2}') == [{"a": 1}, {"b": 2}]
+    assert load_jsonld(
+        '/*<![CDATA[*/ {"url": "https://shop.test", // note\n "x": [1,]} /*]]>*/'
+    ) == [{"url": "https://shop.test", "x": [1]}]
+    assert load_jsonld("{&quot;name&quot;: &quot;A &amp; B&quot;}") == [
+        {"name": "A & B"}
+    ]
+    assert load_jsonld('{"name": "line\nbreak"}') == [{"name": "line\nbreak"}]
+    assert load_jsonld(b'{"name": "Vase"}') == [{"name": "Vase"}]
+    assert load_jsonld("{broken") == []
@@ -0,0 +1,51 @@
+from src.core.utils.product_scanner import (
+    ProductScanner,
+    can_stop_early,
+    is_product_jsonld,
+)
+
+PRODUCT_SCRIPT = (
+    '<script type="application/ld+json">'
+    '{"@context": "https://schema.org", "@type": "Product", "name": "Vase"}'
+    "</script>"
+)
+
+
+def test_is_product_jsonld():
+    assert is_product_jsonld({"@type": "Product", "name": "Vase"})
+    assert is_product_jsonld({"@type": ["schema:Product"], "name": "Vase"})
+    assert is_product_jsonld(
+        {"@graph": [{"@type": "WebPage"}, {"@type": "Product", "name": "Vase"}]}
+    )
+    assert is_product_jsonld(
+        [{"@type": "http://schema.org/ProductGroup", "name": "Vase"}]
+    )
+    assert not is_product_jsonld({"@type": "Product"})
+    assert not is_product_jsonld({"@type": "Organization", "name": "Shop"})
+
+
+def test_scanner_finds_product_split_across_chunks():
+    html = (
+        '<html><head><script type="application/ld+json">{"@type": "Organization",'
+        ' "name": "Shop"}</script><script type="application/ld+json">{broken</script>'
+        + PRODUCT_SCRIPT
+        + "</head><body>"
+    )
+    scanner = ProductScanner()
+    chunks = [html[i : i + 7] for i in range(0, len(html), 7)]
+    found_at = next(i for i, chunk in enumerate(chunks) if scanner.feed(chunk))
+    assert PRODUCT_SCRIPT in "".join(chunks[: found_at + 1])
+    assert PRODUCT_SCRIPT not in "".join(chunks[:found_at])
+    assert scanner.found
+
+
+def test_scanner_ignores_pages_without_product():
+    scanner = ProductScanner()
+    assert not scanner.feed("<html><head><title>Shop</title></head>")
+    assert not scanner.feed('<body><script>var x = "<script";</script></body>')
+
+
+def test_can_stop_early():
+    assert can_stop_early(["json-ld", "opengraph"])
+    assert not can_stop_early(["json-ld", "microdata"])
+    assert not can_stop_early(None)
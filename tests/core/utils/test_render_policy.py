@@ -0,0 +1,31 @@
+from src.core.utils.render_policy import RenderPolicy
+
+
+def test_needs_render_requires_enough_samples(tmp_path):
+    policy = RenderPolicy(str(tmp_path / "policy.json"), min_samples=3)
+    policy.record("shop.test", rendered=True)
+    policy.record("shop.test", rendered=True)
+    assert policy.needs_render("shop.test") is False
+    policy.record("shop.test", rendered=True)
+    assert policy.needs_render("shop.test") is True
+
+
+def test_http_successes_keep_domain_on_http_tier(tmp_path):
+    policy = RenderPolicy(str(tmp_path / "policy.json"), min_samples=2)
+    policy.record("shop.test", rendered=False)
+    for _ in range(5):
+        policy.record("shop.test", rendered=True)
+    assert policy.needs_render("shop.test") is False
+
+
+def test_unknown_domain_tries_http_first(tmp_path):
+    policy = RenderPolicy(str(tmp_path / "policy.json"))
+    assert policy.needs_render("new.test") is False
+
+
+def test_policy_is_persisted_between_runs(tmp_path):
+    file_path = str(tmp_path / "policy.json")
+    policy = RenderPolicy(file_path, min_samples=1)
+    policy.record("shop.test", rendered=True)
+    policy.save()
+    assert RenderPolicy(file_path, min_samples=1).needs_render("shop.test") is True
@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.utils.resource_blocking import BlockingProfile, ResourceBlocker, site_of
+
+PAGE_URL = "https://shop.example.co.uk/product/1"
+
+
+def test_site_of():
+    assert site_of("shop.example.co.uk") == "example.co.uk"
+    assert site_of("www.example.com") == "example.com"
+    assert site_of("example.de") == "example.de"
+
+
+def test_profile_blocks_types_denied_hosts_and_third_party_frames():
+    profile = BlockingProfile(allow_hosts=("cdn.fonts.test",))
+    assert profile.should_block("https://a.test/x.png", "image", PAGE_URL, False)
+    assert not profile.should_block("https://cdn.fonts.test/f", "font", PAGE_URL, False)
+    assert profile.should_block(
+        "https://www.google-analytics.com/g.js", "script", PAGE_URL, False
+    )
+    assert not profile.should_block(
+        "https://static.example.co.uk/app.js", "script", PAGE_URL, False
+    )
+    assert profile.should_block("https://widget.test/", "document", PAGE_URL, True)
+    assert not profile.should_block(
+        "https://reviews.example.co.uk/", "document", PAGE_URL, True
+    )
+
+
+class FakeRoute:
+    def __init__(self, page, url, resource_type, frame=None):
+        self.request = SimpleNamespace(
+            url=url,
+            resource_type=resource_type,
+            frame=frame or page.main_frame,
+            is_navigation_request=lambda: resource_type == "document",
+        )
+        self.action = None
+
+    async def abort(self):
+        self.action = "abort"
+
+    async def continue_(self):
+        self.action = "continue"
+
+
+@pytest.mark.asyncio
+async def test_blocker_aborts_blocked_requests_except_on_baseline_pages():
+    blocker = ResourceBlocker(baseline_every=2)
+    page = SimpleNamespace(url=PAGE_URL, main_frame=object())
+
+    await blocker.before_goto(page, url=PAGE_URL)
+    document = FakeRoute(page, PAGE_URL, "document")
+    image = FakeRoute(page, "https://shop.example.co.uk/a.png", "image")
+    await blocker._route(page, document)
+    await blocker._route(page, image)
+    await blocker.before_return_html(page=page, html="")
+    assert (document.action, image.action) == ("continue", "abort")
+
+    await blocker.before_goto(page, url=PAGE_URL)
+    baseline_image = FakeRoute(page, "https://shop.example.co.uk/a.png", "image")
+    await blocker._route(page, baseline_image)
+    blocker._on_response(
+        SimpleNamespace(
+            headers={"content-length": "1000"},
+            request=SimpleNamespace(resource_type="image"),
+        )
+    )
+    await blocker.before_return_html(page=page, html="")
+    assert baseline_image.action == "continue"
+
+    report = blocker.report()
+    assert report["blocked_requests"] == 1
+    assert report["bytes_saved"] == 1000
+    assert report["baseline_pages"] == 1
+
+
+class FakeCdpSession:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, method, params=None):
+        self.sent.append((method, params))
+
+
+@pytest.mark.asyncio
+async def test_blocker_without_routing_blocks_by_url_pattern():
+    blocker = ResourceBlocker(baseline_every=2, routing=False)
+    cdp = FakeCdpSession()
+    handlers = {}
+    page = SimpleNamespace(
+        url=PAGE_URL,
+        context=SimpleNamespace(new_cdp_session=lambda page: _resolved(cdp)),
+        on=lambda event, handler: handlers.setdefault(event, handler),
+    )
+
+    await blocker.on_page_context_created(page)
+    await blocker.before_goto(page, url=PAGE_URL)
+    await blocker.before_goto(page, url=PAGE_URL)
+    handlers["requestfailed"](
+        SimpleNamespace(failure="net::ERR_BLOCKED_BY_CLIENT", resource_type="font")
+    )
+
+    blocked_urls = cdp.sent[1][1]["urls"]
+    assert "*://*.doubleclick.net/*" in blocked_urls
+    assert "*.woff2?*" in blocked_urls
+    assert cdp.sent[2] == ("Network.setBlockedURLs", {"urls": []})
+    assert blocker.report()["blocked_requests"] == 1
+
+
+async def _resolved(value):
+    return value
@@ -0,0 +1,103 @@
+import pytest
+
+from src.core.utils.robots_cache import RobotsCache, robots_host
+
+ROBOTS = """
+User-agent: *
+Disallow: /cart
+Sitemap: https://a.test/sitemap.xml
+"""
+
+
+class FakeResponse:
+    def __init__(self, status: int, body: str):
+        self.status = status
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def text(self):
+        return self.body
+
+
+class FakeSession:
+    def __init__(self, responses: dict[str, tuple[int, str]]):
+        self.responses = responses
+        self.requested = []
+
+    def get(self, url):
+        self.requested.append(url)
+        return FakeResponse(*self.responses.get(url, (404, "")))
+
+
+def open_cache(file_path, session, **kwargs) -> RobotsCache:
+    cache = RobotsCache(str(file_path), **kwargs)
+    cache._session = session
+    return cache
+
+
+def test_robots_host():
+    assert robots_host("a.test") == "https://a.test"
+    assert robots_host("http://a.test/shop/1?x=1") == "http://a.test"
+
+
+@pytest.mark.asyncio
+async def test_rules_are_fetched_once_and_applied(tmp_path):
+    session = FakeSession({"https://a.test/robots.txt": (200, ROBOTS)})
+    cache = open_cache(tmp_path / "robots.sqlite3", session)
+
+    assert await cache.allowed("https://a.test/product/1")
+    assert not await cache.allowed("https://a.test/cart?add=1")
+    assert await cache.allowed("https://b.test/cart")
+    assert session.requested == [
+        "https://a.test/robots.txt",
+        "https://b.test/robots.txt",
+    ]
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_stored_rules_are_reused_until_ttl_expires(tmp_path):
+    file_path = tmp_path / "robots.sqlite3"
+    cache = open_cache(
+        file_path, FakeSession({"https://a.test/robots.txt": (200, ROBOTS)})
+    )
+    await cache.robots_txt("https://a.test/")
+    cache.close()
+
+    session = FakeSession({})
+    reopened = open_cache(file_path, session)
+    assert not await reopened.allowed("https://a.test/cart")
+    assert session.requested == []
+    reopened.close()
+
+    expired = open_cache(file_path, session, ttl_hours=0)
+    assert await expired.allowed("https://a.test/cart")
+    assert session.requested == ["https://a.test/robots.txt"]
+    expired.close()
+
+
+@pytest.mark.asyncio
+async def test_server_errors_allow_crawling_without_being_stored(tmp_path):
+    session = FakeSession({"https://a.test/robots.txt": (503, "")})
+    cache = open_cache(tmp_path / "robots.sqlite3", session)
+
+    assert await cache.allowed("https://a.test/cart")
+    assert cache._conn.execute("SELECT COUNT(*) FROM robots").fetchone()[0] == 0
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_filter_drops_disallowed_entries(tmp_path):
+    session = FakeSession({"https://a.test/robots.txt": (200, ROBOTS)})
+    cache = open_cache(tmp_path / "robots.sqlite3", session)
+    entries = {
+        "a.test": [{"url": "https://a.test/p/1"}, {"url": "https://a.test/cart"}]
+    }
+
+    assert await cache.filter(entries) == {"a.test": [{"url": "https://a.test/p/1"}]}
+    cache.close()
@@ -0,0 +1,66 @@
+import gzip
+
+from src.core.utils.sitemap_extractor import parse_sitemap
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url>
+    <loc>https://shop.test/p/1</loc>
+    <lastmod>2025-10-01T11:26:56+00:00</lastmod>
+    <changefreq>daily</changefreq>
+    <priority>0.8</priority>
+  </url>
+  <url>
+    <loc>https://shop.test/p/2</loc>
+    <priority>high</priority>
+  </url>
+  <url><lastmod>2025-10-01</lastmod></url>
+</urlset>
+"""
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://shop.test/sitemap-products.xml</loc></sitemap>
+  <sitemap><loc>https://shop.test/sitemap-pages.xml.gz</loc></sitemap>
+</sitemapindex>
+"""
+
+
+def test_parse_urlset_keeps_metadata():
+    children, entries = parse_sitemap(URLSET)
+    assert children == []
+    assert entries == [
+        {
+            "url": "https://shop.test/p/1",
+            "lastmod": "2025-10-01T11:26:56+00:00",
+            "changefreq": "daily",
+            "priority": 0.8,
+        },
+        {
+            "url": "https://shop.test/p/2",
+            "lastmod": None,
+            "changefreq": None,
+            "priority": None,
+        },
+    ]
+
+
+def test_parse_sitemap_index():
+    children, entries = parse_sitemap(INDEX)
+    assert children == [
+        "https://shop.test/sitemap-products.xml",
+        "https://shop.test/sitemap-pages.xml.gz",
+    ]
+    assert entries == []
+
+
+def test_parse_gzipped_sitemap():
+    _, entries = parse_sitemap(gzip.compress(URLSET))
+    assert [e["url"] for e in entries] == [
+        "https://shop.test/p/1",
+        "https://shop.test/p/2",
+    ]
+
+
+def test_parse_garbage_returns_nothing():
+    assert parse_sitemap(b"not xml at all") == ([], [])
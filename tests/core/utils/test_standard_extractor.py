@@ -1,11 +1,31 @@
 import pytest
 from src.core.utils.standards_extractor import (
+    REQUIRED_FIELDS,
+    ExtractionStats,
     extract_standard,
     is_valid_product,
     merge_products,
     are_products_equal,
     merge_product_lists,
+    missing_fields,
 )
+from src.core.utils.structured_data import HtmlDocument, LazyStructuredData
+
+URL = "https://shop.test/p/vase"
+COMPLETE = {
+    "shopsItemId": "V1",
+    "title": {"text": "Vase", "language": "en"},
+    "description": {"text": "Blue vase", "language": "en"},
+    "price": {"amount": 1200, "currency": "EUR"},
+    "state": "AVAILABLE",
+    "images": ["https://shop.test/v.jpg"],
+}
+PAGE = """<html><head><meta property="og:title" content="Vase">
+<script type="application/ld+json">{"@type": "Product", "name": "Vase",
+"description": "Blue vase", "sku": "V1",
+"image": "https://shop.test/v.jpg", "offers": {"price": "12.00",
+"priceCurrency": "EUR", "availability": "https://schema.org/InStock"}}</script>
+</head><body></body></html>"""
 
 
 @pytest.mark.asyncio
@@ -124,10 +144,12 @@ async def test_extract_standard_with_generic_data(monkeypatch):
         ],
     }
 
+    # JSON-LD alone is complete; `full` checks that every syntax is merged.
     result = await extract_standard(
         data,
         "https://example-store.test/shop/collectible-medal-set-1940s/",
         preferred=["json-ld", "microdata", "opengraph", "rdfa"],
+        full=True,
     )
 
     # --- Assertions ---
@@ -366,3 +388,61 @@ def test_merge_product_lists_adds_unique():
     list2 = [{"title": {"text": "Product B"}}]
     merged = merge_product_lists(list1, list2)
     assert len(merged) == 2
+
+
+def test_required_fields_follow_item_model():
+    assert REQUIRED_FIELDS == (
+        "shopsItemId",
+        "title",
+        "description",
+        "price",
+        "state",
+        "images",
+    )
+
+
+def test_missing_fields():
+    assert missing_fields(COMPLETE) == set()
+    assert missing_fields(None) == set(REQUIRED_FIELDS)
+    assert missing_fields(
+        {
+            **COMPLETE,
+            "shopsItemId": "https://shop.test/p/vase",
+            "title": {"text": "Vase", "language": "UNKNOWN"},
+            "description": {"text": "", "language": "en"},
+            "price": {"amount": 0, "currency": "EUR"},
+            "images": [],
+        }
+    ) == {"shopsItemId", "description.text", "price.amount", "images"}
+    assert missing_fields([COMPLETE, {**COMPLETE, "state": "UNKNOWN"}]) == {"state"}
+
+
+@pytest.mark.asyncio
+async def test_extract_standard_stops_once_complete_unless_full():
+    stats = ExtractionStats()
+
+    data = LazyStructuredData(HtmlDocument(PAGE, URL))
+    result = await extract_standard(data, URL, stats=stats)
+    assert missing_fields(result) == set()
+    assert list(data.parsed) == ["json-ld"]
+
+    data = LazyStructuredData(HtmlDocument(PAGE, URL))
+    assert await extract_standard(data, URL, full=True, stats=stats) == result
+    assert set(data.parsed) == {"json-ld", "opengraph", "microdata", "rdfa"}
+
+    report = stats.report()["shop.test"]
+    assert report["pages"] == 2
+    assert report["early_exits"] == 1
+    assert report["skipped_extractors"] == 3
+    assert report["skip_rate"] == 0.5
+    assert stats.counters()["early_exits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_standard_skips_syntaxes_the_data_lacks():
+    stats = ExtractionStats()
+    data = LazyStructuredData(HtmlDocument(PAGE, URL), ["json-ld", "opengraph"])
+    result = await extract_standard(data, URL, full=True, stats=stats)
+    assert missing_fields(result) == set()
+    assert set(data.parsed) == {"json-ld", "opengraph"}
+    assert stats.report()["shop.test"]["skipped_extractors"] == 0
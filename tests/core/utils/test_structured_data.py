@@ -0,0 +1,94 @@
+import json
+import re
+
+import pytest
+from extruct import extract as extruct_extract
+from w3lib.html import get_base_url
+
+from src.core.utils.standards_extractor import extract_standard
+from src.core.utils.structured_data import (
+    HtmlDocument,
+    LazyStructuredData,
+    parse_document,
+    parse_structured_data,
+)
+
+URL = "https://shop.test/p/vase"
+PAGE = """<html prefix="og: http://ogp.me/ns#"><head>
+<base href="/shop/"><link rel="stylesheet" href="s.css">
+<meta property="og:title" content="Vase">
+<script type="application/ld+json">{"@type": "Product", "name": "Vase"}</script>
+</head><body vocab="http://schema.org/">
+<div typeof="Product"><span property="name">Vase <b>blue</b></span>
+<div><p>Unrelated <i>text</i></p></div><a rel="nofollow" href="x">x</a>
+<div property="offers" typeof="Offer"><span property="price" content="12">12 EUR</span>
+</div></div>
+<div itemscope itemtype="http://schema.org/Product"><a itemprop="url" href="v">V</a></div>
+<div typeof="Product" about="#p"><span property="name">Vase</span>
+<div rel="image"><img src="https://shop.test/v.jpg"/></div>
+<div rel="offers"><a href="https://shop.test/offer">o</a></div></div>
+<p>Footer</p></body></html>"""
+ALL_SYNTAXES = [
+    "microdata",
+    "opengraph",
+    "json-ld",
+    "microformat",
+    "rdfa",
+    "dublincore",
+]
+
+
+def normalized(data: dict) -> dict:
+    """Sort items and drop blank node ids, which are random per run."""
+    return {
+        syntax: sorted(
+            re.sub(r"_:N[0-9a-f]+", "_:b", json.dumps(item, sort_keys=True))
+            for item in items
+        )
+        for syntax, items in data.items()
+    }
+
+
+def test_document_base_url():
+    assert parse_document(PAGE, URL).base_url == "https://shop.test/shop/"
+    assert parse_document("<p>x</p>", URL).base_url == URL
+
+
+def test_shared_tree_matches_separate_extruct_run():
+    expected = extruct_extract(
+        PAGE, base_url=get_base_url(PAGE, URL), syntaxes=ALL_SYNTAXES
+    )
+    result = parse_structured_data(PAGE, URL, ALL_SYNTAXES)
+
+    assert list(result) == list(expected)
+    assert normalized(result) == normalized(expected)
+    assert result["rdfa"]
+
+
+def test_lazy_data_extracts_syntaxes_on_access():
+    data = LazyStructuredData(parse_document(PAGE, URL))
+    assert data.parsed == {}
+    assert data["rdfa"]
+    # RDFa ran on a copy, so the shared tree still has the microdata.
+    assert data["microdata"][0]["properties"]["url"] == "https://shop.test/shop/v"
+    assert list(data.parsed) == ["rdfa", "microdata"]
+    assert data.get("microformat") is None
+
+
+@pytest.mark.asyncio
+async def test_extract_standard_skips_expensive_syntaxes_for_complete_products():
+    page = """<html><head><script type="application/ld+json">{"@type": "Product",
+    "name": "Vase", "description": "Blue vase", "sku": "V1", "inLanguage": "en",
+    "image": "https://shop.test/v.jpg", "offers": {"price": "12.00",
+    "priceCurrency": "EUR", "availability": "https://schema.org/InStock"}}</script>
+    </head><body vocab="http://schema.org/"><div typeof="Product">
+    <span property="name">Vase</span></div></body></html>"""
+    document = HtmlDocument(page, URL)
+    data = LazyStructuredData(document)
+
+    result = await extract_standard(data, URL)
+
+    assert result["shopsItemId"] == "V1"
+    assert list(data.parsed) == ["json-ld"]
+    # JSON-LD is scanned from the raw HTML, so the page was never parsed.
+    assert "tree" not in vars(document)
@@ -0,0 +1,57 @@
+from src.core.utils.url_classifier import UrlClassifier, url_pattern
+
+
+def test_url_pattern_generalises_slugs_and_ids():
+    assert url_pattern("https://shop.test/shop/medal-set-1940s/") == "/shop/{slug}"
+    assert url_pattern("https://shop.test/shop/helmet") == "/shop/{slug}"
+    assert url_pattern("https://shop.test/p/12345") == "/p/{num}"
+    assert (
+        url_pattern("https://shop.test/Blog/2024/post.html")
+        == "/blog/{num}/{slug}.html"
+    )
+    assert url_pattern("https://shop.test/") == "/"
+
+
+def test_non_html_resources_are_dropped(tmp_path):
+    classifier = UrlClassifier(str(tmp_path / "patterns.json"))
+    assert (
+        classifier.should_crawl("shop.test", "https://shop.test/a/photo.JPG") is False
+    )
+    assert classifier.should_crawl("shop.test", "https://shop.test/agb.pdf") is False
+    assert classifier.should_crawl("shop.test", "https://shop.test/p/item.html") is True
+
+
+def test_learned_low_yield_patterns_are_dropped(tmp_path):
+    classifier = UrlClassifier(
+        str(tmp_path / "patterns.json"), min_samples=5, explore_rate=0.0
+    )
+    for i in range(5):
+        classifier.record("shop.test", f"https://shop.test/blog/post-{i}", False)
+        classifier.record("shop.test", f"https://shop.test/shop/item-{i}", True)
+
+    assert classifier.should_crawl("shop.test", "https://shop.test/blog/new") is False
+    assert classifier.should_crawl("shop.test", "https://shop.test/shop/new") is True
+    assert classifier.should_crawl("other.test", "https://other.test/blog/x") is True
+
+    entries = {
+        "shop.test": [
+            {"url": "https://shop.test/blog/new"},
+            {"url": "https://shop.test/shop/new"},
+        ]
+    }
+    assert classifier.prefilter(entries) == {
+        "shop.test": [{"url": "https://shop.test/shop/new"}]
+    }
+
+
+def test_report_and_persistence(tmp_path):
+    file_path = str(tmp_path / "patterns.json")
+    classifier = UrlClassifier(file_path)
+    classifier.record("shop.test", "https://shop.test/shop/a", True)
+    classifier.record("shop.test", "https://shop.test/shop/b", False)
+    classifier.save()
+
+    report = UrlClassifier(file_path).report()
+    assert report == {
+        "shop.test": {"/shop/{slug}": {"crawled": 2, "products": 1, "yield": 0.5}}
+    }
@@ -0,0 +1,19 @@
+from src.core.utils.crawl_history import DAY, parse_lastmod
+from src.core.utils.url_priority import url_priority
+
+NOW = parse_lastmod("2025-10-10T00:00:00+00:00")
+
+
+def test_sitemap_priority_defaults_to_half():
+    assert url_priority({"url": "u"}, False, NOW) == 0.5
+    assert url_priority({"url": "u", "priority": 0.9}, False, NOW) == 0.9
+
+
+def test_known_products_and_recent_changes_rank_higher():
+    known = url_priority({"url": "u"}, True, NOW)
+    fresh = url_priority({"url": "u", "lastmod": "2025-10-10"}, False, NOW)
+    week_old = url_priority({"url": "u", "lastmod": "2025-10-03"}, False, NOW)
+    assert known == 1.5
+    assert fresh == 1.5
+    assert week_old == 1.0
+    assert url_priority({"url": "u", "lastmod": "2025-10-11"}, False, NOW - DAY) == 1.5
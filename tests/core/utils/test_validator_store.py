@@ -0,0 +1,37 @@
+from src.core.utils.validator_store import ValidatorStore
+
+PRODUCT = {"title": {"text": "Test Product", "language": "en"}}
+
+
+def test_conditional_headers_from_stored_validators(tmp_path):
+    store = ValidatorStore(str(tmp_path / "validators.sqlite3"))
+    store.put("http://a.test/1", '"abc"', "Wed, 01 Oct 2025 10:00:00 GMT", PRODUCT)
+    store.commit()
+    assert store.conditional_headers("http://a.test/1") == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 01 Oct 2025 10:00:00 GMT",
+    }
+    assert store.conditional_headers("http://a.test/unknown") == {}
+    store.close()
+
+
+def test_pages_without_validators_are_not_stored(tmp_path):
+    store = ValidatorStore(str(tmp_path / "validators.sqlite3"))
+    store.put("http://a.test/1", None, None, PRODUCT)
+    assert store.get("http://a.test/1") is None
+    store.close()
+
+
+def test_store_survives_reopen(tmp_path):
+    file_path = str(tmp_path / "validators.sqlite3")
+    store = ValidatorStore(file_path, commit_every=1000)
+    store.put("http://a.test/1", '"abc"', None, PRODUCT)
+    store.close()
+
+    reopened = ValidatorStore(file_path)
+    assert reopened.get("http://a.test/1") == {
+        "etag": '"abc"',
+        "last_modified": None,
+        "product": PRODUCT,
+    }
+    reopened.close()
@@ -0,0 +1,84 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+from crawl4ai import CrawlerRunConfig
+
+from src.core.utils.wait_policy import WaitPolicy, parse_wait_marker, wait_condition
+
+
+def rendered(found: int, at_start: int, waited_ms: int) -> str:
+    return (
+        f'<html data-crawler-wait="{found},{at_start},{waited_ms}"><body></body></html>'
+    )
+
+
+def test_wait_condition_and_marker():
+    condition = wait_condition(2500, require_load=True, timeout_ms=17500)
+    assert condition.startswith("js:() =>")
+    assert "graceMs = 2500, requireLoad = true" in condition
+    assert "timeoutMs = 17500" in condition
+    assert parse_wait_marker(rendered(1, 0, 1200)) == (True, False, 1200)
+    assert parse_wait_marker("<html></html>") is None
+
+
+def test_strategy_is_learned_per_domain(tmp_path):
+    policy = WaitPolicy(str(tmp_path / "wait_policy.json"), min_samples=3)
+    assert policy.strategy("a.test") == ("structured_data", 5000)
+
+    for _ in range(3):
+        policy.observe("early.test", rendered(1, 1, 0))
+        policy.observe("late.test", rendered(1, 0, 2000))
+        policy.observe("none.test", rendered(0, 0, 9000))
+    policy.observe("early.test", "<html></html>")
+
+    assert policy.strategy("early.test") == ("domcontentloaded", 0)
+    assert policy.strategy("late.test") == ("structured_data", 3000)
+    assert policy.strategy("none.test") == ("load", 0)
+    assert policy.report()["late.test"]["mean_wait_ms"] == 2000
+    assert policy.report()["early.test"]["renders"] == 3
+
+
+def test_run_config_sets_wait_condition(tmp_path):
+    policy = WaitPolicy(str(tmp_path / "wait_policy.json"), max_grace_ms=10000)
+    config = policy.run_config("a.test", CrawlerRunConfig())
+    assert "graceMs = 5000" in config.wait_for
+    assert "timeoutMs = 15000" in config.wait_for
+    # crawl4ai fails the render on its own timeout, so it must never fire.
+    assert config.wait_for_timeout > 15000
+
+
+# Polls a wait condition against a page that never finishes loading and has
+# no structured data, advancing the clock by 1 s per poll.
+_NEVER_LOADING_PAGE = """
+let now = 0;
+globalThis.performance = {now: () => now};
+globalThis.window = {};
+const attributes = {};
+globalThis.document = {
+    readyState: "interactive",
+    querySelectorAll: () => [],
+    querySelector: () => null,
+    documentElement: {setAttribute: (name, value) => (attributes[name] = value)},
+};
+const condition = %s;
+let polls = 0;
+while (!condition() && polls < 100) {
+    polls++;
+    now += 1000;
+}
+console.log(JSON.stringify({polls, marker: attributes["data-crawler-wait"]}));
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_wait_condition_gives_up_on_pages_that_never_load():
+    condition = wait_condition(5000, require_load=True, timeout_ms=15000)
+    script = _NEVER_LOADING_PAGE % condition.removeprefix("js:")
+    result = json.loads(
+        subprocess.run(
+            ["node", "-e", script], capture_output=True, text=True, check=True
+        ).stdout
+    )
+    assert result == {"polls": 15, "marker": "0,0,15000"}